@@ -16,7 +16,14 @@
 
 from .debug import CONFIG_LOG_FILE, DEBUG_FORMAT, DEBUG_LOG_FILE
 from .generic import EXECUTION_TIME, timestamp
-from .inference import MODEL_ARCH, OUTPUT_LAYERS, TEST, YOLO_ANCHORS, ModelFormat
+from .inference import (
+    MODEL_ARCH,
+    OUTPUT_LAYERS,
+    TEST,
+    YOLO_ANCHORS,
+    YOLO_BOX_FORMAT,
+    ModelFormat,
+)
 from .logger import COLORED_FORMAT
 from .profiling import PROFILING_LOG_FILE, Timers
 
@@ -30,6 +37,7 @@ __all__ = [
     "PROFILING_LOG_FILE",
     "OUTPUT_LAYERS",
     "YOLO_ANCHORS",
+    "YOLO_BOX_FORMAT",
     "ModelFormat",
     "Timers",
     "timestamp",
@@ -81,4 +81,7 @@ YOLO_ANCHORS = np.array([
     [459., 401.],
 ])
 
+# Box column order of the YOLOv3/v4 postprocess output
+YOLO_BOX_FORMAT = ("xmin", "ymin", "xmax", "ymax")
+
 TEST = 1
@@ -15,21 +15,41 @@
 """
 
 from .debug import clear_logs
+from .detections import BOX_COLUMNS, DEFAULT_BOX_FORMAT, Detections
+from .frame_buffer import FrameBuffer
 from .helper import load_image_into_numpy_array
 from .inference import (
     get_binary_mask,
+    get_class_map,
     get_instance_mask,
     nms_boxes,
     yolo_postprocess,
     yolov3v4_postprocess,
+    yolox_postprocess,
 )
+from .nms import NMS_METHODS, nms_indices, non_max_suppression
+from .shared_memory import SharedFrameSlots
+from .video_encoder import VideoEncoder
+from .yolo import YoloDecoder
 
 __all__ = [
+    "BOX_COLUMNS",
+    "DEFAULT_BOX_FORMAT",
+    "Detections",
+    "FrameBuffer",
+    "NMS_METHODS",
+    "SharedFrameSlots",
+    "VideoEncoder",
+    "YoloDecoder",
     "clear_logs",
     "get_binary_mask",
+    "get_class_map",
     "get_instance_mask",
     "load_image_into_numpy_array",
     "nms_boxes",
+    "nms_indices",
+    "non_max_suppression",
     "yolo_postprocess",
     "yolov3v4_postprocess",
+    "yolox_postprocess",
 ]
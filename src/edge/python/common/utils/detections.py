@@ -0,0 +1,173 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   detections.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Columnar container of object detection predictions.
+"""
+
+import numpy as np
+
+BOX_COLUMNS = ("xmin", "ymin", "xmax", "ymax")
+DEFAULT_BOX_FORMAT = ("ymin", "xmin", "ymax", "xmax")
+
+
+class Detections:
+
+    """Object detection predictions backed by contiguous arrays.
+
+    Boxes are stored as an (N, 4) float32 array of normalised coordinates
+    whose column order is declared by `box_format`, classes as an int32
+    array and scores as a float32 array, with optional per-box masks.
+
+    Indexing with a slice returns views of the arrays, while indexing with
+    an integer or boolean array, e.g. `detections[detections.scores > 0.5]`,
+    filters all arrays at once. For compatibility with dictionaries of
+    predictions, the arrays can also be read by name, e.g.
+    `detections["boxes"]`.
+    """
+
+    __slots__ = ("boxes", "classes", "scores", "masks", "box_format")
+
+    FIELDS = ("boxes", "classes", "scores", "masks")
+
+    def __init__(self,
+                 boxes=None,
+                 classes=None,
+                 scores=None,
+                 masks=None,
+                 box_format=DEFAULT_BOX_FORMAT):
+        """Initialize detections.
+
+        Args:
+            boxes: Array-like of shape (N, 4) of normalised coordinates.
+            classes: Array-like of shape (N,) of class IDs.
+            scores: Array-like of shape (N,) of scores.
+            masks: Optional array-like of shape (N, H, W) of masks.
+            box_format: Order of the box columns, a permutation of
+                `BOX_COLUMNS`.
+
+        Raises:
+            ValueError: If the box format is invalid or the arrays
+                differ in length.
+        """
+        box_format = tuple(box_format)
+        if sorted(box_format) != sorted(BOX_COLUMNS):
+            raise ValueError(f"Invalid box format {box_format}, must be a "
+                             f"permutation of {BOX_COLUMNS}!")
+        self.box_format = box_format
+        self.boxes = np.ascontiguousarray(
+            np.reshape([] if boxes is None else boxes, (-1, 4)),
+            dtype=np.float32)
+        self.classes = np.ascontiguousarray([] if classes is None else
+                                            classes,
+                                            dtype=np.int32).reshape(-1)
+        self.scores = np.ascontiguousarray([] if scores is None else scores,
+                                           dtype=np.float32).reshape(-1)
+        self.masks = None if masks is None else np.asarray(masks)
+        if not (len(self.boxes) == len(self.classes) == len(self.scores)):
+            raise ValueError("Boxes, classes and scores differ in length!")
+
+    @classmethod
+    def _from_arrays(cls, boxes, classes, scores, masks, box_format):
+        """Create detections from arrays without copying or validating."""
+        detections = cls.__new__(cls)
+        detections.boxes = boxes
+        detections.classes = classes
+        detections.scores = scores
+        detections.masks = masks
+        detections.box_format = box_format
+        return detections
+
+    def __len__(self):
+        """Get number of detections."""
+        return len(self.scores)
+
+    def __getitem__(self, key):
+        """Get an array by name, or select a subset of the detections.
+
+        Args:
+            key: Field name, or a slice, integer array or boolean array.
+
+        Returns:
+            Array of the named field, or new detections.
+        """
+        if isinstance(key, str):
+            if key not in self.FIELDS:
+                raise KeyError(key)
+            return getattr(self, key)
+        if isinstance(key, (int, np.integer)):
+            key = slice(key, key + 1 or None)
+        return self._from_arrays(
+            self.boxes[key], self.classes[key], self.scores[key],
+            None if self.masks is None else self.masks[key], self.box_format)
+
+    def __repr__(self):
+        """Get string representation."""
+        return (f"Detections(n={len(self)}, "
+                f"box_format={list(self.box_format)})")
+
+    def get(self, key, default=None):
+        """Get an array by name, like `dict.get`.
+
+        Args:
+            key: Field name.
+            default: Value returned if the field is not set.
+
+        Returns:
+            Array of the named field, or the default.
+        """
+        if key not in self.FIELDS or getattr(self, key) is None:
+            return default
+        return getattr(self, key)
+
+    def columns(self, *names):
+        """Get the column indices of box coordinates.
+
+        Args:
+            names: Coordinate names from `BOX_COLUMNS`.
+
+        Returns:
+            List of column indices, one for each name.
+        """
+        return [self.box_format.index(name) for name in names]
+
+    def to_format(self, box_format):
+        """Get the detections with the box columns in another order.
+
+        Args:
+            box_format: New order of the box columns.
+
+        Returns:
+            Detections sharing the classes, scores and masks arrays.
+        """
+        box_format = tuple(box_format)
+        if box_format == self.box_format:
+            return self
+        return self._from_arrays(
+            np.ascontiguousarray(self.boxes[:, self.columns(*box_format)]),
+            self.classes, self.scores, self.masks, box_format)
+
+    def to_pixels(self, width, height, dtype=np.int32):
+        """Convert boxes to pixel coordinates in a single vectorised pass.
+
+        Args:
+            width: Image width in pixels.
+            height: Image height in pixels.
+            dtype: Data type of the pixel coordinates.
+
+        Returns:
+            Array of shape (N, 4) of (xmin, ymin, xmax, ymax) pixel
+                coordinates.
+        """
+        scale = np.array([width, height, width, height], dtype=np.float32)
+        pixels = self.boxes[:, self.columns(*BOX_COLUMNS)] * scale
+        return pixels.astype(dtype, copy=False)
@@ -0,0 +1,137 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   frame_buffer.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Capture buffer between input reader threads and the engine.
+"""
+
+from collections import deque
+from threading import Condition
+
+
+class FrameBuffer:
+
+    """Thread-safe frame handoff from a capture thread to the engine.
+
+    Supported policies:
+        latest: Only keep the freshest frame, older unconsumed frames
+            are dropped.
+        fifo: Keep up to `capacity` frames in capture order, dropping the
+            oldest frame when full.
+        every_nth: Like fifo, but only every `nth` captured frame is kept.
+
+    Consumers block on a condition variable and are woken up as soon as
+    a frame is put into the buffer or the buffer is closed.
+    """
+
+    POLICIES = ("latest", "fifo", "every_nth")
+
+    def __init__(self, policy="latest", capacity=1, nth=1):
+        """Initialize frame buffer.
+
+        Args:
+            policy: Buffering policy, one of `POLICIES`.
+            capacity: Maximum number of buffered frames, always 1 for the
+                latest policy.
+            nth: Keep one out of every `nth` frames for the every_nth policy.
+
+        Raises:
+            ValueError: If the policy is not supported.
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unsupported frame buffer policy {policy}, "
+                             f"must be one of {self.POLICIES}!")
+        self.policy = policy
+        self.capacity = 1 if policy == "latest" else max(1, int(capacity))
+        self.nth = max(1, int(nth)) if policy == "every_nth" else 1
+        self._frames = deque()
+        self._condition = Condition()
+        self._closed = False
+        self._captured = 0
+        self._dropped = 0
+
+    def __len__(self):
+        """Get number of buffered frames."""
+        with self._condition:
+            return len(self._frames)
+
+    @property
+    def dropped(self):
+        """Get number of captured frames dropped before being consumed."""
+        return self._dropped
+
+    @property
+    def closed(self):
+        """Get whether the buffer has been closed."""
+        return self._closed
+
+    def put(self, frame, block=False):
+        """Put a captured frame into the buffer.
+
+        Args:
+            frame: Captured frame, typically a tuple of (frame ID, image).
+            block: Whether to wait for a free slot when the buffer is full
+                instead of dropping the oldest frame.
+
+        Returns:
+            True if the frame was buffered, False if it was skipped by the
+                every_nth policy or the buffer has been closed.
+        """
+        with self._condition:
+            self._captured += 1
+            if (self._captured - 1) % self.nth:
+                return False
+            if block:
+                self._condition.wait_for(self._writable)
+            if self._closed:
+                return False
+            if len(self._frames) >= self.capacity:
+                self._frames.popleft()
+                self._dropped += 1
+            self._frames.append(frame)
+            self._condition.notify_all()
+            return True
+
+    def get(self, timeout=None):
+        """Take the next frame, waiting until one is available.
+
+        Args:
+            timeout: Maximum time to wait in seconds, None to wait forever.
+
+        Returns:
+            Next frame, or None if the buffer was closed and drained
+                or no frame arrived within the timeout.
+        """
+        with self._condition:
+            if (not self._condition.wait_for(self._readable, timeout)
+                    or not self._frames):
+                return None
+            frame = self._frames.popleft()
+            self._condition.notify_all()
+            return frame
+
+    def close(self):
+        """Close the buffer and wake up all waiting threads.
+
+        Frames already in the buffer can still be taken.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _readable(self):
+        """Check whether a consumer can stop waiting."""
+        return bool(self._frames) or self._closed
+
+    def _writable(self):
+        """Check whether a blocked producer can stop waiting."""
+        return len(self._frames) < self.capacity or self._closed
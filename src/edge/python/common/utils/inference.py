@@ -14,13 +14,11 @@
 @Desc    :   Inference helper functions.
 """
 
-import copy
-
 import numpy as np
-import torch
-import torchvision
 from scipy.special import expit
 
+from .nms import nms_indices, non_max_suppression
+
 
 def yolo_decode(
     prediction,
@@ -155,62 +153,6 @@ def yolo_correct_boxes(predictions, img_shape, model_input_shape):
     return np.concatenate([box_xy, box_wh, objectness, class_scores], axis=2)
 
 
-def box_diou(boxes):
-    """
-    Calculate DIoU value of 1st box with other boxes of a box array
-    Reference Paper:
-        "Distance-IoU Loss: Faster and Better Learning for Bounding Box
-        Regression" https://arxiv.org/abs/1911.08287
-
-    Args:
-        boxes: bbox numpy array, shape=(N, 4), xywh
-            x,y are top left coordinates
-
-    Returns:
-        diou: numpy array, shape=(N-1,)
-            IoU value of boxes[1:] with boxes[0]
-    """
-    # get box coordinate and area
-    x_pos = boxes[:, 0]
-    y_pos = boxes[:, 1]
-    wid = boxes[:, 2]
-    hei = boxes[:, 3]
-    areas = wid * hei
-
-    # check IoU
-    inter_xmin = np.maximum(x_pos[1:], x_pos[0])
-    inter_ymin = np.maximum(y_pos[1:], y_pos[0])
-    inter_xmax = np.minimum(x_pos[1:] + wid[1:], x_pos[0] + wid[0])
-    inter_ymax = np.minimum(y_pos[1:] + hei[1:], y_pos[0] + hei[0])
-
-    inter_w = np.maximum(0.0, inter_xmax - inter_xmin + 1)
-    inter_h = np.maximum(0.0, inter_ymax - inter_ymin + 1)
-
-    inter = inter_w * inter_h
-    iou = inter / (areas[1:] + areas[0] - inter)
-
-    # box center distance
-    x_center = x_pos + wid / 2
-    y_center = y_pos + hei / 2
-    center_distance = np.power(x_center[1:] - x_center[0], 2) + np.power(
-        y_center[1:] - y_center[0], 2)
-
-    # get enclosed area
-    enclose_xmin = np.minimum(x_pos[1:], x_pos[0])
-    enclose_ymin = np.minimum(y_pos[1:], y_pos[0])
-    enclose_xmax = np.maximum(x_pos[1:] + wid[1:], x_pos[0] + wid[0])
-    enclose_ymax = np.maximum(y_pos[1:] + wid[1:], y_pos[0] + wid[0])
-    enclose_w = np.maximum(0.0, enclose_xmax - enclose_xmin + 1)
-    enclose_h = np.maximum(0.0, enclose_ymax - enclose_ymin + 1)
-    # get enclosed diagonal distance
-    enclose_diagonal = np.power(enclose_w, 2) + np.power(enclose_h, 2)
-    # calculate DIoU, add epsilon in denominator to avoid dividing by 0
-    diou = iou - 1.0 * (center_distance) / (enclose_diagonal +
-                                            np.finfo(float).eps)
-
-    return diou
-
-
 def nms_boxes(
     boxes,
     classes,
@@ -219,90 +161,18 @@ def nms_boxes(
     confidence=0.1,
     sigma=0.5,
 ):
-    """Carry out non-max supression on the detected bboxes"""
-    is_soft = False
-    use_exp = False
-
-    nboxes, nclasses, nscores = [], [], []
-    for cls in set(classes):
-        # handle data for one class
-        inds = np.where(classes == cls)
-        bbx = boxes[inds]
-        cls = classes[inds]
-        sco = scores[inds]
-
-        # make a data copy to avoid breaking
-        # during nms operation
-        b_nms = copy.deepcopy(bbx)
-        c_nms = copy.deepcopy(cls)
-        s_nms = copy.deepcopy(sco)
-
-        while len(s_nms) > 0:
-            # pick the max box and store, here
-            # we also use copy to persist result
-            i = np.argmax(s_nms, axis=-1)
-            nboxes.append(copy.deepcopy(b_nms[i]))
-            nclasses.append(copy.deepcopy(c_nms[i]))
-            nscores.append(copy.deepcopy(s_nms[i]))
-
-            # swap the max line and first line
-            b_nms[[i, 0], :] = b_nms[[0, i], :]
-            c_nms[[i, 0]] = c_nms[[0, i]]
-            s_nms[[i, 0]] = s_nms[[0, i]]
-
-            iou = box_diou(b_nms)
-
-            # drop the last line since it has been record
-            b_nms = b_nms[1:]
-            c_nms = c_nms[1:]
-            s_nms = s_nms[1:]
-
-            if is_soft:
-                # Soft-NMS
-                if use_exp:
-                    # score refresh formula:
-                    # score = score * exp(-(iou^2)/sigma)
-                    s_nms = s_nms * np.exp(-(iou * iou) / sigma)
-                else:
-                    # score refresh formula:
-                    # score = score * (1 - iou) if iou > threshold
-                    depress_mask = np.where(iou > iou_threshold)[0]
-                    s_nms[depress_mask] = s_nms[depress_mask] * (
-                        1 - iou[depress_mask])
-                keep_mask = np.where(s_nms >= confidence)[0]
-            else:
-                # normal Hard-NMS
-                keep_mask = np.where(iou <= iou_threshold)[0]
-
-            # keep needed box for next loop
-            b_nms = b_nms[keep_mask]
-            c_nms = c_nms[keep_mask]
-            s_nms = s_nms[keep_mask]
-
-    # reformat result for output
-    nboxes = np.array(nboxes)
-    nclasses = np.array(nclasses)
-    nscores = np.array(nscores)
-    return nboxes, nclasses, nscores
-
-
-def filter_boxes(boxes, classes, scores, max_boxes):
-    """Sort the prediction boxes according to score
-    and only pick top "max_boxes" ones
-    """
-    # sort result according to scores
-    sorted_indices = np.argsort(scores)
-    sorted_indices = sorted_indices[::-1]
-    nboxes = boxes[sorted_indices]
-    nclasses = classes[sorted_indices]
-    nscores = scores[sorted_indices]
-
-    # only pick max_boxes
-    nboxes = nboxes[:max_boxes]
-    nclasses = nclasses[:max_boxes]
-    nscores = nscores[:max_boxes]
+    """Carry out DIoU non-max supression on (x, y, w, h) boxes.
 
-    return nboxes, nclasses, nscores
+    Kept for backwards compatibility, see `non_max_suppression`.
+    """
+    return non_max_suppression(boxes,
+                               classes,
+                               scores,
+                               iou_threshold,
+                               method="diou",
+                               box_format="xywh",
+                               confidence=confidence,
+                               sigma=sigma)
 
 
 def yolo_handle_predictions(predictions,
@@ -330,22 +200,19 @@ def yolo_handle_predictions(predictions,
     classes = box_classes[pos]
     scores = box_class_scores[pos]
 
-    # Boxes, Classes and Scores returned from NMS
-    n_boxes, n_classes, n_scores = nms_boxes(
+    # Boxes, Classes and Scores returned from NMS, sorted by score
+    boxes, classes, scores = non_max_suppression(
         boxes,
         classes,
         scores,
         iou_threshold,
+        method="diou",
+        box_format="xywh",
+        max_boxes=max_boxes,
     )
 
-    if n_boxes:
-        boxes = np.concatenate(n_boxes)
-        classes = np.concatenate(n_classes).astype("int32")
-        scores = np.concatenate(n_scores)
-        boxes, classes, scores = filter_boxes(boxes, classes, scores,
-                                              max_boxes)
-
-        return boxes, classes, scores
+    if len(boxes):
+        return boxes, classes.astype("int32"), scores
 
     return [], [], []
 
@@ -357,21 +224,12 @@ def yolo_adjust_boxes(boxes, img_shape):
     if boxes is None or len(boxes) == 0:
         return []
 
-    image_shape = np.array(img_shape, dtype="float32")
-    height, width = image_shape
-
-    adjusted_boxes = []
-    for box in boxes:
-        x_coord, y_coord, box_width, box_height = box
-
-        xmin = min(max(0, x_coord / width), 1)
-        ymin = min(max(0, y_coord / height), 1)
-        xmax = min(max(xmin, (x_coord + box_width) / width), 1)
-        ymax = min(max(ymin, (y_coord + box_height) / height), 1)
+    height, width = np.array(img_shape, dtype="float32")
+    boxes = np.asarray(boxes, dtype=np.float32) / [width, height, width, height]
 
-        adjusted_boxes.append([xmin, ymin, xmax, ymax])
-
-    return np.array(adjusted_boxes, dtype=np.float32)
+    xy_min = np.clip(boxes[:, :2], 0, 1)
+    xy_max = np.clip(boxes[:, :2] + boxes[:, 2:], xy_min, 1)
+    return np.concatenate([xy_min, xy_max], axis=1)
 
 
 def yolov3v4_postprocess(
@@ -383,14 +241,23 @@ def yolov3v4_postprocess(
     max_boxes=100,
     confidence=0.1,
     iou_threshold=0.4,
+    decoder=None,
 ):
-    """Postprocess YOLOv3 or YOLOv4 output."""
-    predictions = yolov3v4_decode(
-        yolo_outputs,
-        anchors,
-        num_classes,
-        input_shape=model_input_shape,
-    )
+    """Postprocess YOLOv3 or YOLOv4 output.
+
+    Passing a `YoloDecoder` created once per model reuses its cached grid
+    and anchor tables instead of rebuilding them for every frame, and
+    a sparse decoder skips the cells below the confidence threshold.
+    """
+    if decoder is not None:
+        predictions = decoder.decode(yolo_outputs, confidence)
+    else:
+        predictions = yolov3v4_decode(
+            yolo_outputs,
+            anchors,
+            num_classes,
+            input_shape=model_input_shape,
+        )
 
     predictions = yolo_correct_boxes(predictions, image_shape,
                                      model_input_shape)
@@ -408,12 +275,75 @@ def yolov3v4_postprocess(
     return boxes, classes, scores
 
 
+def yolox_postprocess(prediction,
+                      num_classes,
+                      conf_thre=0.7,
+                      nms_thre=0.45,
+                      class_agnostic=False):
+    """Postprocess YOLOX output with NumPy only.
+
+    Candidates are filtered on objectness before the class scores are
+    reduced, since the final score can never exceed the objectness.
+
+    Args:
+        prediction: Array of shape (N, num_boxes, 5 + num_classes) of
+            (cx, cy, w, h, objectness, class scores...) rows.
+        num_classes: Total number of classes.
+        conf_thre: Minimum objectness times class score.
+        nms_thre: IoU threshold of non-max suppression.
+        class_agnostic: Whether to suppress boxes across classes.
+
+    Returns:
+        List with, for each image, an array of shape (M, 7) of
+            (x1, y1, x2, y2, obj_conf, class_conf, class_pred) rows
+            sorted by descending score, or None if nothing was detected.
+    """
+    output = []
+    for image_pred in np.asarray(prediction):
+        image_pred = image_pred[image_pred[:, 4] >= conf_thre]
+        class_scores = image_pred[:, 5:5 + num_classes]
+        class_pred = np.argmax(class_scores, axis=1)
+        class_conf = np.take_along_axis(class_scores, class_pred[:, None],
+                                        1)[:, 0]
+        scores = image_pred[:, 4] * class_conf
+        keep = scores >= conf_thre
+        if not keep.any():
+            output.append(None)
+            continue
+
+        image_pred, class_pred = image_pred[keep], class_pred[keep]
+        detections = np.empty((len(image_pred), 7), dtype=image_pred.dtype)
+        half_wh = image_pred[:, 2:4] / 2
+        detections[:, :2] = image_pred[:, :2] - half_wh
+        detections[:, 2:4] = image_pred[:, :2] + half_wh
+        detections[:, 4] = image_pred[:, 4]
+        detections[:, 5] = class_conf[keep]
+        detections[:, 6] = class_pred
+
+        indices, _ = nms_indices(
+            detections[:, :4],
+            np.zeros_like(class_pred) if class_agnostic else class_pred,
+            scores[keep],
+            nms_thre,
+        )
+        output.append(detections[indices])
+    return output
+
+
 def yolo_postprocess(prediction,
                      num_classes,
                      conf_thre=0.7,
                      nms_thre=0.45,
                      class_agnostic=False):
-    """Postprocess YOLOX output."""
+    """Postprocess YOLOX output with PyTorch.
+
+    PyTorch is only imported when called, see `yolox_postprocess`
+    for the NumPy equivalent.
+    """
+    # pylint: disable=import-outside-toplevel
+    import torch
+    import torchvision
+
     prediction = torch.Tensor(prediction)
     box_corner = prediction.new(prediction.shape)
     box_corner[:, :, 0] = prediction[:, :, 0] - prediction[:, :, 2] / 2
@@ -473,10 +403,44 @@ def get_instance_mask(mask: np.ndarray, lab: int,
     return instance_mask
 
 
+def get_class_map(scores: np.ndarray,
+                  threshold: float = None,
+                  stride: int = 1) -> np.ndarray:
+    """Convert class scores to a map of the best class of each pixel.
+
+    The best score of each pixel is computed in one vectorised reduction,
+    then each class, from the last one down, marks the pixels whose best
+    score it holds. This matches `np.argmax`, which keeps the first class
+    on ties.
+
+    Args:
+        scores: Array of shape (num_classes, H, W) of class scores,
+            with the background as class 0.
+        threshold: Optional score the best class must exceed, pixels
+            below it are set to the background.
+        stride: Only compute every `stride`-th row and column, returning
+            a downsampled map.
+
+    Returns:
+        Array of shape (ceil(H / stride), ceil(W / stride)) of class IDs,
+            uint8 for up to 256 classes.
+    """
+    scores = np.asarray(scores)[:, ::stride, ::stride]
+    dtype = np.uint8 if len(scores) <= 256 else np.uint16
+    best_score = scores.max(axis=0)
+    class_map = np.zeros(best_score.shape, dtype=dtype)
+    is_best = np.empty(best_score.shape, dtype=bool)
+    for class_id in range(len(scores) - 1, 0, -1):
+        np.equal(scores[class_id], best_score, out=is_best)
+        np.copyto(class_map, class_id, where=is_best)
+    # Background wins its ties
+    np.equal(scores[0], best_score, out=is_best)
+    if threshold is not None:
+        is_best |= best_score <= threshold
+    class_map[is_best] = 0
+    return class_map
+
+
 def get_binary_mask(mask: np.ndarray) -> np.ndarray:
     """Convert class mask to binary mask"""
-    binary_mask = np.zeros_like(mask[0], np.uint8)
-    for class_id, class_mask in enumerate(mask):
-        if class_id > 0:
-            binary_mask[np.where(class_mask > 0.0)] = class_id
-    return binary_mask
+    return get_class_map(mask, threshold=0.0)
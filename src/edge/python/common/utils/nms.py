@@ -0,0 +1,248 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   nms.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Vectorised non-max suppression.
+"""
+
+from functools import partial
+
+import numpy as np
+
+NMS_METHODS = ("hard", "diou", "soft_linear", "soft_gaussian")
+BOX_FORMATS = ("xyxy", "xywh")
+# Up to this many candidates, computing the IoU of all pairs at once is
+# cheaper than one vectorised call per kept box.
+DENSE_LIMIT = 256
+
+
+def box_iou(corners, areas, index, others, diou=False):
+    """Compute the IoU (or DIoU) of one box with other boxes.
+
+    Reference Paper:
+        "Distance-IoU Loss: Faster and Better Learning for Bounding Box
+        Regression" https://arxiv.org/abs/1911.08287
+
+    Args:
+        corners: Tuple of (xmin, ymin, xmax, ymax) coordinate arrays.
+        areas: Array of box areas.
+        index: Index of the box to compare against.
+        others: Array of indices of the other boxes. Indices broadcast,
+            so a column of indices and a row of indices give all pairs.
+        diou: Whether to subtract the normalised center distance penalty.
+
+    Returns:
+        Array of the IoU of each of the other boxes with the box.
+    """
+    xmin, ymin, xmax, ymax = corners
+    other_xmin, other_ymin = xmin[others], ymin[others]
+    other_xmax, other_ymax = xmax[others], ymax[others]
+
+    inter_w = (np.minimum(other_xmax, xmax[index]) -
+               np.maximum(other_xmin, xmin[index]))
+    inter_h = (np.minimum(other_ymax, ymax[index]) -
+               np.maximum(other_ymin, ymin[index]))
+    np.maximum(inter_w, 0, out=inter_w)
+    np.maximum(inter_h, 0, out=inter_h)
+    inter = np.multiply(inter_w, inter_h, out=inter_w)
+    union = areas[others] + areas[index] - inter
+    iou = np.divide(inter, union, out=inter, where=union > 0)
+    if not diou:
+        return iou
+
+    center_distance = (
+        np.square(other_xmin + other_xmax - xmin[index] - xmax[index]) +
+        np.square(other_ymin + other_ymax - ymin[index] - ymax[index])) / 4
+    enclose_w = (np.maximum(other_xmax, xmax[index]) -
+                 np.minimum(other_xmin, xmin[index]))
+    enclose_h = (np.maximum(other_ymax, ymax[index]) -
+                 np.minimum(other_ymin, ymin[index]))
+    enclose_diagonal = np.square(enclose_w) + np.square(enclose_h)
+    iou -= center_distance / (enclose_diagonal + np.finfo(iou.dtype).eps)
+    return iou
+
+
+def non_max_suppression(boxes,
+                        classes,
+                        scores,
+                        iou_threshold=0.5,
+                        method="hard",
+                        box_format="xyxy",
+                        top_k=None,
+                        max_boxes=None,
+                        confidence=0.0,
+                        sigma=0.5):
+    """Carry out class-aware non-max suppression.
+
+    See `nms_indices` for the arguments.
+
+    Returns:
+        Tuple of (boxes, classes, scores) arrays of the kept boxes in the
+            input box format, sorted by descending score. Soft-NMS returns
+            the decayed scores.
+    """
+    boxes = np.asarray(boxes)
+    classes = np.asarray(classes)
+    keep, kept_scores = nms_indices(boxes, classes, scores, iou_threshold,
+                                    method, box_format, top_k, max_boxes,
+                                    confidence, sigma)
+    return boxes[keep].reshape(-1, 4), classes[keep], kept_scores
+
+
+def nms_indices(boxes,
+                classes,
+                scores,
+                iou_threshold=0.5,
+                method="hard",
+                box_format="xyxy",
+                top_k=None,
+                max_boxes=None,
+                confidence=0.0,
+                sigma=0.5):
+    """Select boxes with class-aware non-max suppression in one sorted pass.
+
+    Boxes of different classes are shifted apart by a class-dependent
+    offset, so that they never overlap and all classes are suppressed
+    together. Each kept box then suppresses or decays all remaining boxes
+    with one vectorised operation, so the Python loop only runs once per
+    kept box, and memory grows linearly with the number of boxes.
+
+    Args:
+        boxes: Array of shape (N, 4).
+        classes: Array of shape (N,) of class IDs.
+        scores: Array of shape (N,) of scores.
+        iou_threshold: IoU (or DIoU) above which a box is suppressed,
+            or its score decayed for linear Soft-NMS.
+        method: One of `NMS_METHODS`.
+        box_format: `xyxy` for (xmin, ymin, xmax, ymax), or `xywh` for
+            top left coordinates with width and height.
+        top_k: Only keep the `top_k` highest scoring boxes before NMS.
+        max_boxes: Maximum number of boxes returned.
+        confidence: Score below which Soft-NMS discards a decayed box.
+        sigma: Gaussian Soft-NMS decay parameter.
+
+    Returns:
+        Tuple of (indices, scores), the indices of the kept boxes in the
+            input arrays sorted by descending score, and their scores.
+            Soft-NMS returns the decayed scores.
+
+    Raises:
+        ValueError: If the method or box format is not supported.
+    """
+    if method not in NMS_METHODS:
+        raise ValueError(f"Unsupported NMS method {method}, "
+                         f"must be one of {NMS_METHODS}!")
+    if box_format not in BOX_FORMATS:
+        raise ValueError(f"Unsupported box format {box_format}, "
+                         f"must be one of {BOX_FORMATS}!")
+    scores = np.asarray(scores)
+    if len(scores) == 0:
+        return np.zeros(0, dtype=np.intp), scores
+
+    order = np.argsort(-scores, kind="stable")
+    if top_k is not None:
+        order = order[:top_k]
+
+    corners = np.asarray(boxes, dtype=np.float64)[order]
+    if box_format == "xywh":
+        corners[:, 2:] += corners[:, :2]
+    # Class-offset trick: boxes of different classes can never overlap
+    offset = (corners.max() - corners.min() + 1) * np.asarray(
+        classes, dtype=np.float64)[order]
+    corners += offset[:, None]
+    # Contiguous coordinate columns for fast gathers
+    corners = tuple(np.ascontiguousarray(column) for column in corners.T)
+    areas = (corners[2] - corners[0]) * (corners[3] - corners[1])
+
+    iou_of = _iou_function(corners, areas, method == "diou")
+
+    if method in ("hard", "diou"):
+        keep = _hard_suppression(iou_of, len(areas), iou_threshold)[:max_boxes]
+        return order[keep], scores[order[keep]]
+
+    decayed = scores[order].astype(np.float64)
+    keep = _soft_suppression(iou_of, decayed, method, iou_threshold,
+                             confidence, sigma)[:max_boxes]
+    dtype = scores.dtype if scores.dtype.kind == "f" else np.float64
+    return order[keep], decayed[keep].astype(dtype)
+
+
+def _iou_function(corners, areas, diou):
+    """Get a function computing the IoU of one box with other boxes.
+
+    Args:
+        corners: Tuple of (xmin, ymin, xmax, ymax) coordinate arrays.
+        areas: Array of box areas.
+        diou: Whether to use DIoU instead of IoU.
+
+    Returns:
+        Callable taking the index of a box and an array of indices of
+            other boxes, and returning their IoU with the box.
+    """
+    if len(areas) > DENSE_LIMIT:
+        return partial(box_iou, corners, areas, diou=diou)
+    indices = np.arange(len(areas))
+    pairwise = box_iou(corners, areas, indices[:, None], indices, diou)
+    return lambda index, others: pairwise[index, others]
+
+
+def _hard_suppression(iou_of, num_boxes, iou_threshold):
+    """Greedily suppress boxes overlapping a higher scoring kept box.
+
+    Args:
+        iou_of: IoU function returned by `_iou_function`.
+        num_boxes: Number of boxes, sorted by descending score.
+        iou_threshold: IoU above which a box is suppressed.
+
+    Returns:
+        Indices of the kept boxes.
+    """
+    remaining = np.arange(num_boxes)
+    keep = []
+    while remaining.size:
+        index, remaining = remaining[0], remaining[1:]
+        keep.append(index)
+        remaining = remaining[iou_of(index, remaining) <= iou_threshold]
+    return np.array(keep, dtype=np.intp)
+
+
+def _soft_suppression(iou_of, scores, method, iou_threshold, confidence,
+                      sigma):
+    """Decay the scores of boxes overlapping higher scoring boxes.
+
+    Args:
+        iou_of: IoU function returned by `_iou_function`.
+        scores: Array of scores, decayed in place.
+        method: `soft_linear` or `soft_gaussian`.
+        iou_threshold: IoU above which linear Soft-NMS decays a score.
+        confidence: Score below which a box is discarded.
+        sigma: Gaussian decay parameter.
+
+    Returns:
+        Indices of the kept boxes in descending order of their decayed
+            scores.
+    """
+    remaining = np.flatnonzero(scores >= confidence)
+    keep = []
+    while remaining.size:
+        best = int(np.argmax(scores[remaining]))
+        index = remaining[best]
+        keep.append(index)
+        remaining = np.delete(remaining, best)
+        iou = iou_of(index, remaining)
+        if method == "soft_gaussian":
+            decay = np.exp(-np.square(iou) / sigma)
+        else:
+            decay = np.where(iou > iou_threshold, 1 - iou, 1.0)
+        scores[remaining] *= decay
+        remaining = remaining[scores[remaining] >= confidence]
+    return np.array(keep, dtype=np.intp)
@@ -0,0 +1,127 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   shared_memory.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Shared memory frame slots for inter-process frame transport.
+"""
+
+import ctypes
+import multiprocessing
+import queue
+
+import numpy as np
+
+
+class SharedFrameSlots:
+
+    """Fixed pool of shared memory slots holding one frame each.
+
+    Frames are copied once into a slot by the producer process and read
+    in place by the consumer process, so only the slot index, shape and
+    dtype travel through the (pickling) multiprocessing queues. Slots are
+    allocated with `multiprocessing.RawArray`, which is available on every
+    supported Python version and is inherited by child processes when
+    passed as a `Process` argument.
+
+    Slot bookkeeping (`acquire` and `release`) is only valid in the process
+    that created the slots.
+    """
+
+    def __init__(self, num_slots, slot_bytes, context=None):
+        """Initialize shared frame slots.
+
+        Args:
+            num_slots: Number of frames that can be in flight at once.
+            slot_bytes: Size of each slot in bytes.
+            context: Multiprocessing context used to allocate the slots.
+        """
+        context = context or multiprocessing.get_context()
+        self.slot_bytes = int(slot_bytes)
+        self._buffers = [
+            context.RawArray(ctypes.c_uint8, self.slot_bytes)
+            for _ in range(num_slots)
+        ]
+        self._free = queue.Queue()
+        for index in range(num_slots):
+            self._free.put(index)
+
+    def __len__(self):
+        """Get number of slots."""
+        return len(self._buffers)
+
+    def __getstate__(self):
+        """Only share the buffers with child processes."""
+        return {"slot_bytes": self.slot_bytes, "_buffers": self._buffers}
+
+    def __setstate__(self, state):
+        """Restore the buffers in a child process."""
+        self.__dict__.update(state)
+        self._free = None
+
+    def acquire(self, timeout=None):
+        """Reserve a free slot, blocking until one is released.
+
+        Args:
+            timeout: Maximum time to wait in seconds, None to wait forever.
+
+        Returns:
+            Index of the reserved slot.
+
+        Raises:
+            queue.Empty: If no slot was released within the timeout.
+        """
+        return self._free.get(timeout=timeout)
+
+    def release(self, index):
+        """Return a slot to the pool of free slots.
+
+        Args:
+            index: Index of the slot.
+        """
+        self._free.put(index)
+
+    def write(self, index, frame):
+        """Copy a frame into a slot.
+
+        Args:
+            index: Index of the slot.
+            frame: Numpy array to copy.
+
+        Returns:
+            Tuple of (shape, dtype string) needed to read the frame back.
+
+        Raises:
+            ValueError: If the frame does not fit into a slot.
+        """
+        frame = np.asarray(frame)
+        if frame.nbytes > self.slot_bytes:
+            raise ValueError(
+                f"Frame of {frame.nbytes} bytes does not fit into shared"
+                f" memory slot of {self.slot_bytes} bytes!")
+        np.copyto(self.view(index, frame.shape, frame.dtype), frame)
+        return frame.shape, frame.dtype.str
+
+    def view(self, index, shape, dtype):
+        """Get a zero-copy numpy view of a frame stored in a slot.
+
+        Args:
+            index: Index of the slot.
+            shape: Shape of the stored frame.
+            dtype: Data type of the stored frame.
+
+        Returns:
+            Numpy array backed by the shared memory slot.
+        """
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape, dtype=np.int64))
+        return np.frombuffer(self._buffers[index], dtype=dtype,
+                             count=count).reshape(shape)
@@ -0,0 +1,278 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   video_encoder.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Video encoder running in a background process.
+"""
+
+import multiprocessing
+import os
+import queue
+
+import numpy as np
+
+from .shared_memory import SharedFrameSlots
+
+# Timeout (in seconds) used while waiting on the encoder,
+# so that a dead encoder is detected instead of blocking forever.
+_POLL_TIMEOUT = 1.0
+_SEGMENT = "segment"
+_DONE = "done"
+
+
+def segment_path(output_path, index):
+    """Get the path of a video segment.
+
+    Args:
+        output_path: Output video path.
+        index: Index of the segment.
+
+    Returns:
+        Output path with the segment index appended to the file name.
+    """
+    root, ext = os.path.splitext(output_path)
+    return f"{root}_{index:04d}{ext}"
+
+
+def _encoder(slots, tasks, results, options):
+    """Run the encoder process loop.
+
+    Writes frames read in place from the shared memory slots until a None
+    task is received, rotating to a new segment file when the current one
+    reaches the segment duration or size.
+
+    The OpenCV writer does not report how many bytes it has encoded, so
+    the size of a segment is read from its file on disk. The writer
+    buffers encoded frames, so a segment can exceed the size threshold by
+    the frames still buffered when it is reached.
+
+    Args:
+        slots: Shared frame slots.
+        tasks: Queue of (slot, shape, dtype) tuples.
+        results: Queue of (slot, None) tuples for encoded frames,
+            (`_SEGMENT`, path) tuples for finalised segments, (None, error)
+            on failure, and a final (`_DONE`, None) tuple.
+        options: Dictionary of `VideoEncoder` options.
+    """
+    # pylint: disable=import-outside-toplevel
+    import cv2
+
+    segmented = bool(options["segment_frames"] or options["segment_bytes"])
+    writer = None
+    path = None
+    segment = 0
+    frames = 0
+
+    def open_writer():
+        path = (segment_path(options["output_path"], segment)
+                if segmented else options["output_path"])
+        writer = cv2.VideoWriter(path,
+                                 cv2.VideoWriter_fourcc(*options["codec"]),
+                                 options["fps"], tuple(options["frame_size"]))
+        if options["quality"] is not None:
+            writer.set(cv2.VIDEOWRITER_PROP_QUALITY, options["quality"])
+        return writer, path
+
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            slot, shape, dtype = task
+            if writer is None:
+                writer, path = open_writer()
+            try:
+                writer.write(slots.view(slot, shape, dtype))
+            finally:
+                results.put((slot, None))
+            frames += 1
+            if ((options["segment_frames"]
+                 and frames >= options["segment_frames"])
+                    or (options["segment_bytes"] and
+                        os.path.getsize(path) >= options["segment_bytes"])):
+                writer.release()
+                results.put((_SEGMENT, path))
+                writer = None
+                segment += 1
+                frames = 0
+    except Exception as exc:  # pylint: disable=broad-except
+        results.put((None, f"{exc.__class__.__name__}: {exc}"))
+    finally:
+        if writer is not None:
+            writer.release()
+            results.put((_SEGMENT, path))
+        results.put((_DONE, None))
+
+
+class VideoEncoder:
+
+    """Encode video frames in a background process.
+
+    Frames are copied once into shared memory slots and encoded by the
+    background process, so the caller only pays for the copy instead of
+    the encoding. `write` blocks while every slot is waiting to be
+    encoded, so no frame is ever dropped.
+
+    The output can be split into segments of a maximum duration or file
+    size, which are written to the output path with the segment index
+    appended to the file name.
+    """
+
+    def __init__(self,
+                 output_path,
+                 fps,
+                 frame_size,
+                 codec="mp4v",
+                 quality=None,
+                 segment_duration=None,
+                 segment_bytes=None,
+                 slots=4,
+                 start_method="spawn"):
+        """Initialize video encoder.
+
+        Args:
+            output_path: Output video path.
+            fps: Frame rate of the video.
+            frame_size: Frame size as [width, height].
+            codec: FourCC code of the video codec.
+            quality: Optional encoding quality from 0 to 100, for the
+                codecs whose OpenCV backend supports it.
+            segment_duration: Optional maximum duration of a segment in
+                seconds.
+            segment_bytes: Optional approximate maximum size of a segment
+                in bytes, checked against the size of the file on disk.
+            slots: Number of shared memory frame slots, i.e. the maximum
+                number of frames waiting to be encoded.
+            start_method: Multiprocessing start method of the encoder.
+        """
+        width, height = frame_size
+        self.segments = []
+        self._options = {
+            "output_path": output_path,
+            "fps": fps,
+            "frame_size": [int(width), int(height)],
+            "codec": codec,
+            "quality": quality,
+            "segment_frames":
+            int(segment_duration * fps) if segment_duration else None,
+            "segment_bytes": int(segment_bytes) if segment_bytes else None,
+        }
+        self._context = multiprocessing.get_context(start_method)
+        self._slots = SharedFrameSlots(slots,
+                                       int(width) * int(height) * 3,
+                                       self._context)
+        self._tasks = self._context.Queue()
+        self._results = self._context.Queue()
+        self._done = False
+        self._process = None
+
+    @property
+    def frame_size(self):
+        """Get the frame size of the video as (width, height)."""
+        return tuple(self._options["frame_size"])
+
+    def start(self):
+        """Start the encoder process.
+
+        Returns:
+            self
+        """
+        self._process = self._context.Process(
+            target=_encoder,
+            args=(self._slots, self._tasks, self._results, self._options),
+            name="video-encoder",
+            daemon=True,
+        )
+        self._process.start()
+        return self
+
+    def write(self, frame):
+        """Copy a frame into a free slot and queue it for encoding.
+
+        Args:
+            frame: BGR frame of the video frame size.
+
+        Raises:
+            RuntimeError: If the encoder failed or exited.
+        """
+        while True:
+            try:
+                slot = self._slots.acquire(timeout=0)
+                break
+            except queue.Empty:
+                self._reclaim(block=True)
+        try:
+            shape, dtype = self._slots.write(slot,
+                                             np.ascontiguousarray(frame))
+        except Exception:
+            self._slots.release(slot)
+            raise
+        self._tasks.put((slot, shape, dtype))
+        self._reclaim(block=False)
+
+    def stop(self):
+        """Encode the queued frames and finalise the video.
+
+        Returns:
+            List of the paths of the written video files.
+
+        Raises:
+            RuntimeError: If the encoder failed.
+        """
+        if self._process is None:
+            return self.segments
+        self._tasks.put(None)
+        try:
+            while not self._done:
+                self._reclaim(block=True, stopping=True)
+        finally:
+            self._process.join(_POLL_TIMEOUT)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+        return self.segments
+
+    def _reclaim(self, block, stopping=False):
+        """Release the slots of encoded frames.
+
+        Args:
+            block: Whether to wait for at least one result.
+            stopping: Whether the encoder process is expected to exit.
+
+        Raises:
+            RuntimeError: If the encoder failed or exited unexpectedly.
+        """
+        while True:
+            try:
+                slot, message = self._results.get(
+                    timeout=_POLL_TIMEOUT if block else 0)
+            except queue.Empty:
+                if not block:
+                    return
+                if not self._process.is_alive():
+                    if stopping:
+                        self._done = True
+                        return
+                    raise RuntimeError(
+                        f"Video encoder exited with code "
+                        f"{self._process.exitcode}!") from None
+                continue
+            block = False
+            if slot == _SEGMENT:
+                self.segments.append(message)
+            elif slot == _DONE:
+                self._done = True
+                return
+            elif slot is None:
+                raise RuntimeError(f"Video encoder failed: {message}")
+            else:
+                self._slots.release(slot)
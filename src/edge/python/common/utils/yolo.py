@@ -0,0 +1,215 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   yolo.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   YOLO head decoder with cached grid and anchor tables.
+"""
+
+import numpy as np
+
+ANCHOR_MASKS = {
+    3: [[6, 7, 8], [3, 4, 5], [0, 1, 2]],
+    2: [[3, 4, 5], [0, 1, 2]],
+}
+
+
+def sigmoid(array):
+    """Apply the logistic sigmoid in place.
+
+    Evaluated as `0.5 * tanh(0.5 * x) + 0.5`, which NumPy vectorises and
+    is several times faster than `scipy.special.expit` on float32.
+
+    Args:
+        array: Floating point array, overwritten with the result.
+
+    Returns:
+        The input array.
+    """
+    array *= 0.5
+    np.tanh(array, out=array)
+    array *= 0.5
+    array += 0.5
+    return array
+
+
+class YoloDecoder:
+
+    """Decode YOLOv3/v4 head outputs into bounding box parameters.
+
+    The model input shape and anchors never change at runtime, so the
+    grid offsets and anchor scales of every output scale are computed
+    once, on the first frame of each output shape. Frames are then decoded
+    with in-place operations into a reused output buffer.
+
+    In sparse mode, the raw objectness logits are compared against the
+    inverse sigmoid of the confidence threshold first, and boxes and class
+    scores are only decoded for the cells that pass. As class scores never
+    exceed 1, a cell below the threshold on objectness alone can never
+    pass the final score threshold, so the postprocessed output is the
+    same as with dense decoding.
+    """
+
+    # Margin on the objectness logit threshold, absorbing float32
+    # rounding of the sigmoid so that no passing cell is filtered out
+    LOGIT_MARGIN = 1e-2
+
+    def __init__(self, anchors, num_classes, input_shape, sparse=False):
+        """Initialize YOLO decoder.
+
+        Args:
+            anchors: YOLO style anchor array of shape (num_anchors, 2).
+            num_classes: Total number of classes.
+            input_shape: Model input shape as (height, width).
+            sparse: Whether to only decode cells whose objectness passes
+                the confidence threshold given to `decode`.
+        """
+        self.anchors = np.asarray(anchors, dtype=np.float32)
+        self.num_classes = num_classes
+        self.input_shape = tuple(input_shape)
+        self.sparse = sparse
+        self._tables = {}
+        self._buffer = None
+
+    def decode(self, predictions, confidence=None):
+        """Decode the outputs of all scales of a YOLO head.
+
+        Args:
+            predictions: List of arrays of shape (N, grid_h, grid_w,
+                num_anchors * (5 + num_classes)), one for each scale.
+            confidence: Score threshold applied after decoding, which
+                sparse decoding uses to skip cells. Ignored when dense.
+
+        Returns:
+            Array of shape (N, num_boxes, 5 + num_classes) of
+                (x, y, w, h, objectness, class scores...) rows, with box
+                centers and sizes relative to the input shape. The array
+                is overwritten by the next call. Sparse decoding returns
+                an array of shape (1, num_kept_boxes, 5 + num_classes)
+                of the kept rows of all images in order.
+
+        Raises:
+            ValueError: If the number of outputs is not supported.
+        """
+        if len(predictions) not in ANCHOR_MASKS:
+            raise ValueError(
+                f"Unsupported prediction length: {len(predictions)}")
+        # The coarsest grid is assigned the largest anchors
+        predictions = sorted(predictions,
+                             key=lambda output: np.shape(output)[1])
+        tables = [
+            self._table(np.shape(prediction)[1:3], mask)
+            for prediction, mask in zip(predictions, ANCHOR_MASKS[len(
+                predictions)])
+        ]
+
+        batch_size = len(predictions[0])
+        if self.sparse and confidence is not None:
+            return self._decode_sparse(predictions, tables, batch_size,
+                                       confidence)
+        num_boxes = sum(len(offsets) for offsets, _, _ in tables)
+        shape = (batch_size, num_boxes, 5 + self.num_classes)
+        if self._buffer is None or self._buffer.shape != shape:
+            self._buffer = np.empty(shape, dtype=np.float32)
+        buffer = self._buffer
+
+        start = 0
+        for prediction, (offsets, inverse_grid, anchor_scales) in zip(
+                predictions, tables):
+            end = start + len(offsets)
+            output = buffer[:, start:end]
+            np.copyto(output, np.reshape(prediction, output.shape))
+            box_xy = output[..., :2]
+            sigmoid(box_xy)
+            box_xy += offsets
+            box_xy *= inverse_grid
+            box_wh = output[..., 2:4]
+            np.exp(box_wh, out=box_wh)
+            box_wh *= anchor_scales
+            scores = output[..., 4:]
+            sigmoid(scores)
+            start = end
+        return buffer
+
+    def _decode_sparse(self, predictions, tables, batch_size, confidence):
+        """Decode only the cells whose objectness passes the threshold.
+
+        Args:
+            predictions: List of outputs, sorted by grid size.
+            tables: List of cached tables of each output.
+            batch_size: Number of images.
+            confidence: Score threshold applied after decoding.
+
+        Returns:
+            Array of shape (1, num_kept_boxes, 5 + num_classes).
+        """
+        if confidence <= 0:
+            threshold = -np.inf
+        elif confidence >= 1:
+            threshold = np.inf
+        else:
+            threshold = np.log(confidence / (1 - confidence))
+        threshold -= self.LOGIT_MARGIN
+
+        rows = []
+        batch_indices = []
+        for prediction, (offsets, inverse_grid, anchor_scales) in zip(
+                predictions, tables):
+            prediction = np.reshape(prediction,
+                                    (batch_size, -1, 5 + self.num_classes))
+            batch_index, box_index = np.nonzero(
+                prediction[..., 4] >= threshold)
+            output = prediction[batch_index, box_index].astype(np.float32)
+            box_xy = output[:, :2]
+            sigmoid(box_xy)
+            box_xy += offsets[box_index]
+            box_xy *= inverse_grid
+            box_wh = output[:, 2:4]
+            np.exp(box_wh, out=box_wh)
+            box_wh *= anchor_scales[box_index]
+            scores = output[:, 4:]
+            sigmoid(scores)
+            rows.append(output)
+            batch_indices.append(batch_index)
+
+        # Same row order as dense decoding, image by image
+        order = np.argsort(np.concatenate(batch_indices), kind="stable")
+        return np.concatenate(rows)[order][np.newaxis]
+
+    def _table(self, grid_shape, mask):
+        """Get the cached grid offsets and anchor scales of a scale.
+
+        Args:
+            grid_shape: Output grid shape as (grid_h, grid_w).
+            mask: Indices of the anchors of the scale.
+
+        Returns:
+            Tuple of (offsets, inverse grid, anchor scales), where offsets
+                and anchor scales have one (x, y) row per box.
+        """
+        key = (tuple(grid_shape), tuple(mask))
+        if key not in self._tables:
+            grid_h, grid_w = grid_shape
+            # Check if stride on height & width are same
+            assert (self.input_shape[0] // grid_h == self.input_shape[1] //
+                    grid_w), "model stride mismatch."
+            x_offset, y_offset = np.meshgrid(np.arange(grid_w),
+                                             np.arange(grid_h))
+            offsets = np.stack([x_offset.ravel(), y_offset.ravel()], axis=1)
+            offsets = np.repeat(offsets, len(mask), axis=0)
+            anchor_scales = np.tile(
+                self.anchors[mask] / np.array(self.input_shape[::-1]),
+                (grid_h * grid_w, 1))
+            inverse_grid = 1 / np.array([grid_w, grid_h])
+            self._tables[key] = (offsets.astype(np.float32),
+                                 inverse_grid.astype(np.float32),
+                                 anchor_scales.astype(np.float32))
+        return self._tables[key]
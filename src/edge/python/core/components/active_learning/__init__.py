@@ -0,0 +1,25 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   __init__.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Package for active learning uploads.
+"""
+
+from .client import DatatureClient
+from .selector import FrameSelector
+from .spool import UploadSpool
+from .uploader import TokenBucket, Uploader
+
+__all__ = [
+    "DatatureClient", "FrameSelector", "TokenBucket", "UploadSpool",
+    "Uploader"
+]
@@ -0,0 +1,77 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   client.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Datature SDK client for active learning uploads.
+"""
+
+
+class DatatureClient:
+
+    """Upload batches to Nexus using the Datature SDK.
+
+    The uploader only depends on the three methods of this class, so any
+    object implementing them, e.g. a local stand-in in tests, can be used
+    in its place.
+    """
+
+    def __init__(self, secret_key):
+        """Initialize Datature client.
+
+        Args:
+            secret_key: Secret key of the Nexus project.
+        """
+        # pylint: disable=import-outside-toplevel
+        import datature
+
+        datature.secret_key = secret_key
+        self._datature = datature
+
+    def upload_assets(self, paths, groups):
+        """Start uploading images.
+
+        Args:
+            paths: List of image paths.
+            groups: List of asset groups of the images.
+
+        Returns:
+            Link of the upload operation.
+        """
+        upload_session = self._datature.Asset.upload_session()
+        for path in paths:
+            upload_session.add(path)
+        return upload_session.start(groups=groups, background=True)["op_link"]
+
+    def upload_predictions(self, path):
+        """Start uploading predictions.
+
+        Args:
+            path: Path of the predictions CSV file in four corner format.
+
+        Returns:
+            Link of the upload operation.
+        """
+        return self._datature.Annotation.upload("csv_fourcorner",
+                                                path,
+                                                background=True)["op_link"]
+
+    def finished(self, op_link):
+        """Get the number of finished items of an upload operation.
+
+        Args:
+            op_link: Link of the upload operation.
+
+        Returns:
+            Number of finished items.
+        """
+        return self._datature.Operation.retrieve(
+            op_link)["status"]["progress"]["with_status"]["finished"]
@@ -0,0 +1,204 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   selector.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Uncertainty-driven selection of active learning frames.
+"""
+
+import time
+from collections import deque
+
+import numpy as np
+
+# Scores are clipped away from 0 and 1 so that the entropy stays finite
+_EPSILON = 1e-6
+_HOUR = 3600.0
+
+
+class FrameSelector:
+
+    """Select the frames worth uploading for active learning.
+
+    Each frame with detections gets an uncertainty from 0 to 1 computed
+    from the scores of its detections by one of the strategies below:
+        interval: Every frame is fully uncertain, so only the frame
+            interval and hourly budget apply.
+        entropy: Mean binary entropy of the detection scores, in bits.
+        margin: One minus the smallest margin of a detection score above
+            the confidence threshold, normalised to the score range above
+            the threshold.
+        near_threshold: Number of detections scoring less than `band`
+            above the confidence threshold, divided by `near_count` and
+            capped at 1.
+
+    The uncertainty is raised by a class rarity boost of up to
+    `rarity_boost` for frames containing classes that were rarely seen so
+    far, so that confident frames of rare classes are still uploaded. The
+    frame is selected if its score reaches `min_score`, at least
+    `frame_interval` frames with detections have passed since the last
+    selected frame, and fewer than `hourly_budget` frames were selected in
+    the last hour.
+
+    Every step only touches the detections of the frame, so selection
+    runs in O(detections) per frame.
+    """
+
+    STRATEGIES = ("interval", "entropy", "margin", "near_threshold")
+
+    def __init__(self,
+                 strategy="interval",
+                 frame_interval=1,
+                 min_score=0.5,
+                 threshold=0.0,
+                 band=0.1,
+                 near_count=1,
+                 rarity_boost=0.0,
+                 hourly_budget=None,
+                 clock=time.monotonic):
+        """Initialize frame selector.
+
+        Args:
+            strategy: Uncertainty strategy, one of `STRATEGIES`.
+            frame_interval: Minimum number of frames with detections
+                between two selected frames.
+            min_score: Minimum score of a selected frame, i.e. its
+                uncertainty plus its rarity boost.
+            threshold: Confidence threshold of the predictor.
+            band: Width of the score band above the confidence threshold
+                counted by the near_threshold strategy.
+            near_count: Number of detections in the band that makes a
+                frame fully uncertain for the near_threshold strategy.
+            rarity_boost: Maximum score added to frames containing rare
+                classes, 0 to disable.
+            hourly_budget: Optional maximum number of frames selected per
+                hour.
+            clock: Function returning the current time in seconds.
+
+        Raises:
+            ValueError: If the strategy is not supported.
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unsupported selection strategy {strategy}, "
+                             f"must be one of {self.STRATEGIES}!")
+        self.strategy = strategy
+        self.frame_interval = max(1, int(frame_interval))
+        self.min_score = min_score
+        self.threshold = threshold
+        self.band = band
+        self.near_count = max(1, int(near_count))
+        self.rarity_boost = rarity_boost
+        self.hourly_budget = hourly_budget
+        self._clock = clock
+        self._uncertainty = getattr(self, f"_{strategy}")
+        self._class_counts = np.zeros(0, np.int64)
+        self._most_frequent = 0
+        self._selected_times = deque()
+        self._frames_since_selected = self.frame_interval
+        self._evaluated = 0
+        self._selected = 0
+        self._over_budget = 0
+
+    def stats(self):
+        """Get selection statistics.
+
+        Returns:
+            Dictionary of the number of evaluated and selected frames, and
+                of frames skipped because the hourly budget was spent.
+        """
+        return {
+            "strategy": self.strategy,
+            "evaluated": self._evaluated,
+            "selected": self._selected,
+            "over_budget": self._over_budget,
+        }
+
+    def select(self, predictions):
+        """Decide whether to upload a frame.
+
+        Args:
+            predictions: Detections of the frame.
+
+        Returns:
+            True if the frame should be uploaded, False otherwise.
+        """
+        if len(predictions) == 0:
+            return False
+        self._evaluated += 1
+        self._frames_since_selected += 1
+        score = self._uncertainty(np.asarray(predictions.scores))
+        if self.rarity_boost:
+            score += self._boost(np.asarray(predictions.classes))
+        if (score < self.min_score
+                or self._frames_since_selected < self.frame_interval):
+            return False
+
+        if self.hourly_budget is not None:
+            now = self._clock()
+            while (self._selected_times
+                   and now - self._selected_times[0] >= _HOUR):
+                self._selected_times.popleft()
+            if len(self._selected_times) >= self.hourly_budget:
+                self._over_budget += 1
+                return False
+            self._selected_times.append(now)
+        self._frames_since_selected = 0
+        self._selected += 1
+        return True
+
+    @staticmethod
+    def _interval(_):
+        """Get the uncertainty of the interval strategy."""
+        return 1.0
+
+    @staticmethod
+    def _entropy(scores):
+        """Get the mean binary entropy of the scores in bits."""
+        scores = np.clip(scores, _EPSILON, 1 - _EPSILON)
+        entropy = -(scores * np.log2(scores) +
+                    (1 - scores) * np.log2(1 - scores))
+        return float(entropy.mean())
+
+    def _margin(self, scores):
+        """Get one minus the smallest normalised margin of the scores."""
+        margin = (scores.min() - self.threshold) / max(
+            1 - self.threshold, _EPSILON)
+        return float(np.clip(1 - margin, 0.0, 1.0))
+
+    def _near_threshold(self, scores):
+        """Get the capped share of scores just above the threshold."""
+        near = np.count_nonzero(scores < self.threshold + self.band)
+        return min(1.0, near / self.near_count)
+
+    def _boost(self, classes):
+        """Get the rarity boost of the classes of a frame.
+
+        The rarity of a class is one minus its count of detections so far
+        relative to the most frequent class, so unseen classes get the
+        full boost. The counts are updated with the classes of the frame.
+
+        Args:
+            classes: Class IDs of the detections of the frame.
+
+        Returns:
+            Boost from 0 to `rarity_boost`.
+        """
+        if classes.max() >= len(self._class_counts):
+            self._class_counts = np.pad(
+                self._class_counts,
+                (0, int(classes.max()) + 1 - len(self._class_counts)))
+        rarity = 1.0
+        if self._most_frequent:
+            rarity -= self._class_counts[classes].min() / self._most_frequent
+        np.add.at(self._class_counts, classes, 1)
+        self._most_frequent = max(self._most_frequent,
+                                  int(self._class_counts[classes].max()))
+        return self.rarity_boost * rarity
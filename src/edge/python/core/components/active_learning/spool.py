@@ -0,0 +1,280 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   spool.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Durable on-disk queue of active learning upload batches.
+"""
+
+import csv
+import os
+import re
+import shutil
+from threading import Condition
+
+import cv2
+
+PREDICTIONS_FILE = "predictions.csv"
+PREDICTIONS_HEADER = ["filename", "xmin", "ymin", "xmax", "ymax", "label"]
+# Marker written once the images of a batch are uploaded, so that a resumed
+# upload only sends the predictions
+ASSETS_UPLOADED_FILE = "assets.uploaded"
+
+_BATCH_PATTERN = re.compile(r"^batch_(\d+)$")
+_OPEN_PATTERN = re.compile(r"^\.open_(\d+)$")
+
+
+class UploadSpool:
+
+    """Durable on-disk queue of frames and predictions to upload.
+
+    Frames are written to disk as soon as they are added, so memory use
+    does not grow with the upload backlog. Frames are grouped into batches
+    of `batch_size` frames:
+
+        spool_folder/
+            .open_00000003/     batch being filled, invisible to uploaders
+                <frame>.jpg
+                <frame>.csv     prediction rows of the frame
+            batch_00000002/     sealed batch, waiting to be uploaded
+                <frame>.jpg
+                predictions.csv
+                assets.uploaded written once the images are uploaded
+
+    Every file is written to a temporary name and renamed into place, and
+    a batch only becomes visible to uploaders once it is renamed from
+    `.open_` to `batch_`, so a crash never leaves a partial file behind.
+    Batches left open by a crash are sealed when the spool is reopened,
+    and sealed batches are only deleted once fully uploaded.
+    """
+
+    def __init__(self, folder, batch_size=10):
+        """Initialize upload spool.
+
+        Args:
+            folder: Spool directory, created if missing.
+            batch_size: Number of frames per upload batch.
+        """
+        self.folder = folder
+        self.batch_size = max(1, int(batch_size))
+        self._condition = Condition()
+        self._claimed = set()
+        os.makedirs(folder, exist_ok=True)
+
+        open_batches = self._scan(_OPEN_PATTERN)
+        sequences = open_batches + self._scan(_BATCH_PATTERN)
+        self._sequence = max(sequences, default=-1) + 1
+        self._open_frames = 0
+        for sequence in open_batches:
+            self._seal(sequence)
+
+    def __len__(self):
+        """Get number of sealed batches waiting to be uploaded."""
+        return len(self._scan(_BATCH_PATTERN))
+
+    def add(self, frame_id, image, rows):
+        """Write a frame and its prediction rows to the open batch.
+
+        Args:
+            frame_id: ID of the frame, used as its file name.
+            image: BGR image of the frame.
+            rows: List of (xmin, ymin, xmax, ymax, label) prediction rows.
+
+        Raises:
+            IOError: If the image cannot be written.
+        """
+        name = re.sub(r"[^\w.-]", "_", str(frame_id))
+        if f"{name}.csv" == PREDICTIONS_FILE:
+            name = f"_{name}"
+        folder = self._open_folder(self._sequence)
+        os.makedirs(folder, exist_ok=True)
+
+        image_path = os.path.join(folder, f"{name}.jpg")
+        temp_path = os.path.join(folder, f".{name}.tmp.jpg")
+        if not cv2.imwrite(temp_path, image):
+            raise IOError(f"Failed to write {image_path}!")
+        os.replace(temp_path, image_path)
+        # Rows are written after the image, so that a frame with rows
+        # always has its image
+        rows_path = os.path.join(folder, f"{name}.csv")
+        temp_path = os.path.join(folder, f".{name}.tmp.csv")
+        with open(temp_path, "w", encoding="utf-8", newline="") as file:
+            csv.writer(file).writerows([f"{name}.jpg", *row] for row in rows)
+        os.replace(temp_path, rows_path)
+
+        self._open_frames += 1
+        if self._open_frames >= self.batch_size:
+            self.seal()
+
+    def seal(self):
+        """Make the open batch available to uploaders, if it has frames."""
+        if self._open_frames or os.path.isdir(
+                self._open_folder(self._sequence)):
+            self._seal(self._sequence)
+            self._sequence += 1
+            self._open_frames = 0
+
+    def claim(self, timeout=None):
+        """Claim the oldest sealed batch not claimed by another uploader.
+
+        Args:
+            timeout: Maximum time to wait in seconds, None to wait forever.
+
+        Returns:
+            Path of the claimed batch, or None if no batch was sealed
+                within the timeout.
+        """
+        with self._condition:
+            batch = None
+
+            def available():
+                nonlocal batch
+                batch = next(
+                    (path for path in self._batches()
+                     if path not in self._claimed), None)
+                return batch is not None
+
+            if not self._condition.wait_for(available, timeout):
+                return None
+            self._claimed.add(batch)
+            return batch
+
+    def release(self, batch):
+        """Return a claimed batch to the queue after a failed upload.
+
+        Args:
+            batch: Path of the batch.
+        """
+        with self._condition:
+            self._claimed.discard(batch)
+            self._condition.notify_all()
+
+    def complete(self, batch):
+        """Delete a fully uploaded batch.
+
+        Args:
+            batch: Path of the batch.
+        """
+        shutil.rmtree(batch, ignore_errors=True)
+        with self._condition:
+            self._claimed.discard(batch)
+
+    def notify(self):
+        """Wake up all uploaders waiting for a batch."""
+        with self._condition:
+            self._condition.notify_all()
+
+    @staticmethod
+    def images(batch):
+        """Get the image paths of a batch.
+
+        Args:
+            batch: Path of the batch.
+
+        Returns:
+            Sorted list of image paths.
+        """
+        return sorted(
+            os.path.join(batch, name) for name in os.listdir(batch)
+            if name.endswith(".jpg") and not name.startswith("."))
+
+    @staticmethod
+    def predictions(batch):
+        """Get the predictions file of a batch."""
+        return os.path.join(batch, PREDICTIONS_FILE)
+
+    @staticmethod
+    def size(batch):
+        """Get the total size of the files of a batch in bytes."""
+        return sum(
+            os.path.getsize(os.path.join(batch, name))
+            for name in os.listdir(batch))
+
+    @staticmethod
+    def assets_uploaded(batch):
+        """Check whether the images of a batch have been uploaded."""
+        return os.path.exists(os.path.join(batch, ASSETS_UPLOADED_FILE))
+
+    @staticmethod
+    def mark_assets_uploaded(batch):
+        """Record that the images of a batch have been uploaded."""
+        with open(os.path.join(batch, ASSETS_UPLOADED_FILE),
+                  "w",
+                  encoding="utf-8"):
+            pass
+
+    def _seal(self, sequence):
+        """Merge the rows of an open batch and rename it to a batch.
+
+        Each step can be interrupted by a crash and safely run again when
+        the spool is reopened. The merged predictions are written to a
+        temporary file and renamed into place before any row file is
+        deleted, so either every row file or the merged predictions exist.
+        Frames whose rows were not written before a crash are discarded.
+
+        Args:
+            sequence: Sequence number of the open batch.
+        """
+        folder = self._open_folder(sequence)
+        predictions_path = os.path.join(folder, PREDICTIONS_FILE)
+        for name in os.listdir(folder):
+            if name.startswith("."):
+                os.remove(os.path.join(folder, name))
+
+        names = self._row_names(folder)
+        if not os.path.exists(predictions_path):
+            framed = set(names)
+            for name in os.listdir(folder):
+                if name.endswith(".jpg") and name[:-len(".jpg")] not in framed:
+                    os.remove(os.path.join(folder, name))
+            if not names:
+                os.rmdir(folder)
+                return
+            temp_path = os.path.join(folder, f".{PREDICTIONS_FILE}.tmp")
+            with open(temp_path, "w", encoding="utf-8", newline="") as file:
+                csv.writer(file).writerow(PREDICTIONS_HEADER)
+                for name in names:
+                    with open(os.path.join(folder, f"{name}.csv"),
+                              encoding="utf-8") as rows:
+                        shutil.copyfileobj(rows, file)
+            os.replace(temp_path, predictions_path)
+
+        for name in names:
+            os.remove(os.path.join(folder, f"{name}.csv"))
+        os.replace(folder, os.path.join(self.folder,
+                                        f"batch_{sequence:08d}"))
+        self.notify()
+
+    @staticmethod
+    def _row_names(folder):
+        """Get the sorted names of the frames with a row file."""
+        return sorted(
+            name[:-len(".csv")] for name in os.listdir(folder)
+            if name.endswith(".csv") and not name.startswith(".")
+            and name != PREDICTIONS_FILE)
+
+    def _open_folder(self, sequence):
+        """Get the path of an open batch."""
+        return os.path.join(self.folder, f".open_{sequence:08d}")
+
+    def _batches(self):
+        """Get the paths of the sealed batches in upload order."""
+        return [
+            os.path.join(self.folder, f"batch_{sequence:08d}")
+            for sequence in self._scan(_BATCH_PATTERN)
+        ]
+
+    def _scan(self, pattern):
+        """Get the sorted sequence numbers of the folders of a pattern."""
+        return sorted(
+            int(match.group(1)) for match in map(pattern.match,
+                                                 os.listdir(self.folder))
+            if match)
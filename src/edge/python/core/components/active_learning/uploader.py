@@ -0,0 +1,283 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   uploader.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Uploader draining the active learning upload spool.
+"""
+
+import random
+import time
+import traceback
+from threading import Event, Lock, Thread
+
+from common.logger import Logger
+
+
+class _Interrupted(Exception):
+
+    """Raised when an upload is interrupted by `Uploader.stop`."""
+
+
+class TokenBucket:
+
+    """Token bucket rate limiter.
+
+    Consuming more tokens than are available puts the bucket in debt, and
+    the caller waits until the debt is repaid, so a single request larger
+    than the bucket capacity is still allowed through at the average rate.
+    """
+
+    def __init__(self, rate, capacity=None):
+        """Initialize token bucket.
+
+        Args:
+            rate: Number of tokens added per second.
+            capacity: Maximum number of tokens, defaults to one second
+                worth of tokens.
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = Lock()
+
+    def consume(self, amount, stop_event=None):
+        """Consume tokens, waiting until the bucket is out of debt.
+
+        Args:
+            amount: Number of tokens to consume.
+            stop_event: Optional event interrupting the wait when set.
+
+        Returns:
+            False if the wait was interrupted, True otherwise.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity,
+                               self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= amount
+            delay = max(0.0, -self._tokens / self.rate)
+        if stop_event is None:
+            time.sleep(delay)
+            return True
+        return not stop_event.wait(delay)
+
+
+class Uploader:
+
+    """Long-lived uploader draining an upload spool.
+
+    Each worker claims the oldest sealed batch of the spool, uploads its
+    images, then its predictions, and deletes the batch once both uploads
+    have finished. Failed batches stay in the spool and are retried after
+    an exponential backoff with jitter shared by all workers, so a lost
+    uplink is not hammered by every worker at once. The images of a batch
+    are not uploaded again when only its predictions failed.
+
+    The SDK uploads the files of a batch itself, so the uploader cannot
+    pace the bytes on the wire. The rate limit instead charges the size of
+    each batch to a token bucket before it starts, which caps the average
+    upload rate across batches and workers, while each batch is still
+    uploaded at the full speed of the uplink.
+    """
+
+    def __init__(self,
+                 spool,
+                 client,
+                 groups=None,
+                 concurrency=1,
+                 rate_limit=None,
+                 base_backoff=1.0,
+                 max_backoff=300.0,
+                 poll_interval=1.0,
+                 max_poll_interval=30.0,
+                 upload_timeout=600.0):
+        """Initialize uploader.
+
+        Args:
+            spool: Upload spool to drain.
+            client: Client implementing the methods of `DatatureClient`.
+            groups: List of asset groups of the uploaded images.
+            concurrency: Number of batches uploaded concurrently.
+            rate_limit: Optional average upload rate limit in bytes per
+                second, charged per batch.
+            base_backoff: Delay before the first retry in seconds.
+            max_backoff: Maximum delay between retries in seconds.
+            poll_interval: Initial interval between upload operation
+                status checks in seconds.
+            max_poll_interval: Maximum interval between upload operation
+                status checks in seconds.
+            upload_timeout: Maximum time to wait for an upload operation
+                to finish in seconds.
+        """
+        self.spool = spool
+        self.client = client
+        self.groups = groups or []
+        self.concurrency = max(1, int(concurrency))
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.upload_timeout = upload_timeout
+        self._bucket = TokenBucket(rate_limit) if rate_limit else None
+        self._stop_event = Event()
+        self._lock = Lock()
+        self._workers = []
+        self._failures = 0
+        self._retry_at = 0.0
+        self._uploaded_batches = 0
+        self._uploaded_bytes = 0
+        self._failed_uploads = 0
+
+    def start(self):
+        """Start the upload workers.
+
+        Returns:
+            self
+        """
+        self._stop_event.clear()
+        self._workers = [
+            Thread(target=self._run_worker,
+                   name=f"active-learning-uploader-{index}",
+                   daemon=True) for index in range(self.concurrency)
+        ]
+        for worker in self._workers:
+            worker.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Stop the upload workers.
+
+        Uploads in progress are interrupted, and their batches are kept in
+        the spool to be uploaded on the next start.
+
+        Args:
+            timeout: Maximum time to wait for each worker in seconds.
+        """
+        self._stop_event.set()
+        self.spool.notify()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+
+    def stats(self):
+        """Get upload statistics.
+
+        Returns:
+            Dictionary of the number of uploaded batches and bytes, failed
+                uploads and batches waiting in the spool.
+        """
+        with self._lock:
+            return {
+                "uploaded_batches": self._uploaded_batches,
+                "uploaded_bytes": self._uploaded_bytes,
+                "failed_uploads": self._failed_uploads,
+                "pending_batches": len(self.spool),
+            }
+
+    def _run_worker(self):
+        """Upload spooled batches until stopped."""
+        while not self._stop_event.is_set():
+            with self._lock:
+                delay = self._retry_at - time.monotonic()
+            if delay > 0:
+                self._stop_event.wait(delay)
+                continue
+            batch = self.spool.claim(timeout=self.poll_interval)
+            if batch is None:
+                continue
+            try:
+                size = self._upload(batch)
+            except _Interrupted:
+                self.spool.release(batch)
+            except Exception as exc:  # pylint: disable=broad-except
+                self.spool.release(batch)
+                self._backoff(batch, exc)
+            else:
+                self.spool.complete(batch)
+                with self._lock:
+                    self._failures = 0
+                    self._uploaded_batches += 1
+                    self._uploaded_bytes += size
+
+    def _upload(self, batch):
+        """Upload the images, then the predictions of a batch.
+
+        Args:
+            batch: Path of the batch.
+
+        Returns:
+            Size of the batch in bytes.
+
+        Raises:
+            _Interrupted: If the uploader was stopped.
+        """
+        size = self.spool.size(batch)
+        if self._bucket is not None and not self._bucket.consume(
+                size, self._stop_event):
+            raise _Interrupted
+        start = time.time()
+        if not self.spool.assets_uploaded(batch):
+            images = self.spool.images(batch)
+            Logger.info(f"[Upload {batch}] Uploading {len(images)} images...")
+            self._wait(self.client.upload_assets(images, self.groups),
+                       len(images))
+            self.spool.mark_assets_uploaded(batch)
+        Logger.info(f"[Upload {batch}] Uploading predictions...")
+        predictions = self.spool.predictions(batch)
+        self._wait(self.client.upload_predictions(predictions), 1)
+        Logger.info(f"[Upload {batch}] Upload finished! "
+                    f"Took {time.time() - start:.2f}s")
+        return size
+
+    def _wait(self, op_link, items):
+        """Wait for an upload operation to finish.
+
+        The interval between status checks doubles up to the maximum poll
+        interval, so long uploads are not polled every second.
+
+        Args:
+            op_link: Link of the upload operation.
+            items: Number of items of the upload operation.
+
+        Raises:
+            _Interrupted: If the uploader was stopped.
+            TimeoutError: If the operation did not finish in time.
+        """
+        deadline = time.monotonic() + self.upload_timeout
+        interval = self.poll_interval
+        while self.client.finished(op_link) < items:
+            if time.monotonic() + interval > deadline:
+                raise TimeoutError(f"Upload operation {op_link} did not "
+                                   f"finish in {self.upload_timeout}s!")
+            if self._stop_event.wait(interval):
+                raise _Interrupted
+            interval = min(interval * 2, self.max_poll_interval)
+
+    def _backoff(self, batch, exc):
+        """Delay every worker after a failed upload.
+
+        Args:
+            batch: Path of the failed batch.
+            exc: Exception raised by the upload.
+        """
+        with self._lock:
+            self._failures += 1
+            self._failed_uploads += 1
+            delay = min(self.max_backoff,
+                        self.base_backoff * 2**(self._failures - 1))
+            delay *= random.uniform(0.5, 1.0)
+            self._retry_at = max(self._retry_at, time.monotonic() + delay)
+        Logger.warning(f"[Upload {batch}] Upload failed: {exc}, "
+                       f"retrying in {delay:.1f}s")
+        Logger.debug(f"\n{traceback.format_exc()}")
@@ -3,19 +3,26 @@ import numpy as np
 from abstract_postprocessor import AbstractPostprocessor
 from common.config import CONFIG
 from common.exceptions import InvalidBoundTypeException, MalformedOutputException
+from common.utils import Detections
 
 
 class Postprocessor(AbstractPostprocessor):
 
+    # Scores are shown to 2 decimal places, so labels are cached per
+    # hundredth of score
+    SCORE_BUCKETS = 100
+    LABEL_HEIGHT = 15
+
     def __init__(self, **kwargs):
         """Initialize drawing postprocessor module."""
         self.thickness = 2
+        self.alpha = 0.5
+        self._label_cache = {}
+        self._palette_lut = None
         self._detection_type = CONFIG["inference"]["detection_type"]
         self._segmentation_type = CONFIG["inference"][
             "segmentation_type"] if "segmentation_type" in CONFIG[
                 "inference"] else None
-        self._bbox_format = CONFIG["inference"][
-            "bbox_format"] if self._detection_type == "object_detection" else None
         super().__init__(**kwargs)
 
     def run(self, assets):
@@ -41,81 +48,99 @@ class Postprocessor(AbstractPostprocessor):
         except Exception as exc:
             raise MalformedOutputException(exc) from exc
 
-    def _draw_bbox(self, assets):
+    def _draw_bbox(self, assets, frame=None):
         """Draw bounding boxes on frame.
 
+        Boxes are drawn in place on a single BGR copy of the frame, and the
+        rendered label of each class and score bucket is cached, so busy
+        scenes only pay for text rendering once per distinct label.
+
         Args:
             assets: Dictionary of assets.
+            frame: Optional BGR frame to draw on in place, defaults to a
+                BGR copy of the original frame.
 
         Returns:
             Frame with bounding boxes drawn.
         """
-        frame = cv2.cvtColor(assets["orig_frame"].copy(), cv2.COLOR_RGB2BGR)
-        frame = np.array(frame)
-        orig_shape = assets["orig_shape"]
-        category_index = assets["category_index"]
-
-        if self._bbox_format:
-            for each_bbox, each_class, each_score in zip(
-                    assets["predictions"]["boxes"],
-                    assets["predictions"]["classes"],
-                    assets["predictions"]["scores"]):
-                color = assets["color_map"].get(each_class - 1)
-
-                # Draw bbox on screen
-                cv2.rectangle(
-                    frame,
-                    (
-                        int(each_bbox[self._bbox_format.index("xmin")] *
-                            orig_shape[1]),
-                        int(each_bbox[self._bbox_format.index("ymin")] *
-                            orig_shape[0]),
-                    ),
-                    (
-                        int(each_bbox[self._bbox_format.index("xmax")] *
-                            orig_shape[1]),
-                        int(each_bbox[self._bbox_format.index("ymax")] *
-                            orig_shape[0]),
-                    ),
-                    color,
-                    self.thickness,
-                )
-                # Draw label background
-                cv2.rectangle(
-                    frame,
-                    (
-                        int(each_bbox[self._bbox_format.index("xmin")] *
-                            orig_shape[1]),
-                        int(each_bbox[self._bbox_format.index("ymax")] *
-                            orig_shape[0]),
-                    ),
-                    (
-                        int(each_bbox[self._bbox_format.index("xmax")] *
-                            orig_shape[1]),
-                        int(each_bbox[self._bbox_format.index("ymax")] *
-                            orig_shape[0] + 15),
-                    ),
-                    color,
-                    thickness=-1,
-                )
-                cv2.putText(
-                    frame,
-                    f"Class: {category_index[int(each_class)]['name']},"
-                    f"Score: {str(round(each_score, 2))}",
-                    (
-                        int(each_bbox[self._bbox_format.index("xmin")] *
-                            orig_shape[1]),
-                        int(each_bbox[self._bbox_format.index("ymax")] *
-                            orig_shape[0] + 10),
-                    ),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.3,
-                    (0, 0, 0),
-                    1,
-                    cv2.LINE_AA,
-                )
+        if frame is None:
+            frame = cv2.cvtColor(assets["orig_frame"], cv2.COLOR_RGB2BGR)
+        height, width = frame.shape[:2]
+        predictions = assets["predictions"]
+        boxes = predictions.to_pixels(width, height)
+        buckets = np.rint(predictions.scores * self.SCORE_BUCKETS).astype(
+            np.int32)
+        # Label rows below each box, clipped to the frame
+        label_rows = np.clip(
+            boxes[:, [3, 3]] + [0, self.LABEL_HEIGHT], 0, height).tolist()
+
+        for (xmin, ymin, xmax, ymax), each_class, bucket, (top, bottom) in zip(
+                boxes.tolist(), predictions.classes.tolist(),
+                buckets.tolist(), label_rows):
+            color = assets["color_map"].get(each_class - 1)
+
+            # Draw bbox on screen
+            cv2.rectangle(
+                frame,
+                (xmin, ymin),
+                (xmax, ymax),
+                color,
+                self.thickness,
+            )
+            # Draw label background
+            cv2.rectangle(
+                frame,
+                (xmin, ymax),
+                (xmax, ymax + self.LABEL_HEIGHT),
+                color,
+                thickness=-1,
+            )
+            # Paste the cached label, cropped to the frame
+            patch = self._label_patch(assets["category_index"], each_class,
+                                      bucket, color)
+            left = max(xmin, 0)
+            right = min(xmin + patch.shape[1], width)
+            if top < bottom and left < right:
+                frame[top:bottom, left:right] = patch[top - ymax:bottom - ymax,
+                                                      left - xmin:right - xmin]
         return frame
 
+    def _label_patch(self, category_index, label_class, bucket, color):
+        """Get the rendered label of a class and score bucket.
+
+        Args:
+            category_index: Class labels map.
+            label_class: Class ID.
+            bucket: Score multiplied by `SCORE_BUCKETS` and rounded.
+            color: Label background color.
+
+        Returns:
+            BGR label patch of height `LABEL_HEIGHT`.
+        """
+        key = (label_class, bucket, tuple(color))
+        patch = self._label_cache.get(key)
+        if patch is None:
+            text = (f"Class: {category_index[label_class]['name']},"
+                    f"Score: {str(round(bucket / self.SCORE_BUCKETS, 2))}")
+            (text_width, _), _ = cv2.getTextSize(text,
+                                                 cv2.FONT_HERSHEY_SIMPLEX,
+                                                 0.3, 1)
+            patch = np.empty((self.LABEL_HEIGHT, text_width + 1, 3),
+                             dtype=np.uint8)
+            patch[:] = color
+            cv2.putText(
+                patch,
+                text,
+                (0, 10),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.3,
+                (0, 0, 0),
+                1,
+                cv2.LINE_AA,
+            )
+            self._label_cache[key] = patch
+        return patch
+
     def _draw_polygon(self, assets):
         """Draw polygon masks on frame.
 
@@ -138,46 +163,99 @@ class Postprocessor(AbstractPostprocessor):
                     frame[:, :, color] * (1 - alpha) + alpha * colors[color],
                     frame[:, :, color],
                 )
-        return self._draw_bbox(assets)
+        return self._draw_bbox(assets, frame)
 
     def _draw_semantic_mask(self, assets):
         """Draw pixel masks on frame.
 
+        The class index mask is colourised through the palette at model
+        resolution, resized once with nearest-neighbour interpolation and
+        added onto the frame in uint8, so background pixels are unchanged.
+
         Args:
             assets: Dictionary of assets.
 
         Returns:
             Frame with pixel masks drawn.
         """
-        frame = cv2.cvtColor(assets["orig_frame"].copy(),
-                             cv2.COLOR_RGB2BGR).astype(np.int64)
-        output_mask = cv2.resize(
-            assets["predictions"]["mask"],
-            (assets["orig_shape"][1], assets["orig_shape"][0]))
-        frame += output_mask.astype(np.int64)
-        frame = np.clip(frame, 0, 255)
-        frame = frame.astype(np.uint8)
-        return frame
+        frame = cv2.cvtColor(assets["orig_frame"], cv2.COLOR_RGB2BGR)
+        mask = assets["predictions"]["mask"]
+        if mask is None:
+            return frame
+        # Class maps of more than 256 classes are uint16
+        size = 256 if mask.dtype == np.uint8 else int(mask.max()) + 1
+        overlay = cv2.resize(self._palette(assets["color_map"], size)[mask],
+                             (frame.shape[1], frame.shape[0]),
+                             interpolation=cv2.INTER_NEAREST)
+        return cv2.addWeighted(frame, 1.0, overlay, self.alpha, 0.0, dst=frame)
+
+    def _palette(self, color_map, size=256):
+        """Get the palette lookup table of class indices.
+
+        The table is cached, and only rebuilt when more class indices are
+        needed.
+
+        Args:
+            color_map: Color map of the classes.
+            size: Minimum number of class indices in the table.
+
+        Returns:
+            Array of shape (N, 3) of the uint8 color of each class index,
+                with N at least 256 and `size`, black for the background
+                and unknown classes.
+        """
+        if self._palette_lut is None or len(self._palette_lut) < size:
+            size = max(size, 256, max(color_map, default=0) + 2)
+            palette = np.zeros((size, 3), dtype=np.uint8)
+            # Classes are drawn with the same colors as their boxes
+            for each_class, color in color_map.items():
+                if each_class >= 0:
+                    palette[each_class + 1] = color
+            self._palette_lut = palette
+        return self._palette_lut
 
     def _draw_instance_mask(self, assets):
-        frame = cv2.cvtColor(assets["orig_frame"].copy(),
-                             cv2.COLOR_RGB2BGR).astype(np.int64)
-        for each_mask, each_bbox in zip(assets["predictions"]["masks"],
-                                        assets["predictions"]["boxes"]):
-            mask = np.expand_dims(each_mask, -1)
-            mask = np.tile(mask, 3)
-            mask *= 255
-            mask = np.clip(mask, 0, 255).astype(np.uint8)
-            xmin, ymin, xmax, ymax = each_bbox
-            ymin = int(ymin * assets["orig_shape"][1])
-            ymax = int(ymax * assets["orig_shape"][1])
-            xmin = int(xmin * assets["orig_shape"][0])
-            xmax = int(xmax * assets["orig_shape"][0])
-            mask_height = ymax - ymin
-            mask_width = xmax - xmin
-            mask = cv2.resize(mask, (mask_height, mask_width))
-            resized_mask = np.zeros(assets["orig_shape"])
-            resized_mask[xmin:xmax, ymin:ymax, :] = mask
-            frame += resized_mask.astype(np.int64)
-            frame = np.clip(frame, 0, 255)
+        """Draw instance masks on frame.
+
+        Each mask is resized to its bounding box and blended with the color
+        of its class inside the box only, so a frame costs the total area
+        of the boxes rather than a full-frame pass per instance.
+
+        Args:
+            assets: Dictionary of assets.
+
+        Returns:
+            Frame with instance masks drawn.
+        """
+        frame = cv2.cvtColor(assets["orig_frame"], cv2.COLOR_RGB2BGR)
+        height, width = frame.shape[:2]
+        predictions = assets["predictions"]
+        if isinstance(predictions, Detections):
+            boxes = predictions.to_pixels(width, height)
+        else:
+            # Normalised (xmin, ymin, xmax, ymax) boxes
+            boxes = (np.asarray(predictions["boxes"]) *
+                     [width, height, width, height]).astype(np.int32)
+        np.clip(boxes, 0, [width, height, width, height], out=boxes)
+        classes = predictions.get("classes")
+        if classes is None:
+            colors = np.full((len(boxes), 3), 255, dtype=np.uint16)
+        else:
+            palette = self._palette(assets["color_map"])
+            colors = palette[np.clip(classes, 0,
+                                     len(palette) - 1)].astype(np.uint16)
+        # Fixed-point alpha, 256 being fully opaque
+        alpha = int(round(self.alpha * 256))
+
+        for each_mask, (xmin, ymin, xmax, ymax), color in zip(
+                predictions["masks"], boxes.tolist(), colors):
+            if xmax <= xmin or ymax <= ymin:
+                continue
+            roi = frame[ymin:ymax, xmin:xmax]
+            weight = cv2.resize(np.asarray(each_mask, dtype=np.float32),
+                                (xmax - xmin, ymax - ymin))
+            weight = (np.clip(weight, 0, 1) * alpha).astype(np.uint16)
+            weight = weight[..., np.newaxis]
+            roi[:] = ((roi * (256 - weight) + color * weight) >> 8).astype(
+                np.uint8)
         return frame
@@ -14,21 +14,193 @@
 @Desc    :   Image transforms preprocessor.
 """
 
+from functools import partial
+
 import cv2
+import numpy as np
 from abstract_preprocessor import AbstractPreprocessor
-from common.exceptions import (  # noqa
-    InvalidPreprocessorException, PreprocessingException,
+from common.exceptions import (
+    InvalidPreprocessorException,
+    PreprocessingException,
 )
 
+# Colour conversions that only reverse the channel order,
+# they are fused into the arithmetic kernel as a strided view.
+CHANNEL_SWAPS = ("BGR2RGB", "RGB2BGR")
+GEOMETRIC_TOOLS = ("resize", "letterbox", "color_convert")
+KERNEL_TOOLS = ("normalize", "to_dtype", "to_layout")
+LAYOUTS = ("NHWC", "NCHW")
+
+
+class _Kernel:
+
+    """Fused cast, normalisation, channel swap and layout change.
+
+    All arithmetic tools between two geometric tools are folded into a
+    per-channel affine transform `x * alpha + beta`, which is evaluated
+    in a single pass from a (possibly channel-reversed and transposed)
+    view of the frame straight into the output array. A second in-place
+    pass is only needed to add a non-zero offset. Integer outputs are
+    computed in float32, then rounded and clipped to the range of the
+    output type before the cast, so that out of range values saturate
+    instead of wrapping around.
+    """
+
+    def __init__(self):
+        """Initialize an identity kernel."""
+        self.swap = False
+        self.alpha = np.float64(1)
+        self.beta = np.float64(0)
+        self.affine = False
+        self.dtype = None
+        self.layout = None
+        self._tools = 0
+        self._compute_dtype = np.dtype(np.float32)
+        self._alpha = None
+        self._beta = None
+        self._offset = False
+        self._bounds = None
+
+    def __bool__(self):
+        """Check whether the kernel does anything."""
+        return self._tools > 0
+
+    def color_convert(self, code):  # pylint: disable=unused-argument
+        """Reverse the channel order.
+
+        Args:
+            code: One of `CHANNEL_SWAPS`.
+        """
+        self._tools += 1
+        self.swap = not self.swap
+        # Constants of earlier tools refer to the previous channel order
+        if np.ndim(self.alpha):
+            self.alpha = self.alpha[::-1]
+        if np.ndim(self.beta):
+            self.beta = self.beta[::-1]
+
+    def normalize(self, mean=0.0, std=1.0, scale=1.0):
+        """Compose `(x * scale - mean) / std` into the kernel.
+
+        Args:
+            mean: Scalar or per-channel mean, subtracted after scaling.
+            std: Scalar or per-channel standard deviation.
+            scale: Scalar factor applied first, e.g. 1 / 255.
+        """
+        self._tools += 1
+        self.affine = True
+        mean = np.asarray(mean, dtype=np.float64)
+        std = np.asarray(std, dtype=np.float64)
+        self.alpha = self.alpha * scale / std
+        self.beta = (self.beta * scale - mean) / std
+
+    def to_dtype(self, dtype):
+        """Set the output data type.
+
+        Args:
+            dtype: Numpy data type name, e.g. `float32` or `uint8`.
+        """
+        self._tools += 1
+        self.dtype = np.dtype(dtype)
+
+    def to_layout(self, layout):
+        """Set the output layout, adding a batch dimension.
+
+        Args:
+            layout: One of `LAYOUTS`.
+
+        Raises:
+            InvalidPreprocessorException: If the layout is unsupported.
+        """
+        if layout not in LAYOUTS:
+            raise InvalidPreprocessorException(
+                f"Unsupported layout {layout}, must be one of {LAYOUTS}!")
+        self._tools += 1
+        self.layout = layout
+
+    def compile(self):
+        """Precompute the kernel constants.
+
+        Returns:
+            self
+        """
+        if self.dtype is None and self.affine:
+            self.dtype = np.dtype(np.float32)
+        self._compute_dtype = (self.dtype if self.dtype is not None
+                               and self.dtype.kind == "f" else np.float32)
+        shape = (-1, 1, 1) if self.layout == "NCHW" else (-1, )
+        self._alpha = np.asarray(self.alpha,
+                                 dtype=self._compute_dtype).reshape(shape)
+        self._beta = np.asarray(self.beta,
+                                dtype=self._compute_dtype).reshape(shape)
+        self._offset = bool(np.any(self.beta))
+        if self._alpha.size == 1:
+            self._alpha = self._alpha.reshape(())
+        if self._beta.size == 1:
+            self._beta = self._beta.reshape(())
+        if self.dtype is not None and self.dtype.kind in "iu":
+            info = np.iinfo(self.dtype)
+            self._bounds = (info.min, info.max)
+        return self
+
+    def __call__(self, frame, assets):  # pylint: disable=unused-argument
+        """Apply the kernel to a frame.
+
+        Args:
+            frame: HWC frame.
+            assets: Dictionary of assets.
+
+        Returns:
+            New array holding the transformed frame.
+        """
+        src = frame[..., ::-1] if self.swap else frame
+        if self.layout == "NCHW":
+            src = np.transpose(src, (2, 0, 1))
+        dtype = self.dtype if self.dtype is not None else src.dtype
+        out = np.empty(src.shape, dtype=dtype)
+
+        if not self.affine:
+            np.copyto(out, src, casting="unsafe")
+        elif dtype == self._compute_dtype:
+            np.multiply(src,
+                        self._alpha,
+                        out=out,
+                        dtype=dtype,
+                        casting="unsafe")
+            if self._offset:
+                np.add(out, self._beta, out=out)
+        else:
+            values = src * self._alpha + self._beta
+            if self._bounds is not None:
+                np.rint(values, out=values)
+                np.clip(values, *self._bounds, out=values)
+            np.copyto(out, values, casting="unsafe")
+
+        return out[np.newaxis] if self.layout else out
+
 
 class Preprocessor(AbstractPreprocessor):
 
-    """Image transforms preprocessor."""
+    """Image transforms preprocessor.
+
+    The tool chain is compiled once at initialization. Geometric tools
+    (`resize`, `letterbox` and `color_convert`) each run as one OpenCV call,
+    while consecutive arithmetic tools (`normalize`, `to_dtype`,
+    `to_layout` and channel swapping `color_convert`) are fused into a
+    single pass. When `to_layout` is used, the output is a batched model
+    input tensor that predictors consume as is.
+    """
 
     def __init__(self, **kwargs):
-        """Initialize image transforms preprocessor."""
+        """Initialize image transforms preprocessor.
+
+        Raises:
+            InvalidPreprocessorException: If a tool is unsupported
+                or misconfigured.
+        """
         self.tools = []
         super().__init__(**kwargs)
+        self._steps = self._compile(self.tools)
 
     def run(self, assets):
         """Run image transforms preprocessor.
@@ -38,10 +210,13 @@ class Preprocessor(AbstractPreprocessor):
         """
         if not self.tools:
             raise InvalidPreprocessorException("Preprocessor tools not set!")
-        for transform in self.tools:
-            func = getattr(self, list(transform.keys())[-1])
-            params = list(transform.values())[-1]
-            assets["input_frame"] = func(assets["input_frame"], **params)
+        frame = assets["input_frame"]
+        try:
+            for step in self._steps:
+                frame = step(frame, assets)
+        except Exception as exc:
+            raise PreprocessingException(exc) from exc
+        assets["input_frame"] = frame
 
     def resize(self, frame, **kwargs):
         """Resize frame to specific height and width.
@@ -56,3 +231,107 @@ class Preprocessor(AbstractPreprocessor):
             return cv2.resize(frame, tuple(kwargs["shape"]))
         except Exception as exc:
             raise PreprocessingException(exc) from exc
+
+    def _compile(self, tools):
+        """Compile the tool chain into a list of steps.
+
+        Args:
+            tools: List of single-key dictionaries mapping
+                a tool name to its parameters.
+
+        Returns:
+            List of callables taking a frame and the assets,
+                and returning the transformed frame.
+
+        Raises:
+            InvalidPreprocessorException: If a tool is unsupported
+                or misconfigured.
+        """
+        steps = []
+        kernel = _Kernel()
+        for transform in tools:
+            name = list(transform.keys())[-1]
+            params = list(transform.values())[-1] or {}
+            if name in KERNEL_TOOLS or (name == "color_convert" and
+                                        params.get("code") in CHANNEL_SWAPS):
+                getattr(kernel, name)(**params)
+            elif name in GEOMETRIC_TOOLS:
+                if name == "color_convert" and not hasattr(
+                        cv2, f"COLOR_{params.get('code')}"):
+                    raise InvalidPreprocessorException(
+                        f"Unsupported colour conversion {params.get('code')}!")
+                if kernel.layout:
+                    raise InvalidPreprocessorException(
+                        f"Tool {name} cannot follow to_layout!")
+                if kernel:
+                    steps.append(kernel.compile())
+                    kernel = _Kernel()
+                steps.append(partial(getattr(self, f"_{name}"), **params))
+            else:
+                raise InvalidPreprocessorException(
+                    f"Unsupported preprocessor tool {name}!")
+        if kernel:
+            steps.append(kernel.compile())
+        return steps
+
+    def _resize(self, frame, assets, shape):  # pylint: disable=unused-argument
+        """Resize frame to a (width, height) shape.
+
+        Args:
+            frame: Frame to resize.
+            assets: Dictionary of assets.
+            shape: Target (width, height).
+
+        Returns:
+            Resized frame.
+        """
+        return self.resize(frame, shape=shape)
+
+    @staticmethod
+    def _letterbox(frame, assets, shape, color=114):
+        """Resize frame keeping its aspect ratio and pad it to a shape.
+
+        The window of the frame inside the padded canvas is stored in
+        `assets["letterbox"]` as (top, left, height, width, canvas height,
+        canvas width), so that predictions can be mapped back to the
+        original frame.
+
+        Args:
+            frame: Frame to letterbox.
+            assets: Dictionary of assets.
+            shape: Target (width, height).
+            color: Padding value.
+
+        Returns:
+            Letterboxed frame.
+        """
+        width, height = shape
+        frame_height, frame_width = frame.shape[:2]
+        ratio = min(width / frame_width, height / frame_height)
+        new_width = max(1, round(frame_width * ratio))
+        new_height = max(1, round(frame_height * ratio))
+        top, left = (height - new_height) // 2, (width - new_width) // 2
+
+        canvas = np.full((height, width) + frame.shape[2:],
+                         color,
+                         dtype=frame.dtype)
+        canvas[top:top + new_height, left:left + new_width] = cv2.resize(
+            frame, (new_width, new_height))
+        assets["letterbox"] = (top, left, new_height, new_width, height,
+                               width)
+        return canvas
+
+    @staticmethod
+    def _color_convert(frame, assets, code):  # pylint: disable=unused-argument
+        """Convert the colour space of a frame.
+
+        Args:
+            frame: Frame to convert.
+            assets: Dictionary of assets.
+            code: OpenCV conversion code without the `COLOR_` prefix,
+                e.g. `RGB2GRAY`.
+
+        Returns:
+            Converted frame.
+        """
+        return cv2.cvtColor(frame, getattr(cv2, f"COLOR_{code}"))
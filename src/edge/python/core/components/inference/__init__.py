@@ -14,6 +14,8 @@
 @Desc    :   Package for inference engine.
 """
 
+from .batcher import MicroBatcher
 from .engine import InferenceEngine
+from .pool import InferencePool
 
-__all__ = ["InferenceEngine"]
+__all__ = ["InferenceEngine", "InferencePool", "MicroBatcher"]
@@ -0,0 +1,65 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   batcher.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Deadline-bounded micro-batcher for inference.
+"""
+
+import queue
+import time
+
+
+class MicroBatcher:
+
+    """Gather frames into batches bounded by size and waiting time.
+
+    A batch is dispatched as soon as `max_batch` frames are gathered, or
+    once `max_wait_ms` milliseconds have passed since its first frame
+    arrived, whichever comes first. Frames are never reordered.
+    """
+
+    def __init__(self, max_batch=1, max_wait_ms=0):
+        """Initialize micro-batcher.
+
+        Args:
+            max_batch: Maximum number of frames in a batch.
+            max_wait_ms: Maximum time to wait for a batch to fill up
+                after its first frame arrived, in milliseconds.
+        """
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait_ms = max(0.0, float(max_wait_ms))
+
+    def gather(self, first, get_next):
+        """Gather a batch starting with a frame that has already arrived.
+
+        Args:
+            first: First item of the batch.
+            get_next: Callable taking a timeout in seconds and returning
+                the next item, raising `queue.Empty` on timeout. An item of
+                None marks the end of the stream.
+
+        Returns:
+            Tuple of (batch, ended), where batch is the list of gathered
+                items and ended is True if the end of the stream was reached.
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = get_next(max(0.0, remaining))
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
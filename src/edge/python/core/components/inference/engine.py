@@ -14,6 +14,7 @@
 @Desc    :   Inference engine class.
 """
 
+import numpy as np
 from common.config import CONFIG
 from common.exceptions import (
     LoaderException,
@@ -22,7 +23,9 @@ from common.exceptions import (
     UnknownException,
 )
 from common.logger import Logger
+from common.utils import Detections
 
+from .batcher import MicroBatcher
 from .loaders import Loader
 from .predictors import Predictor
 
@@ -54,6 +57,12 @@ class InferenceEngine:
         except PredictorException as exc:
             raise PredictorException(exc) from exc
 
+        self._batcher = None
+        if CONFIG["inference"].get("max_batch", 1) > 1:
+            self._batcher = MicroBatcher(
+                CONFIG["inference"]["max_batch"],
+                CONFIG["inference"].get("max_wait_ms", 0))
+
     def run(self, assets):
         """Run inference engine and calls the predictor to predict the frame.
 
@@ -68,11 +77,90 @@ class InferenceEngine:
             Logger.debug(f"Predicting frame {assets['frame_id']}!")
             assets["predictions"] = self.predictor.predict(
                 assets["input_frame"])
+            self._undo_letterbox(assets)
         except PredictionException as exc:
             raise PredictionException(exc) from exc
         except UnknownException as exc:
             raise UnknownException(exc) from exc
 
+    def run_batch(self, assets_batch):
+        """Run inference engine on a batch of frames with batched predictions.
+
+        Args:
+            assets_batch (list): List of dictionaries of assets,
+                one for each frame.
+
+        Raises:
+            PredictionException: If the prediction fails.
+            UnknownException: If an unknown exception occurs.
+        """
+        # Frames from different input streams may differ in shape,
+        # so only frames of the same shape are stacked together.
+        groups = {}
+        for assets in assets_batch:
+            groups.setdefault(np.shape(assets["input_frame"]),
+                              []).append(assets)
+        try:
+            for group in groups.values():
+                Logger.debug(f"Predicting frames "
+                             f"{[assets['frame_id'] for assets in group]}!")
+                predictions = self.predictor.batch_predict(
+                    [assets["input_frame"] for assets in group])
+                for assets, prediction in zip(group, predictions):
+                    assets["predictions"] = prediction
+                    self._undo_letterbox(assets)
+        except PredictionException as exc:
+            raise PredictionException(exc) from exc
+        except UnknownException as exc:
+            raise UnknownException(exc) from exc
+
+    def _undo_letterbox(self, assets):
+        """Map predictions on a letterboxed frame back to the original frame.
+
+        Normalised box coordinates are shifted and rescaled from the padded
+        canvas to the letterbox window, and masks are cropped to the window,
+        scaled to their resolution.
+
+        Args:
+            assets (dict): Dictionary of assets.
+        """
+        if "letterbox" not in assets:
+            return
+        top, left, height, width, canvas_height, canvas_width = assets[
+            "letterbox"]
+        predictions = assets["predictions"]
+
+        if isinstance(predictions, Detections):
+            boxes = predictions.boxes
+            x_axes = predictions.columns("xmin", "xmax")
+            y_axes = predictions.columns("ymin", "ymax")
+            boxes[:, x_axes] = (boxes[:, x_axes] * canvas_width - left) / width
+            boxes[:, y_axes] = (boxes[:, y_axes] * canvas_height -
+                                top) / height
+            np.clip(boxes, 0, 1, out=boxes)
+            return
+
+        mask = predictions.get("mask")
+        if mask is not None:
+            # Masks may be downsampled from the canvas
+            scale_y = mask.shape[0] / canvas_height
+            scale_x = mask.shape[1] / canvas_width
+            predictions["mask"] = mask[
+                int(round(top * scale_y)):int(round((top + height) *
+                                                    scale_y)),
+                int(round(left * scale_x)):int(round((left + width) *
+                                                     scale_x))]
+
+    @property
+    def batcher(self):
+        """Get micro-batcher.
+
+        Returns:
+            MicroBatcher: Micro-batcher gathering frames for `run_batch`,
+                or None if batching is disabled.
+        """
+        return self._batcher
+
     @property
     def loader(self):
         """Get loader.
@@ -0,0 +1,253 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   pool.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Process pool of inference engine workers.
+"""
+
+import multiprocessing
+import queue
+from threading import Lock
+
+import numpy as np
+from common.exceptions import InferenceModuleException, PredictionException
+from common.logger import Logger
+from common.utils import SharedFrameSlots
+
+# Timeout (in seconds) used while waiting on workers,
+# so that dead workers are detected instead of blocking forever.
+_POLL_TIMEOUT = 1.0
+_READY = "ready"
+
+
+def _worker(worker_id, slots, tasks, results):
+    """Inference worker process loop.
+
+    Loads the model once through the inference engine, then predicts on
+    frames read in place from the shared memory slots until a None task
+    is received.
+
+    Args:
+        worker_id: Index of the worker.
+        slots: Shared frame slots.
+        tasks: Queue of (sequence, frame_id, slot, shape, dtype, letterbox)
+            tuples.
+        results: Queue of (sequence, predictions, error) tuples.
+    """
+    # pylint: disable=import-outside-toplevel
+    from core.components.inference.engine import InferenceEngine
+
+    try:
+        inference_engine = InferenceEngine()
+    except Exception as exc:  # pylint: disable=broad-except
+        results.put((_READY, worker_id, f"{exc.__class__.__name__}: {exc}"))
+        return
+    results.put((_READY, worker_id, None))
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        sequence, frame_id, slot, shape, dtype, letterbox = task
+        assets = {
+            "frame_id": frame_id,
+            "input_frame": slots.view(slot, shape, dtype),
+        }
+        # Predictions are mapped back to the original frame in the worker,
+        # as in `InferenceEngine.run`
+        if letterbox is not None:
+            assets["letterbox"] = letterbox
+        try:
+            inference_engine.run(assets)
+            results.put((sequence, assets["predictions"], None))
+        except Exception as exc:  # pylint: disable=broad-except
+            results.put((sequence, None, f"{exc.__class__.__name__}: {exc}"))
+
+
+class InferencePool:
+
+    """Replicate the inference engine across worker processes.
+
+    Frames are handed to the workers through shared memory slots instead
+    of being pickled, and predictions are returned in submission order.
+    `submit` and `collect` may be called from two different threads, which
+    lets a pipeline keep every worker busy.
+
+    Shared memory slots are allocated when the pool starts, and are made
+    large enough for the first frame, so that the pool can be started on
+    the first frame when the frame size is only known at runtime.
+    """
+
+    def __init__(self, workers=2, slots=None, slot_bytes=None,
+                 start_method="spawn"):
+        """Initialize inference pool.
+
+        Args:
+            workers: Number of worker processes.
+            slots: Number of shared memory slots, i.e. the maximum number
+                of frames in flight. Defaults to twice the number of workers.
+            slot_bytes: Minimum size of each shared memory slot in bytes.
+            start_method: Multiprocessing start method of the workers.
+        """
+        self.workers = max(1, int(workers))
+        self.slot_bytes = int(slot_bytes or 0)
+        self._num_slots = int(slots or 2 * self.workers)
+        self._context = multiprocessing.get_context(start_method)
+        self._slots = None
+        self._tasks = self._context.Queue()
+        self._results = self._context.Queue()
+        self._processes = []
+        self._sequence = 0
+        self._in_flight = {}
+        self._done = {}
+        self._lock = Lock()
+
+    @property
+    def capacity(self):
+        """Get the maximum number of frames in flight."""
+        return self._num_slots
+
+    @property
+    def started(self):
+        """Get whether the worker processes have been started."""
+        return bool(self._processes)
+
+    def start(self, frame=None):
+        """Start the worker processes and wait until their models are loaded.
+
+        Args:
+            frame: Optional first frame, the shared memory slots are made
+                large enough to hold it.
+
+        Returns:
+            self
+
+        Raises:
+            InferenceModuleException: If a worker fails to load the model.
+            ValueError: If the slot size is neither given nor known from
+                the first frame.
+        """
+        slot_bytes = max(self.slot_bytes,
+                         np.asarray(frame).nbytes if frame is not None else 0)
+        if slot_bytes == 0:
+            raise ValueError("Size of the shared memory slots is unknown, "
+                             "set slot_bytes or start on the first frame!")
+        self._slots = SharedFrameSlots(self._num_slots, slot_bytes,
+                                       self._context)
+        Logger.debug(f"Starting {self.workers} inference worker(s)...")
+        for worker_id in range(self.workers):
+            process = self._context.Process(
+                target=_worker,
+                args=(worker_id, self._slots, self._tasks, self._results),
+                name=f"inference-worker-{worker_id}",
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+
+        for _ in range(self.workers):
+            _, worker_id, error = self._get_result()
+            if error is not None:
+                self.stop()
+                raise InferenceModuleException(
+                    f"Inference worker {worker_id} failed to start: {error}")
+        Logger.debug("Inference worker(s) ready!")
+        return self
+
+    def submit(self, assets):
+        """Copy a frame into a free slot and queue it for prediction.
+
+        Blocks while all slots are in flight.
+
+        Args:
+            assets: Dictionary of assets.
+
+        Returns:
+            Sequence number of the submitted frame.
+        """
+        slot = self._slots.acquire()
+        try:
+            shape, dtype = self._slots.write(
+                slot, np.ascontiguousarray(assets["input_frame"]))
+        except Exception:
+            self._slots.release(slot)
+            raise
+        with self._lock:
+            sequence = self._sequence
+            self._sequence += 1
+            self._in_flight[sequence] = slot
+        self._tasks.put((sequence, assets["frame_id"], slot, shape, dtype,
+                         assets.get("letterbox")))
+        return sequence
+
+    def collect(self, sequence):
+        """Wait for the predictions of a submitted frame.
+
+        Results arriving out of order are buffered until requested.
+
+        Args:
+            sequence: Sequence number returned by `submit`.
+
+        Returns:
+            Predictions of the frame.
+
+        Raises:
+            PredictionException: If the prediction failed in the worker.
+        """
+        while sequence not in self._done:
+            result_sequence, predictions, error = self._get_result()
+            with self._lock:
+                slot = self._in_flight.pop(result_sequence)
+            self._slots.release(slot)
+            self._done[result_sequence] = (predictions, error)
+
+        predictions, error = self._done.pop(sequence)
+        if error is not None:
+            raise PredictionException(error)
+        return predictions
+
+    def run(self, assets):
+        """Predict on a single frame, mirroring `InferenceEngine.run`.
+
+        Args:
+            assets: Dictionary of assets.
+        """
+        assets["predictions"] = self.collect(self.submit(assets))
+
+    def stop(self):
+        """Stop the worker processes."""
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(_POLL_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+
+    def _get_result(self):
+        """Get the next result from any worker.
+
+        Returns:
+            Tuple of (sequence, predictions, error).
+
+        Raises:
+            InferenceModuleException: If a worker process died.
+        """
+        while True:
+            try:
+                return self._results.get(timeout=_POLL_TIMEOUT)
+            except queue.Empty:
+                for process in self._processes:
+                    if not process.is_alive():
+                        raise InferenceModuleException(
+                            f"{process.name} exited with code"
+                            f" {process.exitcode}!") from None
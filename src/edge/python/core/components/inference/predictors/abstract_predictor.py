@@ -16,6 +16,8 @@
 
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 
 class AbstractPredictor(ABC):
 
@@ -27,6 +29,17 @@ class AbstractPredictor(ABC):
         self.model_format = ""
         self.model_architecture = ""
         self.threshold = 0.0
+        self.bbox_format = ["ymin", "xmin", "ymax", "xmax"]
+        self.max_batch_size = 1
+        self.iou_threshold = 0.1
+        self.nms_method = "hard"
+        self.nms_top_k = 1000
+        self.sparse_decode = True
+        self.class_allowlist = None
+        self.class_thresholds = None
+        self.mask_threshold = None
+        self.mask_stride = 1
+        self._input_buffer = None
         self._model = model
         self._category_index = category_index
         self._color_map = color_map
@@ -37,10 +50,82 @@ class AbstractPredictor(ABC):
         """Predict on a single image."""
         raise NotImplementedError
 
-    # @abstractmethod
-    # def batch_predict(self, img_batch):
-    #     """Predict on a batch of images."""
-    #     raise NotImplementedError
+    def batch_predict(self, img_batch):
+        """Predict on a batch of images.
+
+        Predicts on one image at a time by default, predictors whose
+        models accept a batch dimension override this method.
+
+        Args:
+            img_batch: List of images of the same shape.
+
+        Returns:
+            List of predictions, one for each image.
+        """
+        return [self.predict(img) for img in img_batch]
+
+    def _chunks(self, img_batch):
+        """Split a batch of images into chunks the model can accept.
+
+        Args:
+            img_batch: List of images.
+
+        Yields:
+            Lists of at most `max_batch_size` images,
+                or the whole batch if the batch size is dynamic.
+        """
+        step = self.max_batch_size or len(img_batch)
+        for start in range(0, len(img_batch), step):
+            yield img_batch[start:start + step]
+
+    def _fill_input(self, images, dtype=np.float32, scale=None, layout="NHWC"):
+        """Write a batch of images into the preallocated model input tensor.
+
+        The tensor is allocated once, for the largest batch the model
+        accepts, and reused across calls. Each image is cast, scaled and
+        transposed in a single pass straight into the tensor, without any
+        intermediate array. The returned tensor is overwritten by the next
+        call, so it must be consumed before predicting again.
+
+        Args:
+            images: List of HWC images of the same shape,
+                or of model input tensors with a batch dimension.
+            dtype: Data type of the model input.
+            scale: Optional factor to multiply pixel values with.
+            layout: Memory layout of the model input, `NHWC` or `NCHW`.
+
+        Returns:
+            Model input tensor holding the batch of images.
+        """
+        if np.ndim(images[0]) == 4:
+            # Already a model input tensor, e.g. from the transforms
+            # preprocessor with `to_layout`, which sets the layout
+            if len(images) == 1:
+                return np.asarray(images[0], dtype=dtype)
+            return np.concatenate(images).astype(dtype, copy=False)
+
+        height, width, channels = np.shape(images[0])
+        image_shape = ((height, width, channels) if layout == "NHWC" else
+                       (channels, height, width))
+        buffer = self._input_buffer
+        if (buffer is None or buffer.shape[1:] != image_shape
+                or buffer.dtype != dtype or len(buffer) < len(images)):
+            batch_size = max(len(images), self.max_batch_size or 1)
+            buffer = np.empty((batch_size, ) + image_shape, dtype=dtype)
+            self._input_buffer = buffer
+
+        for image, target in zip(images, buffer):
+            if layout == "NCHW":
+                image = np.transpose(image, (2, 0, 1))
+            if scale is None:
+                np.copyto(target, image, casting="unsafe")
+            else:
+                np.multiply(image,
+                            scale,
+                            out=target,
+                            dtype=dtype,
+                            casting="unsafe")
+        return buffer[:len(images)]
 
     @abstractmethod
     def _preprocess(self, img):
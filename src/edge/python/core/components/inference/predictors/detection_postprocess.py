@@ -0,0 +1,198 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   detection_postprocess.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Shared object detection postprocess stage.
+"""
+
+import numpy as np
+from common.utils import (
+    BOX_COLUMNS,
+    DEFAULT_BOX_FORMAT,
+    Detections,
+    nms_indices,
+)
+
+
+class DetectionPostprocess:
+
+    """Filter and suppress raw detections of a batch of images.
+
+    Detections are filtered on score, background and allowed classes in
+    a single vectorised pass over the whole batch, using lookup tables
+    indexed by class ID. The kept detections of each image then go through
+    class-aware non-max suppression.
+
+    Raw boxes are read and returned in the configured box format, and
+    only reordered to (ymin, xmin, ymax, xmax) for suppression.
+
+    Boxes stay in normalised coordinates for IoU based suppression, as
+    scaling them leaves their IoU unchanged. The centre distance penalty
+    of DIoU suppression does change when the height and width of a box
+    are scaled differently, so DIoU suppression runs on boxes scaled to
+    the model input shape, as the predictors did on pixel boxes.
+    """
+
+    def __init__(self,
+                 threshold=0.0,
+                 iou_threshold=0.1,
+                 nms_method="hard",
+                 nms_top_k=1000,
+                 class_allowlist=None,
+                 class_thresholds=None,
+                 category_index=None,
+                 background_class=0,
+                 image_shape=None,
+                 box_format=DEFAULT_BOX_FORMAT):
+        """Initialize detection postprocess stage.
+
+        Args:
+            threshold: Score a detection must exceed to be kept.
+            iou_threshold: IoU threshold of non-max suppression.
+            nms_method: Non-max suppression method, see `NMS_METHODS`.
+            nms_top_k: Maximum number of candidates per image before
+                non-max suppression.
+            class_allowlist: Optional list of class IDs or names to keep,
+                all other classes are dropped.
+            class_thresholds: Optional dictionary mapping class IDs or
+                names to score thresholds overriding `threshold`.
+            category_index: Class labels map, used to resolve class names.
+            background_class: Class ID of the background, always dropped.
+            image_shape: Optional (height, width) of the model input,
+                which boxes are scaled to for DIoU suppression.
+            box_format: Order of the raw box columns, a permutation of
+                `BOX_COLUMNS`.
+
+        Raises:
+            ValueError: If the box format is not a permutation of
+                `BOX_COLUMNS`.
+        """
+        self.box_format = tuple(box_format)
+        if sorted(self.box_format) != sorted(BOX_COLUMNS):
+            raise ValueError(f"Invalid box format {self.box_format}, must "
+                             f"be a permutation of {BOX_COLUMNS}!")
+        self._nms_columns = [
+            self.box_format.index(name) for name in DEFAULT_BOX_FORMAT
+        ]
+        self.iou_threshold = iou_threshold
+        self.nms_method = nms_method
+        self.nms_top_k = nms_top_k
+        self._diou_scale = None
+        if nms_method == "diou" and image_shape:
+            height, width = image_shape[:2]
+            self._diou_scale = np.array([height, width, height, width],
+                                        dtype=np.float32)
+        names = {
+            str(category["name"]): class_id
+            for class_id, category in (category_index or {}).items()
+        }
+        class_thresholds = {
+            self._class_id(key, names): value
+            for key, value in (class_thresholds or {}).items()
+        }
+        allowlist = None if class_allowlist is None else {
+            self._class_id(key, names)
+            for key in class_allowlist
+        }
+        known = (set(class_thresholds) | set(allowlist or ())
+                 | set(names.values()))
+
+        # Lookup tables indexed by class ID, with one extra entry that
+        # all larger class IDs are clipped to
+        size = max(known | {background_class}) + 2
+        self._thresholds = np.full(size, threshold, dtype=np.float32)
+        for class_id, value in class_thresholds.items():
+            self._thresholds[class_id] = value
+        self._allowed = np.full(size, allowlist is None, dtype=bool)
+        for class_id in allowlist or ():
+            self._allowed[class_id] = True
+        self._allowed[background_class] = False
+
+    @classmethod
+    def from_predictor(cls, predictor):
+        """Create the postprocess stage configured by a predictor.
+
+        Args:
+            predictor: Predictor whose inference options are used.
+
+        Returns:
+            Detection postprocess stage.
+        """
+        # pylint: disable=protected-access
+        return cls(threshold=predictor.threshold,
+                   iou_threshold=predictor.iou_threshold,
+                   nms_method=predictor.nms_method,
+                   nms_top_k=predictor.nms_top_k,
+                   class_allowlist=predictor.class_allowlist,
+                   class_thresholds=predictor.class_thresholds,
+                   category_index=predictor._category_index,
+                   image_shape=getattr(predictor, "input_shape", None),
+                   box_format=predictor.bbox_format)
+
+    @staticmethod
+    def _class_id(key, names):
+        """Resolve a class ID or name to a class ID."""
+        if isinstance(key, str) and not key.isdigit():
+            return names[key]
+        return int(key)
+
+    def __call__(self, boxes, classes, scores, valid=None):
+        """Postprocess the raw detections of a batch of images.
+
+        Args:
+            boxes: Array of shape (N, num_boxes, 4) of normalised boxes
+                in `box_format` order.
+            classes: Array of shape (N, num_boxes) of class IDs.
+            scores: Array of shape (N, num_boxes) of scores.
+            valid: Optional boolean array of shape (N, num_boxes) marking
+                the rows that hold a detection.
+
+        Returns:
+            List of detections, one for each image, sorted by score.
+        """
+        classes = np.asarray(classes).astype(np.int64)
+        scores = np.asarray(scores)
+        lookup = np.clip(classes, 0, len(self._allowed) - 1)
+        keep = self._allowed[lookup] & (scores > self._thresholds[lookup])
+        if valid is not None:
+            keep &= valid
+
+        images, rows = np.nonzero(keep)
+        boxes = np.asarray(boxes)[images, rows]
+        classes = classes[images, rows]
+        scores = scores[images, rows]
+
+        # Rows are image-major, so each image is a contiguous slice. NMS
+        # runs per image, as merging images would only grow the IoU
+        # matrix, and the (ymin, xmin, ymax, xmax) order of the boxes does
+        # not change their IoU
+        nms_boxes = boxes
+        if self.box_format != DEFAULT_BOX_FORMAT:
+            nms_boxes = boxes[:, self._nms_columns]
+        if self._diou_scale is not None:
+            nms_boxes = nms_boxes * self._diou_scale
+        bounds = np.searchsorted(images, np.arange(len(keep) + 1))
+        predictions_output = []
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            indices, kept_scores = nms_indices(nms_boxes[start:end],
+                                               classes[start:end],
+                                               scores[start:end],
+                                               self.iou_threshold,
+                                               method=self.nms_method,
+                                               top_k=self.nms_top_k)
+            indices += start
+            predictions_output.append(
+                Detections(boxes[indices],
+                           classes[indices],
+                           kept_scores,
+                           box_format=self.box_format))
+        return predictions_output
@@ -16,13 +16,23 @@
 
 import numpy as np
 from abstract_predictor import AbstractPredictor
-from common.constants import MODEL_ARCH, OUTPUT_LAYERS, YOLO_ANCHORS
+from common.constants import (
+    MODEL_ARCH,
+    OUTPUT_LAYERS,
+    YOLO_ANCHORS,
+    YOLO_BOX_FORMAT,
+)
 from common.exceptions import (
     InvalidModelInputException,
     InvalidModelOutputException,
     PredictionException,
 )
-from common.utils import yolo_postprocess, yolov3v4_postprocess
+from common.utils import (
+    Detections,
+    YoloDecoder,
+    yolov3v4_postprocess,
+    yolox_postprocess,
+)
 
 
 class Predictor(AbstractPredictor):
@@ -57,6 +67,11 @@ class Predictor(AbstractPredictor):
             self, f"_{self.model_architecture}_postprocess"
         ) if self.model_architecture in MODEL_ARCH[
             self.model_format] else getattr(self, "_postprocess")
+        if self.model_architecture == "yolov4":
+            self._yolo_decoder = YoloDecoder(YOLO_ANCHORS,
+                                             len(self.category_index),
+                                             self.input_shape,
+                                             sparse=self.sparse_decode)
         self._detections_output = {}
 
     def predict(self, img):
@@ -66,7 +81,7 @@ class Predictor(AbstractPredictor):
             img: Image to predict on.
 
         Returns:
-            Dictionary of predictions containing bounding boxes, classes and scores.
+            Detections containing bounding boxes, classes and scores.
 
         Raises:
             PredictionException: If prediction fails.
@@ -92,7 +107,7 @@ class Predictor(AbstractPredictor):
             InvalidModelInputException: If input is not a numpy array.
         """
         try:
-            input_image = np.expand_dims(img.astype(np.uint8), axis=0)
+            input_image = self._fill_input([img], dtype=np.uint8)
         except Exception as exc:
             raise InvalidModelInputException(exc) from exc
         return input_image
@@ -101,7 +116,7 @@ class Predictor(AbstractPredictor):
         """Postprocess raw model output into interpretable predictions.
 
         Returns:
-            Dictionary of predictions containing bounding boxes, classes and scores.
+            Detections containing bounding boxes, classes and scores.
 
         Raises:
             InvalidModelOutputException: If output cannot be parsed.
@@ -124,7 +139,7 @@ class Predictor(AbstractPredictor):
                 if each_name in output_layer_names["scores"]:
                     scores = np.squeeze(self._detections_output[index])
             if len(scores) == 0:
-                return {"boxes": [], "classes": [], "scores": []}
+                return Detections(box_format=self.bbox_format)
 
             # Filter out predictions below threshold
             indexes = np.where(scores > float(self.threshold))  # type: ignore
@@ -136,12 +151,10 @@ class Predictor(AbstractPredictor):
         except Exception as exc:
             raise InvalidModelOutputException(exc) from exc
 
-        predictions_output = {
-            "boxes": boxes.tolist(),
-            "classes": classes.tolist(),
-            "scores": scores.tolist()
-        }
-        return predictions_output
+        return Detections(boxes,
+                          classes,
+                          scores,
+                          box_format=self.bbox_format)
 
     def _yolov4_preprocess(self, img):
         """Preprocess image to be compatible with the YOLOV4 model.
@@ -156,8 +169,7 @@ class Predictor(AbstractPredictor):
             InvalidModelInputException: If input is not a numpy array.
         """
         try:
-            input_image = np.expand_dims((img / 255).astype(np.float32),
-                                         axis=0)
+            input_image = self._fill_input([img], scale=1 / 255)
         except Exception as exc:
             raise InvalidModelInputException(exc) from exc
         return input_image
@@ -166,7 +178,7 @@ class Predictor(AbstractPredictor):
         """Postprocess YOLOV4 raw model output into interpretable predictions.
 
         Returns:
-            Dictionary of predictions containing bounding boxes, classes and scores.
+            Detections containing bounding boxes, classes and scores.
 
         Raises:
             InvalidModelOutputException: If output cannot be parsed.
@@ -178,9 +190,10 @@ class Predictor(AbstractPredictor):
                 YOLO_ANCHORS,
                 len(self.category_index),
                 self.input_shape,
+                decoder=self._yolo_decoder,
             )
-            if boxes == []:
-                return {"boxes": [], "classes": [], "scores": []}
+            if len(boxes) == 0:
+                return Detections(box_format=YOLO_BOX_FORMAT)
 
             indexes = np.where(scores > float(self.threshold))  # type: ignore
 
@@ -190,12 +203,7 @@ class Predictor(AbstractPredictor):
         except Exception as exc:
             raise InvalidModelOutputException(exc) from exc
 
-        predictions_output = {
-            "boxes": boxes.tolist(),
-            "classes": classes.tolist(),
-            "scores": scores.tolist()
-        }
-        return predictions_output
+        return Detections(boxes, classes, scores, box_format=YOLO_BOX_FORMAT)
 
     def _yolox_preprocess(self, img):
         """Preprocess image to be compatible with the YOLOX model.
@@ -210,8 +218,7 @@ class Predictor(AbstractPredictor):
             InvalidModelInputException: If input is not a numpy array.
         """
         try:
-            input_image = np.expand_dims(
-                img.astype(np.float32).transpose(2, 0, 1), 0)
+            input_image = self._fill_input([img], layout="NCHW")
         except Exception as exc:
             raise InvalidModelInputException(exc) from exc
         return input_image
@@ -220,34 +227,27 @@ class Predictor(AbstractPredictor):
         """Postprocess YOLOX raw model output into interpretable predictions.
 
         Returns:
-            Dictionary of predictions containing bounding boxes, classes and scores.
+            Detections containing bounding boxes, classes and scores.
 
         Raises:
             InvalidModelOutputException: If output cannot be parsed.
         """
         try:
-            output = yolo_postprocess(self._detections_output[0],
-                                      num_classes=3,
-                                      conf_thre=self.threshold)[0]
+            prediction = self._detections_output[0]
+            # Rows hold 4 box coordinates and the objectness before the
+            # class scores
+            num_classes = np.shape(prediction)[-1] - 5
+            output = yolox_postprocess(prediction,
+                                       num_classes=num_classes,
+                                       conf_thre=self.threshold)[0]
             if output is None:
-                return {"boxes": [], "classes": [], "scores": []}
-
-            boxes = output[:, 0:4].cpu().detach().numpy().astype(np.float64)
-            classes = output[:, 6].cpu().detach().numpy().astype(np.float64)
-            scores = (output[:, 4] *
-                      output[:, 5]).cpu().detach().numpy().astype(np.float64)
-            boxes = [[
-                bbox[1] / self.input_shape[0],
-                bbox[0] / self.input_shape[1],
-                bbox[3] / self.input_shape[0],
-                bbox[2] / self.input_shape[1],
-            ] for bbox in boxes]
+                return Detections()
+
+            height, width = self.input_shape
+            boxes = output[:, [1, 0, 3, 2]] / [height, width, height, width]
+            classes = output[:, 6]
+            scores = output[:, 4] * output[:, 5]
         except Exception as exc:
             raise InvalidModelOutputException(exc) from exc
 
-        predictions_output = {
-            "boxes": boxes,
-            "classes": classes,
-            "scores": scores
-        }
-        return predictions_output
+        return Detections(boxes, classes, scores)
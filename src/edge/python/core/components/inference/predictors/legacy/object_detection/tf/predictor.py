@@ -23,6 +23,7 @@ from common.exceptions import (
     InvalidModelOutputException,
     PredictionException,
 )
+from common.utils import Detections
 
 
 class Predictor(AbstractPredictor):
@@ -55,7 +56,7 @@ class Predictor(AbstractPredictor):
             img: Image to predict on.
 
         Returns:
-            Dictionary of predictions containing bounding boxes, classes and scores.
+            Detections containing bounding boxes, classes and scores.
 
         Raises:
             PredictionException: If prediction fails.
@@ -96,7 +97,7 @@ class Predictor(AbstractPredictor):
         """Postprocess raw model output into interpretable predictions.
 
         Returns:
-            Dictionary of predictions containing bounding boxes, classes and scores.
+            Detections containing bounding boxes, classes and scores.
 
         Raises:
             InvalidModelOutputException: If output cannot be parsed.
@@ -104,7 +105,7 @@ class Predictor(AbstractPredictor):
         try:
             num_detections = int(self._detections_output.pop("num_detections"))
             if num_detections == 0:
-                return {"boxes": [], "classes": [], "scores": []}
+                return Detections(box_format=self.bbox_format)
 
             detections = {
                 key: value[0, :num_detections].numpy()
@@ -119,18 +120,15 @@ class Predictor(AbstractPredictor):
             indexes = np.where(detections[output_layer_names["scores"]] >
                                float(self.threshold))
             boxes = detections[output_layer_names["boxes"]][indexes]
-            classes = detections[
-                output_layer_names["classes"]][indexes].astype(np.int64)
+            classes = detections[output_layer_names["classes"]][indexes]
             scores = detections[output_layer_names["scores"]][indexes]
         except Exception as exc:
             raise InvalidModelOutputException(exc) from exc
 
-        predictions_output = {
-            "boxes": boxes.tolist(),
-            "classes": classes.tolist(),
-            "scores": scores.tolist()
-        }
-        return predictions_output
+        return Detections(boxes,
+                          classes,
+                          scores,
+                          box_format=self.bbox_format)
 
     def _yolov4_preprocess(self, img):
         """Preprocess image to be compatible with the model.
@@ -150,7 +148,7 @@ class Predictor(AbstractPredictor):
         """Postprocess raw model output into interpretable predictions.
 
         Returns:
-            Dictionary of predictions containing bounding boxes, classes and scores.
+            Detections containing bounding boxes, classes and scores.
 
         Raises:
             InvalidModelOutputException: If output cannot be parsed.
@@ -22,6 +22,7 @@ from common.exceptions import (
     InvalidModelOutputException,
     PredictionException,
 )
+from common.utils import Detections
 
 
 class Predictor(AbstractPredictor):
@@ -50,7 +51,7 @@ class Predictor(AbstractPredictor):
             img: Image to predict on.
 
         Returns:
-            Dictionary of predictions containing bounding boxes, classes and scores.
+            Detections containing bounding boxes, classes and scores.
 
         Raises:
             PredictionException: If prediction fails.
@@ -81,7 +82,7 @@ class Predictor(AbstractPredictor):
             InvalidModelInputException: If input is not a numpy array.
         """
         try:
-            return [img.astype(np.float32)]
+            return [self._fill_input([img])[0]]
         except Exception as exc:
             raise InvalidModelInputException(exc) from exc
 
@@ -89,7 +90,7 @@ class Predictor(AbstractPredictor):
         """Postprocess raw model output into interpretable predictions.
 
         Returns:
-            Dictionary of predictions containing bounding boxes, classes and scores.
+            Detections containing bounding boxes, classes and scores.
 
         Raises:
             InvalidModelOutputException: If output cannot be parsed.
@@ -113,7 +114,7 @@ class Predictor(AbstractPredictor):
                     scores = np.squeeze(
                         self._model.get_tensor(each_layer['index']))
             if len(scores) == 0:
-                return {"boxes": [], "classes": [], "scores": []}
+                return Detections(box_format=self.bbox_format)
 
             # Filter out predictions below threshold
             indexes = np.where(scores > float(self.threshold))  # type: ignore
@@ -125,9 +126,7 @@ class Predictor(AbstractPredictor):
         except Exception as exc:
             raise InvalidModelOutputException(exc) from exc
 
-        predictions_output = {
-            "boxes": boxes.tolist(),
-            "classes": classes.tolist(),
-            "scores": scores.tolist()
-        }
-        return predictions_output
+        return Detections(boxes,
+                          classes,
+                          scores,
+                          box_format=self.bbox_format)
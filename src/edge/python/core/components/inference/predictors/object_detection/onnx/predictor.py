@@ -14,14 +14,13 @@
 @Desc    :   ONNX Object Detection Predictor class.
 """
 
-import numpy as np
 from abstract_predictor import AbstractPredictor
 from common.exceptions import (
     InvalidModelInputException,
     InvalidModelOutputException,
     PredictionException,
 )
-from common.utils import nms_boxes
+from detection_postprocess import DetectionPostprocess
 
 
 class Predictor(AbstractPredictor):
@@ -42,9 +41,14 @@ class Predictor(AbstractPredictor):
             single_output.name for single_output in self._model.get_outputs()
         ]
 
-        _, height, width, _ = self._model.get_inputs()[0].shape
+        batch_size, height, width, _ = self._model.get_inputs()[0].shape
         if isinstance(height, int) and isinstance(width, int):
             self.input_shape = (height, width)
+        # Symbolic batch dimensions accept any batch size
+        self.max_batch_size = batch_size if isinstance(batch_size,
+                                                       int) else None
+        self._detection_postprocess = DetectionPostprocess.from_predictor(
+            self)
         self._detections_output = {}
 
     def predict(self, img):
@@ -54,33 +58,50 @@ class Predictor(AbstractPredictor):
             img: Image to predict on.
 
         Returns:
-            List of tuples containing bounding boxes, classes and scores.
+            Detections containing bounding boxes, classes and scores.
+
+        Raises:
+            PredictionException: If prediction fails.
+        """
+        return self.batch_predict([img])[0]
+
+    def batch_predict(self, img_batch):
+        """Predict on a batch of images with a single model call per chunk.
+
+        Args:
+            img_batch: List of images of the same shape to predict on.
+
+        Returns:
+            List of detections, one for each image.
 
         Raises:
             PredictionException: If prediction fails.
         """
         try:
-            model_input = self._preprocess(img)
-            self._detections_output = self._model.run(
-                self._output_names, {self._input_name: model_input})
-            return self._postprocess()
+            predictions = []
+            for chunk in self._chunks(img_batch):
+                model_input = self._preprocess(chunk)
+                self._detections_output = self._model.run(
+                    self._output_names, {self._input_name: model_input})
+                predictions.extend(self._postprocess())
+            return predictions
         except Exception as exc:
             raise PredictionException(exc) from exc
 
     def _preprocess(self, img):
-        """Preprocess image to be compatible with the model.
+        """Preprocess images to be compatible with the model.
 
         Args:
-            img: Image to preprocess.
+            img: List of images to preprocess.
 
         Returns:
-            Preprocessed image.
+            Preprocessed image batch.
 
         Raises:
             InvalidModelInputException: If input is not a numpy array.
         """
         try:
-            input_image = np.expand_dims(img.astype(np.float32), axis=0)
+            input_image = self._fill_input(img)
         except Exception as exc:
             raise InvalidModelInputException(exc) from exc
         return input_image
@@ -88,43 +109,20 @@ class Predictor(AbstractPredictor):
     def _postprocess(self):
         """Postprocess raw model output into interpretable predictions.
 
+        Filtering and non-max suppression run on normalised boxes in a
+        single vectorised pass over the whole batch.
+
         Returns:
-            List of tuples containing bounding boxes, classes and scores.
+            List of detections, one for each image in the batch.
 
         Raises:
             InvalidModelOutputException: If output cannot be parsed.
         """
         try:
-            ## Filter detections
-            self._detections_output = self._detections_output[0][0]
-            slicer = self._detections_output[:, -1]
-            output = self._detections_output[:, :6][slicer != 0]
-            scores = output[:, 4]
-            output = output[scores > self.threshold]
-            classes = output[:, 5]
-            output = output[classes != 0]
-
-            ## Postprocess detections
-            boxes = output[:, :4]
-            classes = output[:, 5].astype(np.int32)
-            scores = output[:, 4]
-            boxes[:, 0], boxes[:, 1] = (boxes[:, 1] * self.input_shape[1],
-                                        boxes[:, 0] * self.input_shape[0])
-            boxes[:, 2], boxes[:, 3] = (boxes[:, 3] * self.input_shape[1],
-                                        boxes[:, 2] * self.input_shape[0])
-            boxes, classes, scores = nms_boxes(boxes, classes, scores, 0.1)
-            boxes = [[
-                box[1] / self.input_shape[1],
-                box[0] / self.input_shape[0],
-                box[3] / self.input_shape[1],
-                box[2] / self.input_shape[0],
-            ] for box in boxes]  # y1, x1, y2, x2
+            detections = self._detections_output[0]
+            return self._detection_postprocess(detections[..., :4],
+                                               detections[..., 5],
+                                               detections[..., 4],
+                                               detections[..., -1] != 0)
         except Exception as exc:
             raise InvalidModelOutputException(exc) from exc
-
-        predictions_output = {
-            "boxes": boxes,
-            "classes": classes,
-            "scores": scores,
-        }
-        return predictions_output
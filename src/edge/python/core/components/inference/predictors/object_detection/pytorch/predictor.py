@@ -14,7 +14,6 @@
 @Desc    :   PyTorch Object Detection Predictor class.
 """
 
-import numpy as np
 import torch
 from abstract_predictor import AbstractPredictor
 from common.exceptions import (
@@ -22,7 +21,7 @@ from common.exceptions import (
     InvalidModelOutputException,
     PredictionException,
 )
-from common.utils import nms_boxes
+from detection_postprocess import DetectionPostprocess
 
 
 class Predictor(AbstractPredictor):
@@ -38,6 +37,8 @@ class Predictor(AbstractPredictor):
             color_map: Color map for bounding boxes.
         """
         super().__init__(model, category_index, color_map, **kwargs)
+        self._detection_postprocess = DetectionPostprocess.from_predictor(
+            self)
         # TODO: Get input shape from model
         # self.input_shape =
         self._detections_output = {}
@@ -49,33 +50,51 @@ class Predictor(AbstractPredictor):
             img: Image to predict on.
 
         Returns:
-            Dictionary of predictions containing bounding boxes, classes and scores.
+            Detections containing bounding boxes, classes and scores.
+
+        Raises:
+            PredictionException: If prediction fails.
+        """
+        return self.batch_predict([img])[0]
+
+    def batch_predict(self, img_batch):
+        """Predict on a batch of images with a single model call per chunk.
+
+        Args:
+            img_batch: List of images of the same shape to predict on.
+
+        Returns:
+            List of detections, one for each image.
 
         Raises:
             PredictionException: If prediction fails.
         """
         try:
-            model_input = self._preprocess(img)
-            self._detections_output = self._model(model_input)
-            return self._postprocess()
+            predictions = []
+            for chunk in self._chunks(img_batch):
+                model_input = self._preprocess(chunk)
+                with torch.no_grad():
+                    self._detections_output = self._model(model_input)
+                predictions.extend(self._postprocess())
+            return predictions
         except Exception as exc:
             raise PredictionException(exc) from exc
 
     def _preprocess(self, img):
-        """Preprocess image to be compatible with the model.
+        """Preprocess images to be compatible with the model.
 
         Args:
-            img: Image to preprocess.
+            img: List of images to preprocess.
 
         Returns:
-            Preprocessed image.
+            Preprocessed image batch.
 
         Raises:
             InvalidModelInputException: If input is not a numpy array.
         """
         try:
-            input_image = np.expand_dims(img.astype(np.float32), axis=0)
-            input_tensor = torch.Tensor(input_image)
+            # Shares memory with the preallocated input buffer
+            input_tensor = torch.from_numpy(self._fill_input(img))
         except Exception as exc:
             raise InvalidModelInputException(exc) from exc
         return input_tensor
@@ -83,45 +102,23 @@ class Predictor(AbstractPredictor):
     def _postprocess(self):
         """Postprocess raw model output into interpretable predictions.
 
+        Filtering and non-max suppression run on normalised boxes in a
+        single vectorised pass over the whole batch.
+
         Returns:
-            Dictionary of predictions containing bounding boxes, classes and scores.
+            List of detections, one for each image in the batch.
 
         Raises:
             InvalidModelOutputException: If output cannot be parsed.
         """
         try:
-            ## Filter detections
-            self._detections_output = self._detections_output[0].detach()
-            slicer = self._detections_output[:, -1]
-            output = self._detections_output[:, :6][np.where(slicer != 0)]
-            output = torch.Tensor(output)
-            scores = output[:, 4]
-            output = output[np.where(scores > self.threshold)]
-            classes = output[:, 5]
-            output = output[np.where(classes != 0)]
-            output = torch.Tensor(output)
-
-            ## Postprocess detections
-            boxes = output[:, :4].numpy()
-            classes = output[:, 5].numpy().astype(np.int32)
-            scores = output[:, 4].numpy()
-            boxes[:, 0], boxes[:, 1] = (boxes[:, 1] * self.input_shape[1],
-                                        boxes[:, 0] * self.input_shape[0])
-            boxes[:, 2], boxes[:, 3] = (boxes[:, 3] * self.input_shape[1],
-                                        boxes[:, 2] * self.input_shape[0])
-            boxes, classes, scores = nms_boxes(boxes, classes, scores, 0.1)
-            boxes = [[
-                box[1] / self.input_shape[1],
-                box[0] / self.input_shape[0],
-                box[3] / self.input_shape[1],
-                box[2] / self.input_shape[0],
-            ] for box in boxes]  # y1, x1, y2, x2
+            detections = self._detections_output
+            if isinstance(detections, (list, tuple)):
+                detections = detections[0]
+            detections = detections.detach().cpu().numpy()
+            return self._detection_postprocess(detections[..., :4],
+                                               detections[..., 5],
+                                               detections[..., 4],
+                                               detections[..., -1] != 0)
         except Exception as exc:
             raise InvalidModelOutputException(exc) from exc
-
-        predictions_output = {
-            "boxes": boxes,
-            "classes": classes,
-            "scores": scores,
-        }
-        return predictions_output
@@ -21,7 +21,7 @@ from common.exceptions import (
     InvalidModelOutputException,
     PredictionException,
 )
-from common.utils import nms_boxes
+from detection_postprocess import DetectionPostprocess
 
 
 class Predictor(AbstractPredictor):
@@ -37,6 +37,8 @@ class Predictor(AbstractPredictor):
             color_map: Color map for bounding boxes.
         """
         super().__init__(model, category_index, color_map, **kwargs)
+        self._detection_postprocess = DetectionPostprocess.from_predictor(
+            self)
         # TODO: Get input shape from model
         # self.input_shape =
         self._detections_output = {}
@@ -48,32 +50,56 @@ class Predictor(AbstractPredictor):
             img: Image to predict on.
 
         Returns:
-            List of tuples containing bounding boxes, classes and scores.
+            Detections containing bounding boxes, classes and scores.
+
+        Raises:
+            PredictionException: If prediction fails.
+        """
+        return self.batch_predict([img])[0]
+
+    def batch_predict(self, img_batch):
+        """Predict on a batch of images.
+
+        The model is invoked once per chunk of `max_batch_size` images
+        (TFLite detection postprocess ops only accept a batch size of 1),
+        then the outputs of all chunks are postprocessed in a single pass.
+
+        Args:
+            img_batch: List of images of the same shape to predict on.
+
+        Returns:
+            List of detections, one for each image.
 
         Raises:
             PredictionException: If prediction fails.
         """
         try:
-            model_input = self._preprocess(img)
-            self._detections_output = self._model(inputs=model_input)
+            outputs = [
+                self._model(inputs=self._preprocess(chunk))
+                for chunk in self._chunks(img_batch)
+            ]
+            self._detections_output = {
+                key: np.concatenate([output[key] for output in outputs])
+                for key in outputs[0]
+            }
             return self._postprocess()
         except Exception as exc:
             raise PredictionException(exc) from exc
 
     def _preprocess(self, img):
-        """Preprocess image to be compatible with the model.
+        """Preprocess images to be compatible with the model.
 
         Args:
-            img: Image to preprocess.
+            img: List of images to preprocess.
 
         Returns:
-            Preprocessed image.
+            Preprocessed image batch.
 
         Raises:
             InvalidModelInputException: If input is not a numpy array.
         """
         try:
-            input_image = np.expand_dims(img.astype(np.float32), axis=0)
+            input_image = self._fill_input(img)
         except Exception as exc:
             raise InvalidModelInputException(exc) from exc
         return input_image
@@ -81,45 +107,17 @@ class Predictor(AbstractPredictor):
     def _postprocess(self):
         """Postprocess raw model output into interpretable predictions.
 
+        Filtering and non-max suppression run on normalised boxes in a
+        single vectorised pass over the whole batch.
+
         Returns:
-            List of tuples containing bounding boxes, classes and scores.
+            List of detections, one for each image in the batch.
 
         Raises:
             InvalidModelOutputException: If output cannot be parsed.
         """
         try:
-            ## Filter detections
             _, scores, classes, boxes = list(self._detections_output.values())  # pylint: disable=W0632
-            classes = classes.astype(np.int16)
-            _filter = scores > self.threshold
-            classes = classes[_filter]
-            boxes = boxes[_filter]
-            scores = scores[_filter]
-
-            # Filter background class
-            _filter = classes != 0
-            classes = classes[_filter]
-            boxes = boxes[_filter]
-            scores = scores[_filter]
-
-            ## Postprocess detections
-            boxes[:, 0], boxes[:, 1] = (boxes[:, 1] * self.input_shape[1],
-                                        boxes[:, 0] * self.input_shape[0])
-            boxes[:, 2], boxes[:, 3] = (boxes[:, 3] * self.input_shape[1],
-                                        boxes[:, 2] * self.input_shape[0])
-            boxes, classes, scores = nms_boxes(boxes, classes, scores, 0.1)
-            boxes = [[
-                box[1] / self.input_shape[1],
-                box[0] / self.input_shape[0],
-                box[3] / self.input_shape[1],
-                box[2] / self.input_shape[0],
-            ] for box in boxes]  # y1, x1, y2, x2
+            return self._detection_postprocess(boxes, classes, scores)
         except Exception as exc:
             raise InvalidModelOutputException(exc) from exc
-
-        predictions_output = {
-            "boxes": boxes,
-            "classes": classes,
-            "scores": scores,
-        }
-        return predictions_output
@@ -14,14 +14,13 @@
 @Desc    :   ONNX Semantic Segmentation Predictor class.
 """
 
-import numpy as np
 from abstract_predictor import AbstractPredictor
 from common.exceptions import (
     InvalidModelInputException,
     InvalidModelOutputException,
     PredictionException,
 )
-from common.utils import get_binary_mask
+from common.utils import get_class_map
 
 
 class Predictor(AbstractPredictor):
@@ -80,7 +79,7 @@ class Predictor(AbstractPredictor):
             InvalidModelInputException: If input is not a numpy array.
         """
         try:
-            input_image = np.expand_dims(img.astype(np.float32), 0)
+            input_image = self._fill_input([img])
         except Exception as exc:
             raise InvalidModelInputException(exc) from exc
         return [input_image]
@@ -89,7 +88,8 @@ class Predictor(AbstractPredictor):
         """Postprocess raw model output into interpretable predictions.
 
         Returns:
-            Dictionary of predictions containing a mask.
+            Dictionary of predictions containing a uint8 mask of class
+                indices at model resolution.
 
         Raises:
             InvalidModelOutputException: If output cannot be parsed.
@@ -97,13 +97,9 @@ class Predictor(AbstractPredictor):
         try:
             ## Filter detections
             self._detections_output = self._detections_output[0][0]
-            output_mask = get_binary_mask(self._detections_output)
-
-            if output_mask is not None:
-                output_mask = np.expand_dims(output_mask, -1)
-                output_mask = np.tile(output_mask, 3)
-                output_mask *= 127
-                output_mask = np.clip(output_mask, 0, 255).astype(np.uint8)
+            output_mask = get_class_map(self._detections_output,
+                                        threshold=self.mask_threshold,
+                                        stride=self.mask_stride)
         except Exception as exc:
             raise InvalidModelOutputException(exc) from exc
 
@@ -14,7 +14,6 @@
 @Desc    :   Abstract engine class.
 """
 
-import time
 from abc import ABC, abstractmethod
 from importlib import import_module
 
@@ -23,7 +22,9 @@ from abstract_output import AbstractOutput
 from abstract_postprocessor import AbstractPostprocessor
 from abstract_preprocessor import AbstractPreprocessor
 from common.config import CONFIG
+from common.constants import Timers
 from common.exceptions import (
+    EmptyFrameBufferException,
     InferenceModuleException,
     InputModuleException,
     OutputModuleException,
@@ -31,7 +32,15 @@ from common.exceptions import (
     PreprocessingModuleException,
 )
 from common.logger import Logger
-from core.components.inference import InferenceEngine
+from common.profiling import timing
+from core.components.inference import InferenceEngine, InferencePool
+from core.devices.async_output import AsyncOutput
+from core.devices.pipeline import Pipeline
+from core.devices.stream import Stream, StreamScheduler
+
+# Keys of an input configuration that describe the stream
+# rather than the input module itself.
+_STREAM_KEYS = ("stream_id", "weight", "preprocessors", "output")
 
 
 class AbstractEngine(ABC):
@@ -41,13 +50,19 @@ class AbstractEngine(ABC):
     def __init__(self, config=False):
         """Initialize engine."""
         self._inference_engine = None
-        self._input_module = None
+        self._streams = {}
+        self._scheduler = StreamScheduler(self._streams.values())
         self._preprocessor_modules = []
         self._postprocessor_modules = []
         self._output_modules = []
+        self._assets = {}
+        self._pipeline_config = {}
+        self._pipeline = None
+        self._inference_pool = None
 
         if config:
             self._device = CONFIG["device"]
+            self._pipeline_config = CONFIG["blocks"].get("pipeline") or {}
 
             Logger.debug("Loading inference engine...")
             try:
@@ -64,30 +79,40 @@ class AbstractEngine(ABC):
 
             try:
                 if "input" in CONFIG["blocks"]:
-                    Logger.debug("Loading input module...")
-                    self._input_module = import_module(
-                        f"core.devices.{self._device}.modules.input"
-                        f".{CONFIG['blocks']['input']['name']}.module").Input(
-                            **CONFIG["blocks"]["input"])
-                    Logger.debug("Loaded input modules!")
+                    Logger.debug("Loading input module(s)...")
+                    for index, input_config in enumerate(
+                            self._input_configs()):
+                        kwargs = {
+                            key: value
+                            for key, value in input_config.items()
+                            if key not in _STREAM_KEYS
+                        }
+                        self.add_input_stream(
+                            import_module(
+                                f"core.devices.{self._device}.modules.input"
+                                f".{kwargs['name']}.module").Input(**kwargs),
+                            stream_id=input_config.get("stream_id",
+                                                       f"stream_{index}"),
+                            weight=input_config.get("weight", 1))
+                    Logger.debug("Loaded input module(s)!")
             except Exception as exc:
                 raise InputModuleException(
-                    f"Failed to load input module: {exc}") from exc
+                    f"Failed to load input module(s): {exc}") from exc
 
             try:
                 if "preprocessors" in CONFIG["blocks"]:
                     Logger.debug("Loading preprocessor module(s)...")
-                    for preprocessor in CONFIG["blocks"]["preprocessors"][
-                            "modules"]:
-                        module_key = list(preprocessor.keys())[-1]
-                        kwargs = preprocessor[module_key]
-                        kwargs["name"] = module_key
-                        self._preprocessor_modules.append(
-                            import_module(
-                                f"core.components.data.preprocessors"
-                                f".{module_key}.module").Preprocessor(
-                                    **kwargs))
+                    self._preprocessor_modules.extend(
+                        self._load_modules(
+                            "core.components.data.preprocessors",
+                            CONFIG["blocks"]["preprocessors"], "Preprocessor"))
                     Logger.debug("Loaded preprocessor module(s)!")
+                for stream, input_config in zip(self._streams.values(),
+                                                self._input_configs()):
+                    if "preprocessors" in input_config:
+                        stream.preprocessor_modules = self._load_modules(
+                            "core.components.data.preprocessors",
+                            input_config["preprocessors"], "Preprocessor")
             except Exception as exc:
                 raise PreprocessingModuleException(
                     f"Failed to load preprocessor module(s): {exc}") from exc
@@ -95,16 +120,11 @@ class AbstractEngine(ABC):
             try:
                 if "postprocessors" in CONFIG["blocks"]:
                     Logger.debug("Loading postprocessor module(s)...")
-                    for postprocessor in CONFIG["blocks"]["postprocessors"][
-                            "modules"]:
-                        module_key = list(postprocessor.keys())[-1]
-                        kwargs = postprocessor[module_key]
-                        kwargs["name"] = module_key
-                        self._postprocessor_modules.append(
-                            import_module(
-                                f"core.components.data.postprocessors"
-                                f".{module_key}.module").Postprocessor(
-                                    **kwargs))
+                    self._postprocessor_modules.extend(
+                        self._load_modules(
+                            "core.components.data.postprocessors",
+                            CONFIG["blocks"]["postprocessors"],
+                            "Postprocessor"))
                     Logger.debug("Loaded postprocessor module(s)!")
             except Exception as exc:
                 raise PostprocessingModuleException(
@@ -113,15 +133,14 @@ class AbstractEngine(ABC):
             try:
                 if "output" in CONFIG["blocks"]:
                     Logger.debug("Loading output module(s)...")
-                    for output in CONFIG["blocks"]["output"]["modules"]:
-                        module_key = list(output.keys())[-1]
-                        kwargs = output[module_key]
-                        kwargs["name"] = module_key
-                        self._output_modules.append(
-                            import_module(
-                                f"core.devices.{self._device}.modules.output"
-                                f".{module_key}.module").Output(**kwargs))
+                    self._output_modules.extend(
+                        self._load_output_modules(CONFIG["blocks"]["output"]))
                     Logger.debug("Loaded output module(s)!")
+                for stream, input_config in zip(self._streams.values(),
+                                                self._input_configs()):
+                    if "output" in input_config:
+                        stream.output_modules = self._load_output_modules(
+                            input_config["output"])
             except Exception as exc:
                 raise OutputModuleException(
                     f"Failed to load output module(s): {exc}") from exc
@@ -138,16 +157,55 @@ class AbstractEngine(ABC):
     def set_input_module(self, input_module):
         """Set input module.
 
+        Replaces all input streams with a single stream using the
+        engine preprocessor and output modules.
+
         Args:
             input_module (Input): Input module.
 
         Raises:
             InputModuleException: If input module is not of type Input.
         """
+        self._streams.clear()
+        self.add_input_stream(input_module)
+
+    def add_input_stream(self,
+                         input_module,
+                         stream_id=None,
+                         preprocessor_modules=None,
+                         output_modules=None,
+                         weight=1):
+        """Add an input stream sharing the inference engine.
+
+        Args:
+            input_module (Input): Input module.
+            stream_id (str): Unique name of the stream, also used to prefix
+                its frame IDs when the engine has several streams.
+            preprocessor_modules (list): Preprocessor modules of the stream,
+                defaults to the engine preprocessor modules.
+            output_modules (list): Output modules of the stream,
+                defaults to the engine output modules.
+            weight (int): Scheduling weight of the stream.
+
+        Raises:
+            InputModuleException: If input module is not of type Input,
+                or the stream ID is already in use.
+        """
         if not isinstance(input_module, AbstractInput):
             raise InputModuleException(
                 "Input module must be of type AbstractInput.")
-        self._input_module = input_module
+        stream_id = str(stream_id or f"stream_{len(self._streams)}")
+        if stream_id in self._streams:
+            raise InputModuleException(
+                f"Input stream {stream_id} already exists.")
+        self._streams[stream_id] = Stream(
+            stream_id,
+            input_module,
+            self._preprocessor_modules
+            if preprocessor_modules is None else preprocessor_modules,
+            self._output_modules if output_modules is None else output_modules,
+            weight,
+        )
 
     def add_preprocess_module(self, preprocessor_module):
         """Add preprocessor module.
@@ -179,11 +237,13 @@ class AbstractEngine(ABC):
                 "Postprocessor module must be of type AbstractPostprocessor.")
         self._postprocessor_modules.append(postprocessor_module)
 
-    def add_output_module(self, output_module):
+    def add_output_module(self, output_module, async_queue=None):
         """Add output module.
 
         Args:
             output_module (Output): Output module.
+            async_queue (dict): Optional `AsyncOutput` arguments `size` and
+                `policy`, to run the output module on its own worker.
 
         Raises:
             OutputModuleException: If output module is not of type Output.
@@ -191,8 +251,28 @@ class AbstractEngine(ABC):
         if not isinstance(output_module, AbstractOutput):
             raise OutputModuleException(
                 "Output module must be of type AbstractOutput.")
+        if async_queue is not None:
+            output_module = AsyncOutput(output_module, **async_queue)
         self._output_modules.append(output_module)
 
+    def set_pipeline_config(self, active=True, **kwargs):
+        """Set pipelined execution configuration.
+
+        Args:
+            active: Whether to run each engine stage on its own worker.
+            queue_size: Default depth of the queues between stages.
+            queue_sizes: Dictionary of queue depths per stage, with keys
+                `preprocessors`, `dispatch`, `inference`, `postprocessors`
+                and `output`.
+            inference_workers: Number of inference worker processes,
+                0 to run inference on the pipeline thread.
+            inference_slots: Number of shared memory frame slots.
+            slot_bytes: Minimum size of each shared memory frame slot in
+                bytes, slots are always large enough for the first frame.
+            start_method: Multiprocessing start method of the workers.
+        """
+        self._pipeline_config = dict(active=active, **kwargs)
+
     def add_inference_engine(self, inference_engine):
         """Add inference engine.
 
@@ -214,9 +294,14 @@ class AbstractEngine(ABC):
         Returns:
             dict: Engine pipeline summary.
         """
+        input_modules = {
+            stream_id: stream.input_module.name
+            for stream_id, stream in self._streams.items()
+        }
         return {
             "input_modules":
-            self._input_module.name if self._input_module else None,
+            input_modules if len(input_modules) > 1 else next(
+                iter(input_modules.values()), None),
             "preprocessor_modules":
             [module.name for module in self._preprocessor_modules],
             "inference_engine": [
@@ -227,6 +312,12 @@ class AbstractEngine(ABC):
             "postprocessor_modules":
             [module.name for module in self._postprocessor_modules],
             "output_modules": [module.name for module in self._output_modules],
+            "output_queues": {
+                output.name: output.stats()
+                for output in self._all_output_modules()
+                if isinstance(output, AsyncOutput)
+            },
+            "pipeline": self._pipeline_config if self.pipelined else None,
         }
 
     def compile(self):
@@ -242,10 +333,282 @@ class AbstractEngine(ABC):
         # TODO: matches the input of the next module.
         raise NotImplementedError
 
+    @property
+    def pipelined(self):
+        """Get whether the engine runs in pipelined mode.
+
+        Returns:
+            True if each stage runs on its own worker, False otherwise.
+        """
+        return bool(self._pipeline_config.get("active", False))
+
+    def _run_pipeline(self):
+        """Run the engine stages concurrently until the input is exhausted.
+
+        Frame N+1 is preprocessed while frame N is in inference and frame
+        N-1 is being postprocessed and sent to the output modules. Each stage
+        runs on a single worker, so frames are processed strictly in order.
+        """
+        queue_sizes = dict(self._pipeline_config.get("queue_sizes") or {})
+        if self._pipeline_config.get("inference_workers"):
+            self._inference_pool = InferencePool(
+                workers=self._pipeline_config["inference_workers"],
+                slots=self._pipeline_config.get("inference_slots"),
+                slot_bytes=self._pipeline_config.get(
+                    "slot_bytes", self._default_slot_bytes()),
+                start_method=self._pipeline_config.get(
+                    "start_method", "spawn"),
+            )
+            # Let the dispatcher run ahead by as many frames as there are
+            # shared memory slots, so that every worker stays busy.
+            queue_sizes.setdefault("inference",
+                                   self._inference_pool.capacity)
+            inference_stages = [
+                ("dispatch", self._dispatch),
+                ("inference", self._collect),
+            ]
+        elif self._inference_engine.batcher:
+            inference_stages = [("inference", self._infer_batch,
+                                 self._inference_engine.batcher)]
+        else:
+            inference_stages = [("inference", self._infer)]
+
+        self._pipeline = Pipeline(
+            self._next_frame,
+            [("preprocessors", self._preprocess)] + inference_stages + [
+                ("postprocessors", self._postprocess),
+                ("output", self._output),
+            ],
+            queue_sizes=queue_sizes,
+            default_queue_size=self._pipeline_config.get("queue_size", 2),
+        )
+        Logger.debug(f"Running pipeline: {self._pipeline.queue_sizes}")
+        self._pipeline.run()
+
+    @staticmethod
+    def _input_configs():
+        """Get the configuration of each input stream.
+
+        Returns:
+            List of input module configurations, `blocks.input` may be
+                a single configuration or a list of them.
+        """
+        inputs = CONFIG["blocks"].get("input") or []
+        return inputs if isinstance(inputs, list) else [inputs]
+
+    @staticmethod
+    def _load_modules(package, block, class_name):
+        """Load the modules listed in a configuration block.
+
+        Args:
+            package: Package containing one subpackage per module.
+            block: Configuration block with a list of `modules`.
+            class_name: Name of the module class to instantiate.
+
+        Returns:
+            List of loaded modules.
+        """
+        modules = []
+        for module in block["modules"]:
+            module_key = list(module.keys())[-1]
+            kwargs = module[module_key]
+            kwargs["name"] = module_key
+            modules.append(
+                getattr(import_module(f"{package}.{module_key}.module"),
+                        class_name)(**kwargs))
+        return modules
+
+    def _load_output_modules(self, block):
+        """Load the output modules listed in a configuration block.
+
+        Output modules with an `async_queue` configuration are wrapped in
+        an `AsyncOutput` running them on their own worker.
+
+        Args:
+            block: Configuration block with a list of `modules`.
+
+        Returns:
+            List of loaded output modules.
+        """
+        modules = []
+        for module in block["modules"]:
+            module_key = list(module.keys())[-1]
+            kwargs = dict(module[module_key])
+            async_queue = kwargs.pop("async_queue", None)
+            output = self._load_modules(
+                f"core.devices.{self._device}.modules.output",
+                {"modules": [{
+                    module_key: kwargs
+                }]}, "Output")[0]
+            if async_queue is not None:
+                output = AsyncOutput(output, **async_queue)
+            modules.append(output)
+        return modules
+
+    @classmethod
+    def _default_slot_bytes(cls):
+        """Get the minimum size of shared memory frame slots.
+
+        Slots are sized for a float32 RGB frame of the model input shape,
+        falling back to the largest input frame size, or a 1080p frame
+        otherwise. The inference pool enlarges the slots to fit the first
+        frame, e.g. a raw frame when no resize preprocessor is configured.
+
+        Returns:
+            Slot size in bytes.
+        """
+        if CONFIG["inference"].get("input_shape"):
+            height, width = CONFIG["inference"]["input_shape"][:2]
+            return int(height) * int(width) * 3 * 4
+        frame_sizes = [
+            input_config["frame_size"] for input_config in cls._input_configs()
+            if all(input_config.get("frame_size", [None]))
+        ]
+        pixels = max((int(width) * int(height)
+                      for width, height, *_ in frame_sizes),
+                     default=1080 * 1920)
+        return pixels * 3 * 4
+
+    @property
+    def _inputs_exhausted(self):
+        """Get whether every input stream has loaded its last frame."""
+        return all(stream.exhausted for stream in self._streams.values())
+
+    def _start_inputs(self):
+        """Start the input module of every stream."""
+        for stream in self._streams.values():
+            stream.exhausted = False
+            stream.input_module.run()
+
+    def _next_frame(self):
+        """Load a frame from the next scheduled input stream.
+
+        Live inputs that are stopped while waiting for a frame mark their
+        stream as exhausted, and the next stream is scheduled instead.
+
+        Returns:
+            Dictionary of assets for the new frame, or None if every
+                input stream is exhausted.
+        """
+        while True:
+            stream = self._scheduler.next()
+            if stream is None:
+                return None
+            assets = dict(self._assets)
+            try:
+                stream.load_data(assets, namespaced=len(self._streams) > 1)
+            except EmptyFrameBufferException:
+                stream.exhausted = True
+                continue
+            return assets
+
+    def _stream(self, assets):
+        """Get the input stream a frame was loaded from.
+
+        Args:
+            assets: Dictionary of assets.
+
+        Returns:
+            Input stream of the frame.
+        """
+        return self._streams[assets["stream_id"]]
+
+    def _all_output_modules(self):
+        """Get the output modules of the engine and of every stream.
+
+        Returns:
+            List of unique output modules.
+        """
+        outputs = list(self._output_modules)
+        for stream in self._streams.values():
+            outputs.extend(output for output in stream.output_modules
+                           if output not in outputs)
+        return outputs
+
+    @timing(Timers.PERF_COUNTER)
+    def _preprocess(self, assets):
+        """Run preprocessor modules on a frame.
+
+        Args:
+            assets: Dictionary of assets.
+        """
+        for preprocessor in self._stream(assets).preprocessor_modules:
+            preprocessor.run(assets)
+
+    @timing(Timers.PERF_COUNTER)
+    def _infer(self, assets):
+        """Run inference engine on a frame.
+
+        Args:
+            assets: Dictionary of assets.
+        """
+        self._inference_engine.run(assets)
+
+    @timing(Timers.PERF_COUNTER)
+    def _infer_batch(self, assets_batch):
+        """Run inference engine on a micro-batch of frames.
+
+        Args:
+            assets_batch: List of dictionaries of assets.
+        """
+        self._inference_engine.run_batch(assets_batch)
+
+    def _dispatch(self, assets):
+        """Submit a frame to the inference worker processes.
+
+        The workers are started on the first frame, so that the shared
+        memory slots are sized for the actual input frames rather than the
+        configured model input shape.
+
+        Args:
+            assets: Dictionary of assets.
+        """
+        if not self._inference_pool.started:
+            self._inference_pool.start(assets["input_frame"])
+        assets["inference_sequence"] = self._inference_pool.submit(assets)
+
+    @timing(Timers.PERF_COUNTER)
+    def _collect(self, assets):
+        """Wait for the predictions of a frame from the inference workers.
+
+        Args:
+            assets: Dictionary of assets.
+        """
+        assets["predictions"] = self._inference_pool.collect(
+            assets.pop("inference_sequence"))
+
+    @timing(Timers.PERF_COUNTER)
+    def _postprocess(self, assets):
+        """Run postprocessor modules on a frame.
+
+        Args:
+            assets: Dictionary of assets.
+        """
+        for postprocessor in self._postprocessor_modules:
+            postprocessor.run(assets)
+
+    @timing(Timers.PERF_COUNTER)
+    def _output(self, assets):
+        """Send a frame to the output modules.
+
+        Stops the pipeline once any output module has stopped.
+
+        Args:
+            assets: Dictionary of assets.
+        """
+        for output in self._stream(assets).output_modules:
+            output.run(assets)
+        if any(output.stopped for output in self._all_output_modules()):
+            self._pipeline.stop()
+
     def _cleanup(self):
         """Clean up I/O modules."""
         Logger.debug("Cleaning up I/O modules...")
-        self._input_module.stop()
-        for output in self._output_modules:
+        if self._pipeline:
+            self._pipeline.stop()
+        if self._inference_pool:
+            self._inference_pool.stop()
+        for stream in self._streams.values():
+            stream.input_module.stop()
+        for output in self._all_output_modules():
             output.stop()
-        time.sleep(1)
@@ -15,6 +15,7 @@
 """
 
 from abc import ABC, abstractmethod
+from threading import Event, Thread, current_thread
 
 
 class AbstractInput(ABC):
@@ -23,7 +24,8 @@ class AbstractInput(ABC):
 
     def __init__(self, **kwargs):
         """Initialize abstract input class."""
-        self._stopped = False
+        self._stop_event = Event()
+        self._reader = None
         self.__dict__.update(kwargs)
 
     @abstractmethod
@@ -59,9 +61,36 @@ class AbstractInput(ABC):
     @property
     def stopped(self):
         """Get stopped status."""
-        return self._stopped
+        return self._stop_event.is_set()
 
     @stopped.setter
     def stopped(self, stopped):
         """Set stopped status."""
-        self._stopped = stopped
+        if stopped:
+            self._stop_event.set()
+        else:
+            self._stop_event.clear()
+
+    def _start_reader(self, target):
+        """Start the background thread reading frames into the module.
+
+        Args:
+            target: Reader loop, expected to return once stopped.
+        """
+        self._reader = Thread(target=target,
+                              name=f"input-{self.__class__.__module__}",
+                              daemon=True)
+        self._reader.start()
+
+    def _join_reader(self, timeout=1.0):
+        """Wait for the reader thread to exit after a stop.
+
+        Args:
+            timeout: Maximum time to wait in seconds.
+
+        Returns:
+            True if no reader thread is running anymore, False otherwise.
+        """
+        if self._reader is not None and self._reader is not current_thread():
+            self._reader.join(timeout)
+        return self._reader is None or not self._reader.is_alive()
@@ -0,0 +1,172 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   async_output.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Output module running on its own worker thread.
+"""
+
+from collections import deque
+from threading import Condition, Thread
+
+from abstract_output import AbstractOutput
+from common.exceptions import OutputModuleException
+from common.logger import Logger
+
+
+class AsyncOutput(AbstractOutput):
+
+    """Run an output module on its own worker behind a bounded queue.
+
+    The engine only enqueues the assets of each frame, so a slow sink no
+    longer stalls the capture and inference of the next frame.
+
+    Supported policies when the queue is full:
+        block: Wait for a free slot, so no frame is ever dropped.
+        drop_oldest: Drop the oldest queued frame, keeping the sink as
+            close to live as possible.
+        drop_newest: Drop the new frame, keeping the queued frames.
+
+    Frames still queued when the output is stopped are flushed to the
+    wrapped output before it is stopped.
+    """
+
+    POLICIES = ("block", "drop_oldest", "drop_newest")
+
+    def __init__(self, output, size=2, policy="block"):
+        """Initialize asynchronous output.
+
+        Args:
+            output: Output module to run on the worker.
+            size: Maximum number of queued frames.
+            policy: Policy when the queue is full, one of `POLICIES`.
+
+        Raises:
+            ValueError: If the policy is not supported.
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unsupported output queue policy {policy}, "
+                             f"must be one of {self.POLICIES}!")
+        super().__init__(name=output.name)
+        self.size = max(1, int(size))
+        self.policy = policy
+        self._output = output
+        self._frames = deque()
+        self._condition = Condition()
+        self._closed = False
+        self._error = None
+        self._submitted = 0
+        self._written = 0
+        self._dropped = 0
+        self._worker = Thread(target=self._run_worker,
+                              name=f"output-{self.name}",
+                              daemon=True)
+        self._worker.start()
+
+    @property
+    def output(self):
+        """Get the wrapped output module."""
+        return self._output
+
+    @property
+    def stopped(self):
+        """Get whether this or the wrapped output module has stopped."""
+        return self._stopped or self._output.stopped
+
+    def stats(self):
+        """Get queue statistics.
+
+        Returns:
+            Dictionary of the queue policy and size, and the number of
+                submitted, written and dropped frames.
+        """
+        with self._condition:
+            return {
+                "policy": self.policy,
+                "size": self.size,
+                "submitted": self._submitted,
+                "written": self._written,
+                "dropped": self._dropped,
+            }
+
+    def run(self, assets):
+        """Queue a frame for the wrapped output module.
+
+        Args:
+            assets: Dictionary of assets.
+
+        Raises:
+            OutputModuleException: If the wrapped output module failed
+                on an earlier frame.
+        """
+        with self._condition:
+            self._raise_error()
+            if self._closed:
+                return
+            self._submitted += 1
+            if self.policy == "block":
+                self._condition.wait_for(self._writable)
+                self._raise_error()
+                if self._closed:
+                    return
+            elif len(self._frames) >= self.size:
+                self._dropped += 1
+                if self.policy == "drop_newest":
+                    return
+                self._frames.popleft()
+            self._frames.append(assets)
+            self._condition.notify_all()
+
+    def stop(self):
+        """Flush the queued frames, then stop the wrapped output module."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._worker.join()
+        self._output.stop()
+        super().stop()
+
+    def _run_worker(self):
+        """Send queued frames to the wrapped output module."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(self._readable)
+                if not self._frames:
+                    return
+                assets = self._frames.popleft()
+                self._condition.notify_all()
+            try:
+                self._output.run(assets)
+            except Exception as exc:  # pylint: disable=broad-except
+                Logger.error(f"Output module '{self.name}' failed: {exc}")
+                with self._condition:
+                    self._error = exc
+                    self._frames.clear()
+                    self._closed = True
+                    self._condition.notify_all()
+                return
+            with self._condition:
+                self._written += 1
+
+    def _raise_error(self):
+        """Raise the failure of the wrapped output module, if any."""
+        if self._error is not None:
+            raise OutputModuleException(
+                f"Output module '{self.name}' failed: {self._error}"
+            ) from self._error
+
+    def _readable(self):
+        """Check whether the worker can stop waiting."""
+        return bool(self._frames) or self._closed
+
+    def _writable(self):
+        """Check whether a blocked producer can stop waiting."""
+        return len(self._frames) < self.size or self._closed
@@ -0,0 +1,194 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   folder_input.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Image folder input shared by all devices.
+"""
+
+import glob
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+from abstract_input import AbstractInput
+from common.exceptions import InvalidInputException, InvalidInputPathException
+from common.logger import Logger
+
+IMAGE_EXTENSIONS = (".bmp", ".jpeg", ".jpg", ".png", ".tif", ".tiff", ".webp")
+REDUCED_READ_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+
+class FolderInput(AbstractInput):
+
+    """Image folder input decoding images in parallel and in order.
+
+    Images are listed once from glob patterns, folders or files, and are
+    decoded by a thread pool a few images ahead of the engine. Images that
+    cannot be decoded are skipped, and the total frame count is reduced
+    accordingly, so that outputs waiting for the last frame still finish.
+    """
+
+    def __init__(self, **kwargs):
+        """Initialize image folder input class.
+
+        Raises:
+            InvalidInputException: If the reduction factor is unsupported.
+            InvalidInputPathException: If no image can be found.
+        """
+        self.image_paths = []
+        self.frame_size = [None, None]
+        self.workers = 4
+        self.prefetch = 8
+        self.reduce = 1
+        super().__init__(**kwargs)
+        if self.reduce not in REDUCED_READ_FLAGS:
+            raise InvalidInputException(
+                f"Unsupported reduction factor {self.reduce}, must be one of"
+                f" {list(REDUCED_READ_FLAGS)}!")
+        self._paths = self._list_images(self.image_paths)
+        if not self._paths:
+            raise InvalidInputPathException(
+                f"No images found in {self.image_paths}!")
+        self._total_frame_count = len(self._paths)
+        self._next_index = 0
+        self._pending = deque()
+        self._next_image = None
+        self._executor = None
+
+    def run(self):
+        """Start decoding the first images in the background."""
+        Logger.debug(f"Found {len(self._paths)} image(s)!")
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, int(self.workers)),
+            thread_name_prefix="input-folder")
+        for _ in range(max(1, int(self.prefetch))):
+            self._submit_next()
+        return self
+
+    def load_data(self, assets):
+        """Load input data.
+
+        Blocks until the next image in order has been decoded, and queues
+        the decoding of further images. Images that cannot be decoded are
+        skipped.
+
+        Args:
+            assets: Dictionary of assets.
+
+        Raises:
+            InvalidInputPathException: If no image can be decoded.
+        """
+        path, frame = self._next_image or self._take_image()
+        if frame is None:
+            self.stop()
+            raise InvalidInputPathException("Could not decode any image!")
+        # Look one image ahead to know whether this is the last image
+        self._next_image = self._take_image()
+        if self._next_image[1] is None:
+            self.stop()
+
+        assets["frame_id"] = path
+        assets["orig_frame"] = frame
+        assets["orig_shape"] = assets["orig_frame"].shape
+        assets["input_frame"] = assets["orig_frame"].copy()
+        assets["total_frame_count"] = self._total_frame_count
+        self.frame_size = frame.shape
+        return assets
+
+    def stop(self):
+        """Stop image folder input."""
+        self.stopped = True
+        if self._executor:
+            for _, future in self._pending:
+                future.cancel()
+            self._executor.shutdown(wait=False)
+
+    @staticmethod
+    def _list_images(image_paths):
+        """List the image files matching glob patterns, folders or files.
+
+        Args:
+            image_paths: Glob pattern, folder or file path,
+                or a list of them.
+
+        Returns:
+            List of unique image file paths, in the order of the patterns
+                and sorted by name within each pattern.
+        """
+        if isinstance(image_paths, str):
+            image_paths = [image_paths]
+        paths = []
+        for pattern in image_paths:
+            pattern = os.path.expanduser(str(pattern))
+            if os.path.isdir(pattern):
+                matches = [
+                    os.path.join(pattern, name)
+                    for name in os.listdir(pattern)
+                    if name.lower().endswith(IMAGE_EXTENSIONS)
+                ]
+            elif glob.has_magic(pattern):
+                matches = [
+                    path for path in glob.glob(pattern, recursive=True)
+                    if os.path.isfile(path)
+                ]
+            else:
+                matches = [pattern]
+            paths.extend(sorted(matches))
+        return list(dict.fromkeys(paths))
+
+    def _take_image(self):
+        """Wait for the next decodable image in order.
+
+        Returns:
+            Tuple of (path, frame), where frame is None
+                if no decodable image is left.
+        """
+        while self._pending:
+            path, future = self._pending.popleft()
+            self._submit_next()
+            frame = future.result()
+            if frame is not None:
+                return path, frame
+            Logger.warning(f"Could not decode image {path}, skipping...")
+            self._total_frame_count -= 1
+        return None, None
+
+    def _submit_next(self):
+        """Queue the decoding of the next image, if any is left."""
+        if self.stopped or self._next_index >= len(self._paths):
+            return
+        path = self._paths[self._next_index]
+        self._pending.append((path, self._executor.submit(self._decode, path)))
+        self._next_index += 1
+
+    def _decode(self, path):
+        """Decode an image into an RGB frame.
+
+        OpenCV releases the GIL while decoding,
+        so several images are decoded in parallel.
+
+        Args:
+            path: Path of the image.
+
+        Returns:
+            RGB frame, or None if the image cannot be decoded.
+        """
+        frame = cv2.imread(path, REDUCED_READ_FLAGS[self.reduce])
+        if frame is None:
+            return None
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
@@ -31,21 +31,24 @@ class Engine(AbstractEngine):
         Raises:
             JetsonEngineException: If engine fails to run.
         """
-        if not self._inference_engine or not self._input_module:
+        if not self._inference_engine or not self._streams:
             raise JetsonEngineException(
-                "Inference engine and input module must be initialized!")
+                "Inference engine and input module(s) must be initialized!")
 
-        # Process input from input module
-        self._input_module.run()
+        # Process input from input module(s)
+        self._start_inputs()
         try:
-            while True:
-                self._loop()
+            if self.pipelined:
+                self._run_pipeline()
+            else:
+                while True:
+                    self._loop()
 
-                if self._input_module.stopped:
-                    break
-                for output in self._output_modules:
-                    if output.stopped:
+                    if self._inputs_exhausted:
                         break
+                    for output in self._output_modules:
+                        if output.stopped:
+                            break
         except (SystemExit, KeyboardInterrupt):
             Logger.warning("Keyboard interrupt detected!")
             Logger.info("Stopping Datature Edge...")
@@ -57,20 +60,23 @@ class Engine(AbstractEngine):
     @timing(Timers.PERF_COUNTER)
     def _loop(self):
         """Jetson engine loop."""
-        # Get input from input module
-        self._input_module.load_data(self._assets)
+        # Get input from the next scheduled input stream
+        assets = self._next_frame()
+        if assets is None:
+            return
+        stream = self._stream(assets)
 
-        # Get preprocessed input from preprocessors modules
-        for preprocessor in self._preprocessor_modules:
-            preprocessor.run(self._assets)
+        # Get preprocessed input from the stream preprocessors modules
+        for preprocessor in stream.preprocessor_modules:
+            preprocessor.run(assets)
 
         # Get predictions from inference engine
-        self._inference_engine.run(self._assets)
+        self._inference_engine.run(assets)
 
         # Get postprocessed predictions from postprocessors modules
         for postprocessor in self._postprocessor_modules:
-            postprocessor.run(self._assets)
+            postprocessor.run(assets)
 
-        # Send output to output modules
-        for output in self._output_modules:
-            output.run(self._assets)
+        # Send output to the stream output modules
+        for output in stream.output_modules:
+            output.run(assets)
@@ -0,0 +1,19 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   __init__.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Package for Jetson image folder input.
+"""
+
+from .module import Input as JetsonFolderInput
+
+__all__ = ["JetsonFolderInput"]
@@ -15,13 +15,16 @@
 """
 
 import time
-from threading import Thread
 
 import cv2
 from abstract_input import AbstractInput
 from common.constants import timestamp
-from common.exceptions import InvalidInputException
+from common.exceptions import (
+    EmptyFrameBufferException,
+    InvalidInputException,
+)
 from common.logger import Logger
+from common.utils import FrameBuffer
 
 
 class Input(AbstractInput):
@@ -38,11 +41,13 @@ class Input(AbstractInput):
         self.device = None
         self.frame_size = [None, None]
         self.max_buffer = -1
+        self.buffer_policy = "latest"
+        self.every_nth = 1
         super().__init__(**kwargs)
-        self._frame = None
-        self._frame_id = None
-        self._cwnd = self.max_buffer if self.max_buffer > 0 else 100
-        self._frame_buffer = 0
+        self._buffer = FrameBuffer(
+            self.buffer_policy,
+            capacity=self.max_buffer if self.max_buffer > 0 else 8,
+            nth=self.every_nth)
 
         Logger.debug("Warming up camera...")
         self._stream = cv2.VideoCapture(self.device)
@@ -55,43 +60,38 @@ class Input(AbstractInput):
 
     def run(self):
         """Start the thread to read frames from the video stream."""
-        Thread(target=self.update, args=(), daemon=True).start()
+        self._start_reader(self.update)
         return self
 
     def update(self):
         """Continuously grab frames from the stream."""
         Logger.debug("Grabbing frames...")
-        while True:
-            if self.stopped:
-                return
-
+        while not self.stopped:
             (grabbed, frame) = self._stream.read()
             if not grabbed:
                 Logger.warning("No frame grabbed!")
-                time.sleep(1)
+                self._stop_event.wait(1)
                 continue
 
-            # AIMD algorithm for congestion control
-            self._frame_buffer += 1
-            if self._frame_buffer < self._cwnd:
-                self._frame_id = timestamp()
-                self._frame = frame
-                self._cwnd = self._cwnd + 1 / self._cwnd
-                self._frame_buffer -= 1
-            else:
-                Logger.debug("Throttling frames...")
-                self._cwnd //= 2
+            # Never blocks, stale frames are dropped by the buffer policy
+            self._buffer.put((timestamp(), frame))
 
     def load_data(self, assets):
         """Load input data.
 
+        Blocks until the capture thread provides a new frame.
+
         Args:
             assets: Dictionary of assets.
+
+        Raises:
+            EmptyFrameBufferException: If the input was stopped, as the
+                frame buffer is then closed.
         """
-        while self._frame is None:
-            time.sleep(0.1)
-        assets["frame_id"] = self._frame_id
-        assets["orig_frame"] = self._frame
+        frame = self._buffer.get()
+        if frame is None:
+            raise EmptyFrameBufferException("Camera input was stopped!")
+        assets["frame_id"], assets["orig_frame"] = frame
         assets["orig_shape"] = assets["orig_frame"].shape
         assets["input_frame"] = assets["orig_frame"].copy()
 
@@ -99,5 +99,8 @@ class Input(AbstractInput):
         """Stop the frame reading thread."""
         Logger.debug("Releasing camera resources...")
         self.stopped = True
-        time.sleep(1)
+        self._buffer.close()
+        Logger.debug(f"Dropped {self._buffer.dropped} stale frame(s).")
+        # A pending read returns within one frame interval
+        self._join_reader()
         self._stream.release()
@@ -14,16 +14,18 @@
 @Desc    :   Module for Jetson active learning output.
 """
 
-import csv
-import time
-import traceback
-from threading import Thread
-
 import cv2
-import datature
 from abstract_output import AbstractOutput
+from common.config import CONFIG
 from common.exceptions import InvalidOutputPathException
 from common.logger import Logger
+from common.utils import BOX_COLUMNS
+from core.components.active_learning import (
+    DatatureClient,
+    FrameSelector,
+    UploadSpool,
+    Uploader,
+)
 
 
 class Output(AbstractOutput):
@@ -31,117 +33,93 @@ class Output(AbstractOutput):
     """Jetson active learning output class."""
 
     def __init__(self, **kwargs):
-        """Initialise Jetson active learning output class."""
+        """Initialise Jetson active learning output class.
+
+        Raises:
+            InvalidOutputPathException: If the spool folder cannot be
+                created.
+            ValueError: If the selection strategy is not supported.
+        """
         self.secret_key = ""
         self.frame_interval = 10
         self.upload_interval = 10
         self.asset_folder = ""
-        self.prediction_folder = ""
+        self.spool_folder = None
+        self.upload_concurrency = 1
+        self.upload_rate_limit = None
+        self.max_backoff = 300
+        self.selection = None
         self._asset_groups = []
-        self._frame_count = 0
-        self._asset_buffer = []
-        self._is_uploading = False
-        self._upload_count = 0
         super().__init__(**kwargs)
-        datature.secret_key = self.secret_key
-        self._upload_session = datature.Asset.upload_session()
+        self._selector = FrameSelector(
+            **{
+                "frame_interval": self.frame_interval,
+                "threshold": CONFIG["inference"].get("threshold", 0.0),
+                **(self.selection or {}),
+            })
+        try:
+            self._spool = UploadSpool(self.spool_folder or self.asset_folder,
+                                      self.upload_interval)
+        except OSError as exc:
+            raise InvalidOutputPathException(exc) from exc
+        self._uploader = Uploader(
+            self._spool,
+            DatatureClient(self.secret_key),
+            groups=self._asset_groups,
+            concurrency=self.upload_concurrency,
+            rate_limit=(self.upload_rate_limit * 1024
+                        if self.upload_rate_limit else None),
+            max_backoff=self.max_backoff,
+        ).start()
 
     def run(self, assets):
         """Run Jetson active learning output.
 
+        Frames picked by the frame selector are written to the upload
+        spool, and uploaded in the background by the uploader.
+
         Args:
             assets: Dictionary of assets.
+
+        Raises:
+            InvalidOutputPathException: If the frame cannot be written to
+                the spool folder.
         """
-        if self._is_uploading or assets["predictions"] == []:
-            return
-        if self._frame_count % self.frame_interval == 0:
-            self._asset_buffer.append(
-                (assets["frame_id"], assets["orig_frame"],
-                 assets["predictions"]))
-        if len(self._asset_buffer) == self.upload_interval:
-            Thread(target=self._upload_assets,
-                   args=(self._upload_count, assets["category_index"],
-                         self._asset_buffer, self._frame_count),
-                   daemon=True).start()
-            self._asset_buffer = []
-        self._frame_count += 1
-
-    def _upload_assets(self, upload_count, category_index, asset_buffer,
-                       frame_count):
-        """Upload assets to Nexus using Datature SDK.
+        if self._selector.select(assets["predictions"]):
+            self._spool_frame(assets)
 
-        Args:
-            upload_count: Counter for total number of uploads performed.
-            category_index: Dictionary of label classes.
-            asset_buffer: List of assets to be uploaded, assets are in
-                the form of a tuple of (frame_id, frame, predictions).
-            frame_count: Counter for total number of frames processed.
+    def stop(self):
+        """Seal the open batch and stop the uploader.
+
+        Batches that are not uploaded yet stay in the spool folder, and
+        are uploaded the next time the output module starts.
         """
-        self._is_uploading = True
-        Logger.info(f"[Upload #{upload_count}] Starting upload...")
-        start = time.time()
-        self._write_assets_to_file(category_index, asset_buffer, frame_count)
+        self._spool.seal()
+        self._uploader.stop()
+        Logger.info(f"Active learning selection: {self._selector.stats()}")
+        super().stop()
 
-        try:
-            Logger.info(f"[Upload #{upload_count}] Uploading images...")
-            op_link = self._upload_session.start(groups=self._asset_groups,
-                                                 background=True)["op_link"]
-            while datature.Operation.retrieve(op_link)["status"]["progress"][
-                    "with_status"]["finished"] < len(asset_buffer):
-                time.sleep(1)
-
-            Logger.info(f"[Upload #{upload_count}] Uploading predictions...")
-            op_link = datature.Annotation.upload(
-                "csv_fourcorner",
-                f"{self.prediction_folder}/preds_{frame_count}.csv",
-                background=True)["op_link"]
-            while datature.Operation.retrieve(op_link)["status"]["progress"][
-                    "with_status"]["finished"] == 0:
-                time.sleep(1)
-        except Exception as exc:  # pylint: disable=broad-except
-            Logger.warning(f"[Upload #{upload_count}] Upload failed: {exc}")
-            Logger.debug(f"\n{traceback.format_exc()}")
-            return
-
-        end = time.time()
-        Logger.info(
-            f"[Upload #{upload_count}] Upload finished! Took {end - start}s")
-        self._upload_count += 1
-        self._is_uploading = False
-
-    def _write_assets_to_file(self, category_index, asset_buffer, frame_count):
-        """Save images as jpg and predictions as csv.
+    def _spool_frame(self, assets):
+        """Write a frame and its predictions to the upload spool.
 
         Args:
-            category_index: Dictionary of label classes.
-            asset_buffer: List of assets to be uploaded, assets are in
-                the form of a tuple of (frame_id, frame, predictions).
-            frame_count: Counter for total number of frames processed.
+            assets: Dictionary of assets.
 
         Raises:
-            InvalidOutputPathException: If output path(s) to save
-                images and predictions are invalid.
+            InvalidOutputPathException: If the frame cannot be written to
+                the spool folder.
         """
-        file_name = f"{self.prediction_folder}/preds_{frame_count}.csv"
-
+        prediction = assets["predictions"]
+        category_index = assets["category_index"]
+        boxes = prediction.to_format(BOX_COLUMNS).boxes
+        rows = [[
+            xmin, ymin, xmax, ymax,
+            str(category_index[each_class]["name"])
+        ] for (xmin, ymin, xmax, ymax), each_class in zip(
+            boxes.astype(str).tolist(), prediction.classes.tolist())]
         try:
-            with open(file_name, 'w', encoding="utf-8") as f:
-                writer = csv.writer(f)
-                header = ["filename", "xmin", "ymin", "xmax", "ymax", "label"]
-                writer.writerow(header)
-                for img_id, image, prediction in asset_buffer:
-                    image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-                    cv2.imwrite(f"{self.asset_folder}/{img_id}.jpg", image)
-                    self._upload_session.add(
-                        f"{self.asset_folder}/{img_id}.jpg")
-                    for each_bbox, each_class, _ in zip(
-                            prediction["boxes"], prediction["classes"],
-                            prediction["scores"]):
-                        label = str(category_index[int(each_class)]["name"])
-                        row = [
-                            f"{img_id}.jpg", each_bbox[1], each_bbox[0],
-                            each_bbox[3], each_bbox[2], label
-                        ]
-                        writer.writerow(row)
-        except Exception as exc:
+            self._spool.add(
+                assets["frame_id"],
+                cv2.cvtColor(assets["orig_frame"], cv2.COLOR_RGB2BGR), rows)
+        except OSError as exc:
             raise InvalidOutputPathException(exc) from exc
@@ -18,6 +18,7 @@ import cv2
 from abstract_output import AbstractOutput
 from common.exceptions import InvalidOutputPathException, InvalidOutputTypeException
 from common.logger import Logger
+from common.utils import VideoEncoder
 
 
 class Output(AbstractOutput):
@@ -31,18 +32,15 @@ class Output(AbstractOutput):
         self.window_name = ""
         self.frame_size = [-1, -1]
         self.fps = 30
-        self._video_frames = []
+        self.codec = "mp4v"
+        self.quality = None
+        self.segment_duration = None
+        self.segment_size = None
+        self.encoder_slots = 4
         super().__init__(**kwargs)
-
-        if self.type == "video_save":
-            self._frame_count = 0
-            self._total_frame_count = 0
-            self._video_writer = cv2.VideoWriter(
-                self.output_path,
-                cv2.VideoWriter_fourcc(*"mp4v"),
-                self.fps,
-                tuple(self.frame_size),
-            )
+        self._encoder = None
+        self._frame_count = 0
+        self._total_frame_count = 0
 
     def run(self, assets):
         """Run Jetson OpenCV output module.
@@ -61,7 +59,7 @@ class Output(AbstractOutput):
         elif self.type == "video_show":
             self._video_show(frame)
         elif self.type == "video_save":
-            self._total_frame_count = assets["total_frame_count"]
+            self._total_frame_count = assets.get("total_frame_count", 0)
             self._video_save(frame, assets["frame_id"])
         else:
             raise InvalidOutputTypeException("Unsupported output type!")
@@ -107,17 +105,46 @@ class Output(AbstractOutput):
     def _video_save(self, frame, frame_id):
         """Save video to disk.
 
+        Frames are encoded by a background process, which is started on
+        the first frame. The video is finalised once the last frame of the
+        input is written, or when the output module is stopped.
+
         Args:
             frame: Frame to be saved.
+            frame_id: ID of the frame.
         """
         if not hasattr(self, "output_path"):
             raise InvalidOutputPathException("No output path provided!")
+        if self.stopped:
+            return
+        if self._encoder is None:
+            frame_size = (self.frame_size if min(self.frame_size) > 0 else
+                          frame.shape[1::-1])
+            self._encoder = VideoEncoder(
+                self.output_path,
+                self.fps,
+                frame_size,
+                codec=self.codec,
+                quality=self.quality,
+                segment_duration=self.segment_duration,
+                segment_bytes=self.segment_size and self.segment_size * 2**20,
+                slots=self.encoder_slots,
+            ).start()
+        width, height = self._encoder.frame_size
+        if frame.shape[:2] != (height, width):
+            frame = cv2.resize(frame, (width, height))
         Logger.debug(
             f"Adding output frame {frame_id} to {self.output_path}...")
-        self._video_writer.write(frame)
+        self._encoder.write(frame)
         self._frame_count += 1
 
         if self._frame_count == self._total_frame_count:
-            Logger.info(f"Saving output video {self.output_path}...")
-            self._video_writer.release()
             self.stop()
+
+    def stop(self):
+        """Stop output module, finalising the saved video."""
+        if self._encoder is not None:
+            encoder, self._encoder = self._encoder, None
+            Logger.info(f"Saving output video {self.output_path}...")
+            encoder.stop()
+        super().stop()
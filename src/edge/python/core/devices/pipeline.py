@@ -0,0 +1,202 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   pipeline.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Pipelined multi-threaded execution of engine stages.
+"""
+
+import queue
+from threading import Event, Thread
+
+from common.logger import Logger
+
+# Timeout (in seconds) used by blocking queue operations so that workers
+# can notice a pipeline stop. Items are still handed over immediately.
+_POLL_TIMEOUT = 0.1
+
+
+class Pipeline:
+
+    """Run engine stages on separate worker threads.
+
+    The first stage is a source that produces one dictionary of assets per
+    frame, every following stage consumes the assets of the previous stage
+    through a bounded FIFO queue. Since each stage runs on exactly one worker,
+    frames leave the pipeline in the order they entered it.
+    """
+
+    def __init__(self, source, stages, queue_sizes=None, default_queue_size=2):
+        """Initialize pipeline.
+
+        Args:
+            source: Callable returning the assets of the next frame,
+                or None once the input is exhausted.
+            stages: List of (name, callable) tuples, each callable
+                processes the assets of a single frame in place. A stage
+                may be given as (name, callable, batcher) instead, in which
+                case the callable processes a list of assets gathered by
+                the `MicroBatcher`.
+            queue_sizes: Dictionary mapping a stage name to the
+                depth of the queue feeding that stage.
+            default_queue_size: Queue depth for stages not
+                listed in `queue_sizes`.
+        """
+        queue_sizes = queue_sizes or {}
+        self._source = source
+        self._stages = stages
+        self._queues = [
+            queue.Queue(
+                maxsize=max(1, int(queue_sizes.get(name,
+                                                   default_queue_size))))
+            for name, *_ in stages
+        ]
+        self._stop_event = Event()
+        self._workers = []
+        self._error = None
+
+    def run(self):
+        """Start all stage workers and block until the pipeline drains.
+
+        Raises:
+            Exception: The first exception raised by any stage,
+                re-raised on the calling thread.
+        """
+        self._workers = [
+            Thread(target=self._source_worker,
+                   name="pipeline-input",
+                   daemon=True)
+        ]
+        for index, (name, func, *batcher) in enumerate(self._stages):
+            self._workers.append(
+                Thread(target=self._stage_worker,
+                       args=(index, func, *batcher),
+                       name=f"pipeline-{name}",
+                       daemon=True))
+        for worker in self._workers:
+            worker.start()
+        for worker in self._workers[1:]:
+            worker.join()
+        # The source may still be blocked waiting on the input module if the
+        # pipeline was stopped early, it is released when the input stops.
+        self._workers[0].join(_POLL_TIMEOUT if self.stopped else None)
+
+        if self._error is not None:
+            raise self._error[1]
+
+    def stop(self):
+        """Stop all stage workers without waiting for queued frames."""
+        self._stop_event.set()
+
+    @property
+    def stopped(self):
+        """Get pipeline stopped status."""
+        return self._stop_event.is_set()
+
+    @property
+    def queue_sizes(self):
+        """Get the depth of the queue feeding each stage."""
+        return {
+            name: stage_queue.maxsize
+            for (name, *_), stage_queue in zip(self._stages, self._queues)
+        }
+
+    def _source_worker(self):
+        """Pull frames from the source into the first queue."""
+        try:
+            while not self.stopped:
+                assets = self._source()
+                if assets is None:
+                    break
+                if not self._put(0, assets):
+                    return
+        except Exception as exc:  # pylint: disable=broad-except
+            self._fail("input", exc)
+            return
+        self._put(0, None)
+
+    def _stage_worker(self, index, func, batcher=None):
+        """Process frames of one stage and forward them to the next queue.
+
+        Args:
+            index: Position of the stage in the pipeline.
+            func: Stage callable.
+            batcher: Optional micro-batcher, if given `func` is called
+                once per gathered batch of frames.
+        """
+        name = self._stages[index][0]
+        ended = False
+        while not ended:
+            assets = self._get(index)
+            if assets is None or self.stopped:
+                break
+            if batcher is None:
+                batch = [assets]
+            else:
+                batch, ended = batcher.gather(
+                    assets, lambda timeout: self._queues[index].get(
+                        timeout=timeout))
+            try:
+                func(batch if batcher else assets)
+            except Exception as exc:  # pylint: disable=broad-except
+                self._fail(name, exc)
+                return
+            if index + 1 < len(self._queues) and not all(
+                    self._put(index + 1, item) for item in batch):
+                return
+        if index + 1 < len(self._queues):
+            self._put(index + 1, None)
+
+    def _put(self, index, item):
+        """Put an item on a stage queue, giving up if the pipeline stops.
+
+        Args:
+            index: Index of the destination queue.
+            item: Assets to forward, or None to signal end of stream.
+
+        Returns:
+            True if the item was queued, False if the pipeline stopped.
+        """
+        while True:
+            try:
+                self._queues[index].put(item, timeout=_POLL_TIMEOUT)
+                return True
+            except queue.Full:
+                if self.stopped:
+                    return False
+
+    def _get(self, index):
+        """Get the next item from a stage queue.
+
+        Args:
+            index: Index of the source queue.
+
+        Returns:
+            Assets of the next frame, or None at end of stream or on stop.
+        """
+        while True:
+            try:
+                return self._queues[index].get(timeout=_POLL_TIMEOUT)
+            except queue.Empty:
+                if self.stopped:
+                    return None
+
+    def _fail(self, name, exc):
+        """Record the first stage failure and stop the pipeline.
+
+        Args:
+            name: Name of the failing stage.
+            exc: Exception raised by the stage.
+        """
+        Logger.error(f"Pipeline stage '{name}' failed: {exc}")
+        if self._error is None:
+            self._error = (name, exc)
+        self.stop()
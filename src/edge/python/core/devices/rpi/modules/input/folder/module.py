@@ -0,0 +1,22 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   module.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Module for Raspberry Pi image folder input.
+"""
+
+from folder_input import FolderInput
+
+
+class Input(FolderInput):
+
+    """Raspberry Pi image folder input class."""
@@ -14,14 +14,15 @@
 @Desc    :   Module for Raspberry Pi video input.
 """
 
-import time
-from threading import Thread
-
 import cv2
-import numpy as np
 from abstract_input import AbstractInput
-from common.exceptions import InvalidInputPathException
+from common.exceptions import (
+    EmptyFrameBufferException,
+    InvalidConfigException,
+    InvalidInputPathException,
+)
 from common.logger import Logger
+from common.utils import FrameBuffer
 
 
 class Input(AbstractInput):
@@ -29,65 +30,150 @@ class Input(AbstractInput):
     """Raspberry Pi video input class."""
 
     def __init__(self, **kwargs):
-        """Initialize Raspberry Pi video input class."""
+        """Initialize Raspberry Pi video input class.
+
+        Raises:
+            InvalidInputPathException: If the video cannot be opened.
+            InvalidConfigException: If the time range of the video
+                contains no frames.
+        """
         self.frame_size = [None, None]
         self.video_path = ""
+        self.max_buffer = 32
+        self.stride = 1
+        self.start_time = None
+        self.end_time = None
+        self.target_fps = None
         super().__init__(**kwargs)
-        self._frames = []
-        self._frame_ids = []
-        self._frame = None
+        # The decoder blocks while the buffer is full, so memory use is
+        # bounded by `max_buffer` frames regardless of the video length
+        self._buffer = FrameBuffer("fifo", capacity=self.max_buffer)
+        self._next_frame = None
         self._frame_index = 0
 
         self._video = cv2.VideoCapture(self.video_path)
         if not self._video.isOpened():
             raise InvalidInputPathException("Could not open video stream!")
-        self._total_frame_count = int(self._video.get(
-            cv2.CAP_PROP_FRAME_COUNT))
+        self._select_frames()
 
     def run(self):
         """Start the thread to read frames from the video file."""
-        Thread(target=self.update, args=(), daemon=True).start()
+        self._start_reader(self.update)
         return self
 
     def update(self):
-        """Continuously grab frames from the video file."""
+        """Continuously grab frames from the video file.
+
+        Frames skipped by the stride are only grabbed, without being
+        retrieved, so that they are never colour converted or copied.
+        """
         Logger.debug("Grabbing frames...")
 
-        count = 0
-        ret = True
+        if self._start_frame:
+            self._video.set(cv2.CAP_PROP_POS_FRAMES, self._start_frame)
+        index = self._start_frame
+
+        while not self.stopped and (self._end_frame is None
+                                    or index < self._end_frame):
+            if (index - self._start_frame) % self._stride:
+                if not self._video.grab():
+                    break
+                index += 1
+                continue
 
-        while True:
             (ret, frame) = self._video.read()
             if not ret:
-                return
+                break
             frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-            self._frame_ids.append(f"{self.video_path}_{count}")
-            self._frames.append(np.array(frame))
             self.frame_size = frame.shape
 
-            count += 1
+            # Frame IDs keep the position of the frame in the video file
+            if not self._buffer.put((f"{self.video_path}_{index}", frame),
+                                    block=True):
+                break
+            index += 1
+
+        self._buffer.close()
 
     def load_data(self, assets):
         """Load input data.
 
+        Blocks until the reader thread has decoded the next frame, and
+        stops the input once the last frame has been loaded.
+
         Args:
             assets: Dictionary of assets.
+
+        Raises:
+            EmptyFrameBufferException: If the reader finished without
+                decoding any frame, e.g. when the container reports more
+                frames than it holds.
         """
-        if self._frame_index == self._total_frame_count - 1:
+        frame = self._next_frame or self._buffer.get()
+        if frame is None:
             self.stop()
-        while len(self._frames) < self._frame_index + 1:
-            time.sleep(0.1)
+            raise EmptyFrameBufferException(
+                "No video frame could be decoded in the selected range!")
+        # Look one frame ahead to know whether this is the last frame
+        self._next_frame = self._buffer.get()
+        self._frame_index += 1
+        if self._next_frame is None:
+            # The container may report a different number of frames
+            self._total_frame_count = self._frame_index
 
-        assets["frame_id"] = self._frame_ids[self._frame_index]
-        assets["orig_frame"] = self._frames[self._frame_index]
+        assets["frame_id"], assets["orig_frame"] = frame
         assets["orig_shape"] = assets["orig_frame"].shape
         assets["input_frame"] = assets["orig_frame"].copy()
         assets["total_frame_count"] = self._total_frame_count
 
-        self._frame_index += 1
+        if self._next_frame is None:
+            self.stop()
         return assets
 
+    def _select_frames(self):
+        """Compute the range and stride of the frames to decode.
+
+        Times are converted to frame positions with the frame rate of
+        the video, and `target_fps` raises the stride so that at most
+        `target_fps` frames are decoded per second of video.
+
+        Raises:
+            InvalidConfigException: If the range contains no frames.
+        """
+        fps = self._video.get(cv2.CAP_PROP_FPS) or 0
+        frame_count = int(self._video.get(cv2.CAP_PROP_FRAME_COUNT))
+
+        self._stride = max(1, int(self.stride))
+        if self.target_fps and fps > self.target_fps:
+            self._stride = max(self._stride, round(fps / self.target_fps))
+
+        self._start_frame = 0
+        self._end_frame = frame_count if frame_count > 0 else None
+        if fps:
+            if self.start_time:
+                self._start_frame = int(round(self.start_time * fps))
+            if self.end_time is not None:
+                end_frame = int(round(self.end_time * fps))
+                self._end_frame = min(end_frame, self._end_frame
+                                      or end_frame)
+        elif self.start_time or self.end_time is not None:
+            Logger.warning("Unknown video frame rate, ignoring time range!")
+
+        if (self._end_frame is not None
+                and self._start_frame >= self._end_frame):
+            self._video.release()
+            raise InvalidConfigException(
+                f"No frames of {self.video_path} between start_time "
+                f"{self.start_time} and end_time {self.end_time}!")
+
+        self._total_frame_count = len(
+            range(self._start_frame, self._end_frame,
+                  self._stride)) if self._end_frame else 0
+
     def stop(self):
-        """Stop Raspberry Pi image input."""
+        """Stop Raspberry Pi video input."""
         self.stopped = True
+        # Unblock the reader if it is waiting for a free buffer slot
+        self._buffer.close()
+        if self._join_reader():
+            self._video.release()
@@ -16,12 +16,15 @@
 
 import sys
 import time
-from threading import Thread
 
 from abstract_input import AbstractInput
 from common.constants import timestamp
-from common.exceptions import InvalidInputException
+from common.exceptions import (
+    EmptyFrameBufferException,
+    InvalidInputException,
+)
 from common.logger import Logger
+from common.utils import FrameBuffer
 
 try:
     from picamera import PiCamera
@@ -46,11 +49,13 @@ class Input(AbstractInput):
         self.frame_size = [None, None]
         self.fps = None
         self.max_buffer = -1
+        self.buffer_policy = "latest"
+        self.every_nth = 1
         super().__init__(**kwargs)
-        self._frame = None
-        self._frame_id = None
-        self._cwnd = self.max_buffer if self.max_buffer > 0 else 100
-        self._frame_buffer = 0
+        self._buffer = FrameBuffer(
+            self.buffer_policy,
+            capacity=self.max_buffer if self.max_buffer > 0 else 8,
+            nth=self.every_nth)
 
         # Initialize the camera and stream
         Logger.debug("Warming up camera...")
@@ -67,7 +72,7 @@ class Input(AbstractInput):
 
     def run(self):
         """Start the thread to read frames from the video stream."""
-        Thread(target=self.update, args=(), daemon=True).start()
+        self._start_reader(self.update)
         return self
 
     def update(self):
@@ -83,19 +88,11 @@ class Input(AbstractInput):
 
                 if frame.array is None:
                     Logger.warning("No frame grabbed!")
-                    time.sleep(1)
+                    self._stop_event.wait(1)
                     continue
 
-                # AIMD algorithm for congestion control
-                self._frame_buffer += 1
-                if self._frame_buffer < self._cwnd:
-                    self._frame_id = timestamp()
-                    self._frame = frame.array
-                    self._cwnd = self._cwnd + 1 / self._cwnd
-                    self._frame_buffer -= 1
-                else:
-                    Logger.debug("Throttling frames...")
-                    self._cwnd //= 2
+                # Never blocks, stale frames are dropped by the buffer policy
+                self._buffer.put((timestamp(), frame.array))
                 self._raw_capture.truncate(0)
                 self._raw_capture.seek(0)
         except Exception as exc:
@@ -104,13 +101,19 @@ class Input(AbstractInput):
     def load_data(self, assets):
         """Load input data.
 
+        Blocks until the capture thread provides a new frame.
+
         Args:
             assets: Dictionary of assets.
+
+        Raises:
+            EmptyFrameBufferException: If the input was stopped, as the
+                frame buffer is then closed.
         """
-        while self._frame is None:
-            time.sleep(0.1)
-        assets["frame_id"] = self._frame_id
-        assets["orig_frame"] = self._frame
+        frame = self._buffer.get()
+        if frame is None:
+            raise EmptyFrameBufferException("Camera input was stopped!")
+        assets["frame_id"], assets["orig_frame"] = frame
         assets["orig_shape"] = assets["orig_frame"].shape
         assets["input_frame"] = assets["orig_frame"].copy()
 
@@ -118,6 +121,9 @@ class Input(AbstractInput):
         """Stop the frame reading thread."""
         Logger.debug("Cleaning up camera resources...")
         self.stopped = True
-        time.sleep(1)
+        self._buffer.close()
+        Logger.debug(f"Dropped {self._buffer.dropped} stale frame(s).")
+        # The capture loop checks the stop status after every frame
+        self._join_reader()
         self._raw_capture.close()
         self._camera.close()
@@ -0,0 +1,101 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   stream.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Input streams sharing one inference engine.
+"""
+
+
+class Stream:
+
+    """Input module with its own preprocessors and output routing.
+
+    Several streams can share one engine, and thus one loaded model.
+    Preprocessor and output modules are held by reference, so a stream
+    created with the engine-wide module lists follows any module later
+    added to the engine.
+    """
+
+    def __init__(self,
+                 stream_id,
+                 input_module,
+                 preprocessor_modules,
+                 output_modules,
+                 weight=1):
+        """Initialize stream.
+
+        Args:
+            stream_id: Unique name of the stream.
+            input_module: Input module of the stream.
+            preprocessor_modules: List of preprocessor modules.
+            output_modules: List of output modules.
+            weight: Scheduling weight, a stream of weight 2 is served
+                twice as often as a stream of weight 1.
+        """
+        self.stream_id = str(stream_id)
+        self.input_module = input_module
+        self.preprocessor_modules = preprocessor_modules
+        self.output_modules = output_modules
+        self.weight = max(1, int(weight))
+        self.exhausted = False
+
+    def load_data(self, assets, namespaced=False):
+        """Load the next frame from the input module.
+
+        Args:
+            assets: Dictionary of assets.
+            namespaced: Whether to prefix the frame ID with the stream ID.
+        """
+        self.input_module.load_data(assets)
+        assets["stream_id"] = self.stream_id
+        if namespaced:
+            assets["frame_id"] = f"{self.stream_id}/{assets['frame_id']}"
+        # The input module stops once its last frame has been loaded
+        self.exhausted = self.input_module.stopped
+
+
+class StreamScheduler:
+
+    """Smooth weighted round-robin scheduling of streams.
+
+    Every stream is served in proportion to its weight, and the frames of
+    heavier streams are interleaved with the others instead of arriving in
+    bursts. Exhausted streams are skipped.
+    """
+
+    def __init__(self, streams):
+        """Initialize stream scheduler.
+
+        Args:
+            streams: List of streams to schedule.
+        """
+        self._streams = streams
+        self._current = {}
+
+    def next(self):
+        """Get the next stream to load a frame from.
+
+        Returns:
+            Next stream, or None if all streams are exhausted.
+        """
+        active = [stream for stream in self._streams if not stream.exhausted]
+        if not active:
+            return None
+        total = 0
+        for stream in active:
+            total += stream.weight
+            self._current[stream.stream_id] = self._current.get(
+                stream.stream_id, 0) + stream.weight
+        selected = max(active,
+                       key=lambda stream: self._current[stream.stream_id])
+        self._current[selected.stream_id] -= total
+        return selected
@@ -0,0 +1,74 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   benchmark_class_map.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Semantic segmentation class map micro-benchmark.
+
+Compares the previous per-class scatter of `get_binary_mask` and
+`np.argmax` with `get_class_map` at full and downsampled resolution, and
+checks that `get_class_map` matches `np.argmax`.
+
+Usage:
+    python tests/benchmarks/benchmark_class_map.py --classes 21
+"""
+
+import argparse
+import timeit
+
+# Sets up the import path and configuration before any import of the
+# source tree
+import bootstrap  # noqa: F401 pylint: disable=unused-import
+import numpy as np
+from common.utils import get_class_map
+
+
+def legacy_binary_mask(mask):
+    """Assign each pixel the last class with a positive score."""
+    binary_mask = np.zeros_like(mask[0], np.uint8)
+    for class_id, class_mask in enumerate(mask):
+        if class_id > 0:
+            binary_mask[np.where(class_mask > 0.0)] = class_id
+    return binary_mask
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--classes", type=int, default=21)
+    parser.add_argument("--size", type=int, default=512)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    scores = rng.normal(0, 1, (args.classes, args.size, args.size)).astype(
+        np.float32)
+    np.testing.assert_array_equal(get_class_map(scores),
+                                  scores.argmax(axis=0))
+
+    baseline = timeit.timeit(lambda: legacy_binary_mask(scores),
+                             number=args.repeat) / args.repeat
+    argmax = timeit.timeit(lambda: scores.argmax(axis=0),
+                           number=args.repeat) / args.repeat
+    print(f"{args.size}x{args.size}, {args.classes} classes")
+    print(f"  per-class scatter  {baseline * 1000:8.3f} ms")
+    print(f"  np.argmax          {argmax * 1000:8.3f} ms")
+    for stride in (1, 2):
+        elapsed = timeit.timeit(
+            lambda stride=stride: get_class_map(scores, stride=stride),
+            number=args.repeat) / args.repeat
+        print(f"  class map /{stride}       {elapsed * 1000:8.3f} ms "
+              f"({baseline / elapsed:5.1f}x scatter, "
+              f"{argmax / elapsed:4.1f}x argmax)")
+
+
+if __name__ == "__main__":
+    main()
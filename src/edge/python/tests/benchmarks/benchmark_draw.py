@@ -0,0 +1,223 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   benchmark_draw.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Draw postprocessor micro-benchmark.
+
+Compares the previous bounding box drawing loop, which rendered every
+label with `putText`, with the draw postprocessor and its label cache, and
+checks that both draw the same pixels where labels fit within their box.
+
+In semantic mode, compares the previous int64 overlay of a 3-channel mask
+with the palette lookup and uint8 blending of a class index mask.
+
+In instance mode, compares adding a full-frame mask per instance in int64
+with blending each mask inside its bounding box.
+
+Usage:
+    python tests/benchmarks/benchmark_draw.py --boxes 50
+    python tests/benchmarks/benchmark_draw.py --mode semantic
+    python tests/benchmarks/benchmark_draw.py --mode instance --boxes 30
+"""
+
+import argparse
+import timeit
+
+# Sets up the import path and configuration before any import of the
+# source tree
+import bootstrap  # noqa: F401 pylint: disable=unused-import
+import cv2
+import numpy as np
+from common.utils import Detections
+from core.components.data.postprocessors.draw.module import Postprocessor
+
+
+def random_assets(width, height, num_boxes, num_classes, seed=0):
+    """Generate a frame with random detections."""
+    rng = np.random.default_rng(seed)
+    corners = rng.uniform(0, 0.7, (num_boxes, 2))
+    sizes = rng.uniform(0.2, 0.3, (num_boxes, 2))
+    boxes = np.concatenate([corners, corners + sizes], axis=1)
+    classes = rng.integers(1, num_classes + 1, num_boxes)
+    scores = rng.uniform(0.3, 1, num_boxes)
+    return {
+        "orig_frame":
+        rng.integers(0, 256, (height, width, 3), dtype=np.uint8),
+        "orig_shape": (height, width, 3),
+        "category_index": {
+            class_id: {
+                "id": class_id,
+                "name": f"c{class_id}"
+            }
+            for class_id in range(1, num_classes + 1)
+        },
+        "color_map": {
+            class_id: tuple(int(value) for value in rng.integers(0, 256, 3))
+            for class_id in range(num_classes)
+        },
+        "predictions": Detections(boxes, classes, scores),
+    }
+
+
+def legacy_draw(assets, thickness=2):
+    """Draw bounding boxes, rendering every label with `putText`."""
+    frame = cv2.cvtColor(assets["orig_frame"].copy(), cv2.COLOR_RGB2BGR)
+    frame = np.array(frame)
+    orig_shape = assets["orig_shape"]
+    predictions = assets["predictions"]
+    boxes = predictions.to_pixels(orig_shape[1], orig_shape[0])
+    for (xmin, ymin, xmax, ymax), each_class, each_score in zip(
+            boxes.tolist(), predictions.classes.tolist(),
+            predictions.scores.tolist()):
+        color = assets["color_map"].get(each_class - 1)
+        cv2.rectangle(frame, (xmin, ymin), (xmax, ymax), color, thickness)
+        cv2.rectangle(frame, (xmin, ymax), (xmax, ymax + 15),
+                      color,
+                      thickness=-1)
+        cv2.putText(
+            frame,
+            f"Class: {assets['category_index'][each_class]['name']},"
+            f"Score: {str(round(each_score, 2))}",
+            (xmin, ymax + 10),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.3,
+            (0, 0, 0),
+            1,
+            cv2.LINE_AA,
+        )
+    return frame
+
+
+def legacy_draw_semantic(assets):
+    """Add a 3-channel mask onto the frame in int64."""
+    frame = cv2.cvtColor(assets["orig_frame"].copy(),
+                         cv2.COLOR_RGB2BGR).astype(np.int64)
+    output_mask = cv2.resize(
+        assets["predictions"]["mask"],
+        (assets["orig_shape"][1], assets["orig_shape"][0]))
+    frame += output_mask.astype(np.int64)
+    frame = np.clip(frame, 0, 255)
+    return frame.astype(np.uint8)
+
+
+def benchmark_semantic(args):
+    """Benchmark semantic mask drawing."""
+    rng = np.random.default_rng(0)
+    assets = random_assets(args.width, args.height, 0, args.classes)
+    mask = rng.integers(0, args.classes + 1, (args.mask_size, args.mask_size),
+                        dtype=np.uint8)
+    legacy_assets = dict(assets,
+                         predictions={
+                             "mask":
+                             np.repeat(mask[..., np.newaxis], 3, axis=-1) *
+                             np.uint8(127)
+                         })
+    assets["predictions"] = {"mask": mask}
+    postprocessor = Postprocessor.__new__(Postprocessor)
+    postprocessor.alpha = 0.5
+    postprocessor._palette_lut = None  # pylint: disable=W0212
+    draw = postprocessor._draw_semantic_mask  # pylint: disable=W0212
+
+    baseline = timeit.timeit(lambda: legacy_draw_semantic(legacy_assets),
+                             number=args.repeat) / args.repeat
+    elapsed = timeit.timeit(lambda: draw(assets),
+                            number=args.repeat) / args.repeat
+    print(f"{args.width}x{args.height}, {args.mask_size}x{args.mask_size} "
+          f"mask, {args.classes} classes")
+    print(f"  int64 overlay    {baseline * 1000:8.3f} ms")
+    print(f"  palette lookup   {elapsed * 1000:8.3f} ms "
+          f"({baseline / elapsed:5.1f}x)")
+
+
+def legacy_draw_instance(assets):
+    """Add a full-frame mask per instance onto the frame in int64."""
+    frame = cv2.cvtColor(assets["orig_frame"].copy(),
+                         cv2.COLOR_RGB2BGR).astype(np.int64)
+    height, width = assets["orig_shape"][:2]
+    predictions = assets["predictions"]
+    for each_mask, (xmin, ymin, xmax, ymax) in zip(
+            predictions.masks,
+            predictions.to_pixels(width, height).tolist()):
+        mask = np.tile(np.expand_dims(each_mask, -1), 3) * 255
+        mask = np.clip(mask, 0, 255).astype(np.uint8)
+        mask = cv2.resize(mask, (xmax - xmin, ymax - ymin))
+        resized_mask = np.zeros(assets["orig_shape"])
+        resized_mask[ymin:ymax, xmin:xmax, :] = mask
+        frame += resized_mask.astype(np.int64)
+        frame = np.clip(frame, 0, 255)
+    return frame.astype(np.uint8)
+
+
+def benchmark_instance(args):
+    """Benchmark instance mask drawing."""
+    rng = np.random.default_rng(0)
+    assets = random_assets(args.width, args.height, args.boxes, args.classes)
+    predictions = assets["predictions"]
+    predictions.masks = rng.uniform(0, 1, (args.boxes, 28, 28)) > 0.3
+    postprocessor = Postprocessor.__new__(Postprocessor)
+    postprocessor.alpha = 0.5
+    postprocessor._palette_lut = None  # pylint: disable=W0212
+    draw = postprocessor._draw_instance_mask  # pylint: disable=W0212
+
+    baseline = timeit.timeit(lambda: legacy_draw_instance(assets),
+                             number=args.repeat) / args.repeat
+    elapsed = timeit.timeit(lambda: draw(assets),
+                            number=args.repeat) / args.repeat
+    print(f"{args.width}x{args.height}, {args.boxes} instances")
+    print(f"  full-frame int64 {baseline * 1000:8.3f} ms")
+    print(f"  box-local uint8  {elapsed * 1000:8.3f} ms "
+          f"({baseline / elapsed:5.1f}x)")
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mode",
+                        choices=["bbox", "semantic", "instance"],
+                        default="bbox")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--boxes", type=int, default=50)
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--mask-size", type=int, default=512)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.mode == "semantic":
+        benchmark_semantic(args)
+        return
+    if args.mode == "instance":
+        benchmark_instance(args)
+        return
+
+    assets = random_assets(args.width, args.height, args.boxes, args.classes)
+    postprocessor = Postprocessor.__new__(Postprocessor)
+    postprocessor.thickness = 2
+    postprocessor._label_cache = {}  # pylint: disable=W0212
+
+    def draw():
+        return postprocessor._draw_bbox(assets)  # pylint: disable=W0212
+
+    # Boxes are at least 20% of the frame wide, so labels fit within them
+    np.testing.assert_array_equal(draw(), legacy_draw(assets))
+
+    baseline = timeit.timeit(lambda: legacy_draw(assets),
+                             number=args.repeat) / args.repeat
+    elapsed = timeit.timeit(draw, number=args.repeat) / args.repeat
+    print(f"{args.width}x{args.height}, {args.boxes} boxes")
+    print(f"  putText per box  {baseline * 1000:8.3f} ms")
+    print(f"  cached labels    {elapsed * 1000:8.3f} ms "
+          f"({baseline / elapsed:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
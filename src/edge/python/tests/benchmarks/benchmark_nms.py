@@ -0,0 +1,160 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   benchmark_nms.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Non-max suppression micro-benchmark.
+
+Compares `non_max_suppression` against the previous per-class NMS loop,
+and checks that hard NMS keeps the same boxes as a reference greedy NMS.
+
+Usage:
+    python tests/benchmarks/benchmark_nms.py --boxes 100 300 1000
+"""
+
+import argparse
+import copy
+import timeit
+
+# Sets up the import path and configuration before any import of the
+# source tree
+import bootstrap  # noqa: F401 pylint: disable=unused-import
+import numpy as np
+from common.utils.nms import NMS_METHODS, non_max_suppression
+
+
+def legacy_box_diou(boxes):
+    """Compute the DIoU of the first (x, y, w, h) box with the others."""
+    x_pos, y_pos, wid, hei = boxes.T
+    areas = wid * hei
+    inter_xmin = np.maximum(x_pos[1:], x_pos[0])
+    inter_ymin = np.maximum(y_pos[1:], y_pos[0])
+    inter_xmax = np.minimum(x_pos[1:] + wid[1:], x_pos[0] + wid[0])
+    inter_ymax = np.minimum(y_pos[1:] + hei[1:], y_pos[0] + hei[0])
+    inter_w = np.maximum(0.0, inter_xmax - inter_xmin + 1)
+    inter_h = np.maximum(0.0, inter_ymax - inter_ymin + 1)
+    inter = inter_w * inter_h
+    iou = inter / (areas[1:] + areas[0] - inter)
+    x_center = x_pos + wid / 2
+    y_center = y_pos + hei / 2
+    center_distance = np.power(x_center[1:] - x_center[0], 2) + np.power(
+        y_center[1:] - y_center[0], 2)
+    enclose_xmin = np.minimum(x_pos[1:], x_pos[0])
+    enclose_ymin = np.minimum(y_pos[1:], y_pos[0])
+    enclose_xmax = np.maximum(x_pos[1:] + wid[1:], x_pos[0] + wid[0])
+    enclose_ymax = np.maximum(y_pos[1:] + wid[1:], y_pos[0] + wid[0])
+    enclose_w = np.maximum(0.0, enclose_xmax - enclose_xmin + 1)
+    enclose_h = np.maximum(0.0, enclose_ymax - enclose_ymin + 1)
+    enclose_diagonal = np.power(enclose_w, 2) + np.power(enclose_h, 2)
+    return iou - 1.0 * (center_distance) / (enclose_diagonal +
+                                            np.finfo(float).eps)
+
+
+def legacy_nms_boxes(boxes, classes, scores, iou_threshold):
+    """Previous per-class hard NMS loop of `common.utils.inference`."""
+    nboxes, nclasses, nscores = [], [], []
+    for cls in set(classes):
+        inds = np.where(classes == cls)
+        b_nms = copy.deepcopy(boxes[inds])
+        c_nms = copy.deepcopy(classes[inds])
+        s_nms = copy.deepcopy(scores[inds])
+        while len(s_nms) > 0:
+            i = np.argmax(s_nms, axis=-1)
+            nboxes.append(copy.deepcopy(b_nms[i]))
+            nclasses.append(copy.deepcopy(c_nms[i]))
+            nscores.append(copy.deepcopy(s_nms[i]))
+            b_nms[[i, 0], :] = b_nms[[0, i], :]
+            c_nms[[i, 0]] = c_nms[[0, i]]
+            s_nms[[i, 0]] = s_nms[[0, i]]
+            iou = legacy_box_diou(b_nms)
+            b_nms = b_nms[1:]
+            c_nms = c_nms[1:]
+            s_nms = s_nms[1:]
+            keep_mask = np.where(iou <= iou_threshold)[0]
+            b_nms = b_nms[keep_mask]
+            c_nms = c_nms[keep_mask]
+            s_nms = s_nms[keep_mask]
+    return np.array(nboxes), np.array(nclasses), np.array(nscores)
+
+
+def reference_nms(boxes, classes, scores, iou_threshold):
+    """Textbook greedy per-class hard NMS on (x1, y1, x2, y2) boxes."""
+    keep = []
+    for cls in np.unique(classes):
+        order = [i for i in np.argsort(-scores) if classes[i] == cls]
+        while order:
+            best, order = order[0], order[1:]
+            keep.append(best)
+            xmin = np.maximum(boxes[best, 0], boxes[order, 0])
+            ymin = np.maximum(boxes[best, 1], boxes[order, 1])
+            xmax = np.minimum(boxes[best, 2], boxes[order, 2])
+            ymax = np.minimum(boxes[best, 3], boxes[order, 3])
+            inter = np.maximum(xmax - xmin, 0) * np.maximum(ymax - ymin, 0)
+            areas = ((boxes[order, 2] - boxes[order, 0]) *
+                     (boxes[order, 3] - boxes[order, 1]))
+            best_area = ((boxes[best, 2] - boxes[best, 0]) *
+                         (boxes[best, 3] - boxes[best, 1]))
+            iou = inter / (areas + best_area - inter)
+            order = [
+                i for i, value in zip(order, iou) if value <= iou_threshold
+            ]
+    return sorted(keep)
+
+
+def random_detections(num_boxes, num_classes, seed=0):
+    """Generate clustered detections on a 640x640 image."""
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(0, 640, (max(1, num_boxes // 10), 2))
+    xy = (centers[rng.integers(0, len(centers), num_boxes)] +
+          rng.normal(0, 8, (num_boxes, 2)))
+    wh = rng.uniform(20, 120, (num_boxes, 2))
+    boxes = np.concatenate([xy - wh / 2, xy + wh / 2], axis=1)
+    classes = rng.integers(0, num_classes, num_boxes)
+    scores = rng.uniform(0.1, 1.0, num_boxes)
+    return boxes, classes, scores
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--boxes", type=int, nargs="+", default=[100, 300])
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--iou-threshold", type=float, default=0.45)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for num_boxes in args.boxes:
+        boxes, classes, scores = random_detections(num_boxes, args.classes)
+        kept, _, _ = non_max_suppression(boxes, classes, scores,
+                                         args.iou_threshold)
+        expected = reference_nms(boxes, classes, scores, args.iou_threshold)
+        assert sorted(map(tuple, kept)) == sorted(
+            map(tuple, boxes[expected])), "Hard NMS mismatch!"
+
+        xywh = np.concatenate([boxes[:, :2], boxes[:, 2:] - boxes[:, :2]],
+                              axis=1)
+        legacy = timeit.timeit(
+            lambda: legacy_nms_boxes(xywh, classes, scores,
+                                     args.iou_threshold),
+            number=args.repeat) / args.repeat
+        print(f"{num_boxes} boxes, {args.classes} classes")
+        print(f"  legacy nms_boxes   {legacy * 1000:8.3f} ms")
+        for method in NMS_METHODS:
+            elapsed = timeit.timeit(
+                lambda method=method: non_max_suppression(
+                    boxes, classes, scores, args.iou_threshold, method=method),
+                number=args.repeat) / args.repeat
+            print(f"  {method:<18} {elapsed * 1000:8.3f} ms "
+                  f"({legacy / elapsed:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   benchmark_postprocess.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Object detection postprocess micro-benchmark.
+
+Compares the original `_postprocess` of the ONNX, TensorFlow, TFLite and
+PyTorch object detection predictors, which postprocessed one image per
+prediction call and ran a Python DIoU non-max suppression loop on pixel
+boxes, with the shared `DetectionPostprocess` stage on the raw output of
+a whole batch. The PyTorch layout is skipped if torch is not installed.
+
+The original suppression passed (xmin, ymin, xmax, ymax) boxes to a DIoU
+that expects (x, y, width, height) boxes, so the boxes it keeps cannot be
+reproduced. The shared stage is instead checked against a per-image loop
+of the current non-max suppression.
+
+Usage:
+    python tests/benchmarks/benchmark_postprocess.py --batch-size 4
+"""
+
+import argparse
+import copy
+import timeit
+
+# Sets up the import path and configuration before any import of the
+# source tree
+import bootstrap  # noqa: F401 pylint: disable=unused-import
+import numpy as np
+from common.utils import non_max_suppression
+from detection_postprocess import DetectionPostprocess
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+INPUT_SHAPE = (640, 640)
+
+
+def random_detections(batch_size, num_boxes, num_classes, seed=0):
+    """Generate raw detections of overlapping boxes."""
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(0.1, 0.9, (batch_size, num_boxes, 2))
+    sizes = rng.uniform(0.02, 0.2, (batch_size, num_boxes, 2))
+    boxes = np.concatenate([centers - sizes / 2, centers + sizes / 2],
+                           axis=-1).clip(0, 1).astype(np.float32)
+    scores = rng.uniform(0, 1, (batch_size, num_boxes)).astype(np.float32)
+    classes = rng.integers(0, num_classes, (batch_size, num_boxes))
+    return boxes, classes.astype(np.float32), scores
+
+
+def original_box_diou(boxes):
+    """Compute the DIoU of the first box with the others, as originally."""
+    x_pos = boxes[:, 0]
+    y_pos = boxes[:, 1]
+    wid = boxes[:, 2]
+    hei = boxes[:, 3]
+    areas = wid * hei
+
+    inter_xmin = np.maximum(x_pos[1:], x_pos[0])
+    inter_ymin = np.maximum(y_pos[1:], y_pos[0])
+    inter_xmax = np.minimum(x_pos[1:] + wid[1:], x_pos[0] + wid[0])
+    inter_ymax = np.minimum(y_pos[1:] + hei[1:], y_pos[0] + hei[0])
+    inter_w = np.maximum(0.0, inter_xmax - inter_xmin + 1)
+    inter_h = np.maximum(0.0, inter_ymax - inter_ymin + 1)
+    inter = inter_w * inter_h
+    iou = inter / (areas[1:] + areas[0] - inter)
+
+    x_center = x_pos + wid / 2
+    y_center = y_pos + hei / 2
+    center_distance = np.power(x_center[1:] - x_center[0], 2) + np.power(
+        y_center[1:] - y_center[0], 2)
+
+    enclose_xmin = np.minimum(x_pos[1:], x_pos[0])
+    enclose_ymin = np.minimum(y_pos[1:], y_pos[0])
+    enclose_xmax = np.maximum(x_pos[1:] + wid[1:], x_pos[0] + wid[0])
+    enclose_ymax = np.maximum(y_pos[1:] + wid[1:], y_pos[0] + wid[0])
+    enclose_w = np.maximum(0.0, enclose_xmax - enclose_xmin + 1)
+    enclose_h = np.maximum(0.0, enclose_ymax - enclose_ymin + 1)
+    enclose_diagonal = np.power(enclose_w, 2) + np.power(enclose_h, 2)
+    return iou - 1.0 * center_distance / (enclose_diagonal +
+                                          np.finfo(float).eps)
+
+
+def original_nms_boxes(boxes, classes, scores, iou_threshold):
+    """Suppress boxes one at a time per class, as originally."""
+    nboxes, nclasses, nscores = [], [], []
+    for cls in set(classes):
+        inds = np.where(classes == cls)
+        b_nms = copy.deepcopy(boxes[inds])
+        c_nms = copy.deepcopy(classes[inds])
+        s_nms = copy.deepcopy(scores[inds])
+        while len(s_nms) > 0:
+            i = np.argmax(s_nms, axis=-1)
+            nboxes.append(copy.deepcopy(b_nms[i]))
+            nclasses.append(copy.deepcopy(c_nms[i]))
+            nscores.append(copy.deepcopy(s_nms[i]))
+            b_nms[[i, 0], :] = b_nms[[0, i], :]
+            c_nms[[i, 0]] = c_nms[[0, i]]
+            s_nms[[i, 0]] = s_nms[[0, i]]
+            iou = original_box_diou(b_nms)
+            keep_mask = np.where(iou <= iou_threshold)[0]
+            b_nms = b_nms[1:][keep_mask]
+            c_nms = c_nms[1:][keep_mask]
+            s_nms = s_nms[1:][keep_mask]
+    return np.array(nboxes), np.array(nclasses), np.array(nscores)
+
+
+def original_suppress(boxes, classes, scores):
+    """Run the original pixel space suppression shared by all backends."""
+    boxes[:, 0], boxes[:, 1] = (boxes[:, 1] * INPUT_SHAPE[1],
+                                boxes[:, 0] * INPUT_SHAPE[0])
+    boxes[:, 2], boxes[:, 3] = (boxes[:, 3] * INPUT_SHAPE[1],
+                                boxes[:, 2] * INPUT_SHAPE[0])
+    boxes, classes, scores = original_nms_boxes(boxes, classes, scores, 0.1)
+    boxes = [[
+        box[1] / INPUT_SHAPE[1],
+        box[0] / INPUT_SHAPE[0],
+        box[3] / INPUT_SHAPE[1],
+        box[2] / INPUT_SHAPE[0],
+    ] for box in boxes]
+    return {"boxes": boxes, "classes": classes, "scores": scores}
+
+
+def original_rows_postprocess(detections_output, threshold):
+    """Postprocess one ONNX or TensorFlow output, as originally."""
+    slicer = detections_output[:, -1]
+    output = detections_output[:, :6][slicer != 0]
+    output = output[output[:, 4] > threshold]
+    output = output[output[:, 5] != 0]
+    return original_suppress(output[:, :4], output[:, 5].astype(np.int32),
+                             output[:, 4])
+
+
+def original_tflite_postprocess(detections_output, threshold):
+    """Postprocess one TFLite output, as originally."""
+    _, scores, classes, boxes = list(detections_output.values())
+    classes = classes.astype(np.int16)
+    _filter = scores > threshold
+    classes, boxes, scores = classes[_filter], boxes[_filter], scores[_filter]
+    _filter = classes != 0
+    classes, boxes, scores = classes[_filter], boxes[_filter], scores[_filter]
+    return original_suppress(boxes, classes, scores)
+
+
+def original_pytorch_postprocess(detections_output, threshold):
+    """Postprocess one PyTorch output, as originally."""
+    detections_output = detections_output[0].detach()
+    slicer = detections_output[:, -1]
+    output = torch.Tensor(detections_output[:, :6][np.where(slicer != 0)])
+    output = output[np.where(output[:, 4] > threshold)]
+    output = torch.Tensor(output[np.where(output[:, 5] != 0)])
+    return original_suppress(output[:, :4].numpy(),
+                             output[:, 5].numpy().astype(np.int32),
+                             output[:, 4].numpy())
+
+
+def reference_postprocess(boxes, classes, scores, threshold):
+    """Postprocess one image at a time with the current suppression."""
+    outputs = []
+    for image_boxes, image_classes, image_scores in zip(
+            boxes, classes, scores):
+        keep = (image_scores > threshold) & (image_classes != 0)
+        outputs.append(
+            non_max_suppression(image_boxes[keep],
+                                image_classes[keep].astype(np.int32),
+                                image_scores[keep],
+                                0.1,
+                                top_k=1000))
+    return outputs
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--boxes", type=int, default=300)
+    parser.add_argument("--classes", type=int, default=20)
+    parser.add_argument("--threshold", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    boxes, classes, scores = random_detections(args.batch_size, args.boxes,
+                                               args.classes)
+    # Raw output layouts: (boxes, score, class, valid) rows for ONNX,
+    # PyTorch and TensorFlow, separate arrays for TFLite
+    rows = np.concatenate([
+        boxes, scores[..., None], classes[..., None],
+        np.ones_like(scores)[..., None]
+    ],
+                          axis=-1)
+    tflite_outputs = [{
+        "num": np.array([args.boxes]),
+        "scores": scores[[index]],
+        "classes": classes[[index]],
+        "boxes": boxes[[index]],
+    } for index in range(args.batch_size)]
+    stage = DetectionPostprocess(threshold=args.threshold)
+
+    def stage_rows(detections=rows):
+        return stage(detections[..., :4], detections[..., 5],
+                     detections[..., 4], detections[..., -1] != 0)
+
+    # The original predictors were called once per image, and modified
+    # their raw output in place, hence the copies
+    backends = {
+        "onnx": (lambda: [
+            original_rows_postprocess(output[0], args.threshold)
+            for output in rows.copy()[:, None]
+        ], stage_rows),
+        "tf": (lambda: [
+            original_rows_postprocess(np.array(output), args.threshold)
+            for output in rows
+        ], stage_rows),
+        "tflite": (lambda: [
+            original_tflite_postprocess(
+                {key: value.copy()
+                 for key, value in output.items()}, args.threshold)
+            for output in tflite_outputs
+        ], lambda: stage(boxes, classes, scores)),
+    }
+    if torch is not None:
+        tensors = torch.from_numpy(rows)
+        backends["pytorch"] = (lambda: [
+            original_pytorch_postprocess(output[None], args.threshold)
+            for output in tensors
+        ], lambda: stage_rows(tensors.detach().numpy()))
+
+    expected = reference_postprocess(boxes, classes, scores, args.threshold)
+    for name, (_, shared) in backends.items():
+        for result, reference in zip(shared(), expected):
+            assert len(result) == len(reference[0]), name
+            np.testing.assert_allclose(result.boxes, reference[0], atol=1e-6)
+            np.testing.assert_array_equal(result.classes, reference[1])
+
+    print(f"batch of {args.batch_size}, {args.boxes} boxes per image, "
+          f"{sum(len(output[0]) for output in expected)} kept")
+    for name, (original, shared) in backends.items():
+        baseline = timeit.timeit(original, number=args.repeat) / args.repeat
+        elapsed = timeit.timeit(shared, number=args.repeat) / args.repeat
+        print(f"  {name:<8} original {baseline * 1000:8.3f} ms, "
+              f"shared {elapsed * 1000:8.3f} ms "
+              f"({baseline / elapsed:5.1f}x)")
+    if torch is None:
+        print("  pytorch  skipped, torch is not installed")
+
+
+if __name__ == "__main__":
+    main()
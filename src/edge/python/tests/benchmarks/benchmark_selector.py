@@ -0,0 +1,107 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   benchmark_selector.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Active learning frame selection micro-benchmark.
+
+Simulates a stream where most frames hold confident detections of common
+classes, and a few frames hold detections close to the threshold or of a
+rare class. For each selection strategy, prints the selection time per
+frame, the number of uploaded frames compared to the previous sampling of
+every 10th frame, and the share of the useful frames that were uploaded.
+
+Usage:
+    python tests/benchmarks/benchmark_selector.py --frames 20000
+"""
+
+import argparse
+import time
+
+# Sets up the import path and configuration before any import of the
+# source tree
+import bootstrap  # noqa: F401 pylint: disable=unused-import
+import numpy as np
+from common.utils import Detections
+from core.components.active_learning import FrameSelector
+
+THRESHOLD = 0.5
+STRATEGIES = {
+    "interval /10": {
+        "strategy": "interval",
+        "frame_interval": 10
+    },
+    "entropy": {
+        "strategy": "entropy",
+        "min_score": 0.6
+    },
+    "margin": {
+        "strategy": "margin",
+        "min_score": 0.8
+    },
+    "near_threshold": {
+        "strategy": "near_threshold",
+        "band": 0.1
+    },
+    "margin + rarity": {
+        "strategy": "margin",
+        "min_score": 0.8,
+        "rarity_boost": 0.8
+    },
+}
+
+
+def make_stream(frames, uncertain_rate, rare_rate, rng):
+    """Generate the detections of a stream and its useful frames."""
+    stream = []
+    useful = np.zeros(frames, bool)
+    for index in range(frames):
+        count = int(rng.integers(1, 8))
+        scores = rng.uniform(0.85, 1.0, count)
+        classes = rng.integers(0, 3, count)
+        if rng.random() < uncertain_rate:
+            scores[0] = rng.uniform(THRESHOLD, THRESHOLD + 0.08)
+            useful[index] = True
+        if rng.random() < rare_rate:
+            classes[0] = 3
+            useful[index] = True
+        stream.append(
+            Detections(rng.random((count, 4)), classes,
+                       scores.astype(np.float32)))
+    return stream, useful
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--uncertain-rate", type=float, default=0.01)
+    parser.add_argument("--rare-rate", type=float, default=0.003)
+    args = parser.parse_args()
+
+    stream, useful = make_stream(args.frames, args.uncertain_rate,
+                                 args.rare_rate, np.random.default_rng(0))
+    baseline = None
+    print(f"{args.frames} frames, {int(useful.sum())} useful")
+    for name, options in STRATEGIES.items():
+        selector = FrameSelector(threshold=THRESHOLD, **options)
+        start = time.perf_counter()
+        selected = np.array([selector.select(frame) for frame in stream])
+        elapsed = (time.perf_counter() - start) / args.frames
+        uploads = int(selected.sum())
+        baseline = baseline or uploads
+        print(f"  {name:16s} {elapsed * 1e6:6.1f} us/frame "
+              f"{uploads:6d} uploads ({baseline / max(uploads, 1):5.1f}x "
+              f"fewer), {selected[useful].mean():6.1%} of useful frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   benchmark_yolo.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   YOLOv3/v4 postprocess micro-benchmark.
+
+Compares `yolov3v4_postprocess` without a decoder, with a dense
+`YoloDecoder` and with a sparse `YoloDecoder`, and checks that all three
+give the same predictions.
+
+Usage:
+    python tests/benchmarks/benchmark_yolo.py --input-size 608
+"""
+
+import argparse
+import timeit
+
+# Sets up the import path and configuration before any import of the
+# source tree
+import bootstrap  # noqa: F401 pylint: disable=unused-import
+import numpy as np
+from common.constants import YOLO_ANCHORS
+from common.utils import YoloDecoder, yolov3v4_postprocess
+
+
+def random_outputs(input_size, num_classes, seed=0):
+    """Generate YOLO head outputs where few cells hold an object."""
+    rng = np.random.default_rng(seed)
+    outputs = []
+    for stride in (32, 16, 8):
+        grid = input_size // stride
+        output = rng.normal(0, 1, (1, grid, grid, 3, 5 + num_classes))
+        # Objectness logits, with about 0.5% of the cells above 0.1
+        output[..., 4] = rng.normal(-6, 1.5, (1, grid, grid, 3))
+        outputs.append(
+            output.reshape(1, grid, grid, -1).astype(np.float32))
+    return outputs
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--input-size", type=int, default=608)
+    parser.add_argument("--classes", type=int, default=80)
+    parser.add_argument("--confidence", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    input_shape = (args.input_size, args.input_size)
+    outputs = random_outputs(args.input_size, args.classes)
+    decoders = {
+        "dense decoder": YoloDecoder(YOLO_ANCHORS, args.classes, input_shape),
+        "sparse decoder": YoloDecoder(YOLO_ANCHORS,
+                                      args.classes,
+                                      input_shape,
+                                      sparse=True),
+    }
+
+    def postprocess(decoder=None):
+        return yolov3v4_postprocess(outputs,
+                                    input_shape,
+                                    YOLO_ANCHORS,
+                                    args.classes,
+                                    input_shape,
+                                    confidence=args.confidence,
+                                    decoder=decoder)
+
+    expected = postprocess()
+    for name, decoder in decoders.items():
+        for result, reference in zip(postprocess(decoder), expected):
+            np.testing.assert_allclose(result, reference, rtol=1e-5)
+            assert np.shape(result) == np.shape(reference), name
+
+    legacy = timeit.timeit(postprocess, number=args.repeat) / args.repeat
+    print(f"{args.input_size}x{args.input_size}, {args.classes} classes, "
+          f"{len(expected[0])} boxes")
+    print(f"  no decoder       {legacy * 1000:8.3f} ms")
+    for name, decoder in decoders.items():
+        elapsed = timeit.timeit(lambda decoder=decoder: postprocess(decoder),
+                                number=args.repeat) / args.repeat
+        print(f"  {name:<16} {elapsed * 1000:8.3f} ms "
+              f"({legacy / elapsed:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
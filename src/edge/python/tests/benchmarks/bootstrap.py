@@ -0,0 +1,34 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   bootstrap.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Environment setup of the benchmarks.
+
+Imported by every benchmark before any module of the source tree, so
+that benchmarks run with a plain `python tests/benchmarks/<name>.py`.
+Every folder of the source tree is added to the import path, as the
+setup scripts do with PYTHONPATH, and the benchmark configuration is used
+unless DATATURE_EDGE_PYTHON_CONFIG is already set.
+"""
+
+import os
+import sys
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+PYTHON_DIR = os.path.dirname(os.path.dirname(BENCHMARKS_DIR))
+
+os.environ.setdefault("DATATURE_EDGE_PYTHON_CONFIG",
+                      os.path.join(BENCHMARKS_DIR, "config", "config.yaml"))
+sys.path[1:1] = [
+    folder for folder, _, _ in os.walk(PYTHON_DIR)
+    if "__pycache__" not in folder.split(os.sep) and folder not in sys.path
+]
@@ -0,0 +1,136 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   test_frame_selector.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Active learning frame selection test case.
+"""
+
+import os
+from unittest import TestCase
+
+import numpy as np
+from pytest import MonkeyPatch
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+monkeypatch = MonkeyPatch()
+
+
+def make_detections(scores, classes=None):
+    """Create the detections of a frame.
+
+    Args:
+        scores: List of detection scores.
+        classes: Optional list of class IDs, all 0 by default.
+
+    Returns:
+        Detections of the frame.
+    """
+    from common.utils import Detections
+
+    classes = [0] * len(scores) if classes is None else classes
+    return Detections(np.zeros((len(scores), 4), np.float32),
+                      np.array(classes, np.int64),
+                      np.array(scores, np.float32))
+
+
+class TestFrameSelector(TestCase):
+
+    """Test Active Learning Frame Selection"""
+
+    def setUp(self):
+        """Set configuration"""
+        monkeypatch.setenv("DATATURE_EDGE_PYTHON_CONFIG",
+                           os.path.join(CURRENT_DIR, "../config/config.yaml"))
+
+    def tearDown(self):
+        """Restore environment"""
+        monkeypatch.undo()
+
+    def test_interval(self):
+        """Test that frames are selected every frame interval"""
+        from core.components.active_learning import FrameSelector
+
+        selector = FrameSelector(frame_interval=3)
+        frame = make_detections([0.9])
+        self.assertEqual([selector.select(frame) for _ in range(7)],
+                         [True, False, False, True, False, False, True])
+        self.assertEqual(selector.stats()["evaluated"], 7)
+        self.assertEqual(selector.stats()["selected"], 3)
+
+    def test_empty(self):
+        """Test that frames without detections are never selected"""
+        from core.components.active_learning import FrameSelector
+
+        selector = FrameSelector()
+        self.assertFalse(selector.select(make_detections([])))
+        self.assertEqual(selector.stats()["evaluated"], 0)
+
+    def test_strategies(self):
+        """Test that uncertain frames are selected by each strategy"""
+        from core.components.active_learning import FrameSelector
+
+        cases = {
+            "entropy": ({
+                "min_score": 0.6
+            }, [0.5, 0.6], [0.99, 0.98]),
+            "margin": ({
+                "min_score": 0.8
+            }, [0.55, 0.99], [0.95, 0.99]),
+            "near_threshold": ({
+                "min_score": 0.6,
+                "near_count": 2
+            }, [0.55, 0.56], [0.55, 0.95]),
+        }
+        for strategy, (options, uncertain, confident) in cases.items():
+            selector = FrameSelector(strategy=strategy,
+                                     threshold=0.5,
+                                     **options)
+            self.assertTrue(selector.select(make_detections(uncertain)),
+                            strategy)
+            self.assertFalse(selector.select(make_detections(confident)),
+                             strategy)
+
+    def test_rarity_boost(self):
+        """Test that confident frames of rare classes are selected"""
+        from core.components.active_learning import FrameSelector
+
+        selector = FrameSelector(strategy="margin",
+                                 threshold=0.5,
+                                 min_score=0.8,
+                                 rarity_boost=0.8)
+        common = make_detections([0.95, 0.95], [0, 1])
+        self.assertTrue(selector.select(common))
+        self.assertEqual([selector.select(common) for _ in range(5)],
+                         [False] * 5)
+        self.assertTrue(selector.select(make_detections([0.95], [7])))
+
+    def test_hourly_budget(self):
+        """Test that at most the hourly budget of frames is selected"""
+        from core.components.active_learning import FrameSelector
+
+        now = [0.0]
+        selector = FrameSelector(hourly_budget=2, clock=lambda: now[0])
+        frame = make_detections([0.9])
+        selected = []
+        for now[0] in (0.0, 10.0, 20.0, 3599.0, 3600.0, 3605.0, 3611.0):
+            selected.append(selector.select(frame))
+
+        self.assertEqual(selected,
+                         [True, True, False, False, True, False, True])
+        self.assertEqual(selector.stats()["over_budget"], 3)
+
+    def test_invalid_strategy(self):
+        """Test that unsupported strategies are rejected"""
+        from core.components.active_learning import FrameSelector
+
+        with self.assertRaises(ValueError):
+            FrameSelector(strategy="random")
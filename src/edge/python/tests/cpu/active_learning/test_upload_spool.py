@@ -0,0 +1,146 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   test_upload_spool.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Active learning upload spool test case.
+"""
+
+import csv
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+
+import numpy as np
+from pytest import MonkeyPatch
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+monkeypatch = MonkeyPatch()
+ROWS = [["1", "2", "3", "4", "cat"]]
+
+
+class FakeClient:
+
+    """Local stand-in for the Datature SDK client."""
+
+    def __init__(self, failures=0):
+        """Initialize fake client.
+
+        Args:
+            failures: Number of prediction uploads to fail before
+                succeeding.
+        """
+        self.failures = failures
+        self.assets = []
+        self.predictions = []
+
+    def upload_assets(self, paths, groups):
+        """Record uploaded images."""
+        self.assets.append([os.path.basename(path) for path in paths])
+        return len(paths)
+
+    def upload_predictions(self, path):
+        """Record uploaded predictions, failing if requested."""
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Uplink down")
+        with open(path, encoding="utf-8") as file:
+            self.predictions.append(list(csv.reader(file)))
+        return 1
+
+    def finished(self, op_link):
+        """Finish every operation immediately."""
+        return op_link
+
+
+class TestUploadSpool(TestCase):
+
+    """Test Active Learning Upload Spool"""
+
+    def setUp(self):
+        """Set configuration and create spool folder"""
+        monkeypatch.setenv("DATATURE_EDGE_PYTHON_CONFIG",
+                           os.path.join(CURRENT_DIR, "../config/config.yaml"))
+        self.folder = tempfile.mkdtemp()
+        self.image = np.zeros((8, 8, 3), np.uint8)
+
+    def tearDown(self):
+        """Remove spool folder"""
+        shutil.rmtree(self.folder)
+        monkeypatch.undo()
+
+    def test_resume(self):
+        """Test that unsealed frames survive a restart"""
+        from core.components.active_learning import UploadSpool
+
+        spool = UploadSpool(self.folder, batch_size=4)
+        spool.add("stream_0/1", self.image, ROWS)
+        spool.add("stream_0/2", self.image, ROWS)
+
+        spool = UploadSpool(self.folder, batch_size=4)
+        batch = spool.claim(timeout=0)
+        self.assertEqual(len(spool), 1)
+        self.assertEqual(
+            [os.path.basename(path) for path in spool.images(batch)],
+            ["stream_0_1.jpg", "stream_0_2.jpg"])
+
+    def test_seal_crash(self):
+        """Test that a crash while sealing loses no frames"""
+        from core.components.active_learning import UploadSpool
+
+        spool = UploadSpool(self.folder, batch_size=4)
+        for frame_id in range(3):
+            spool.add(frame_id, self.image, ROWS)
+        # Crash after the merged predictions were renamed into place and
+        # one of the row files was deleted
+        folder = os.path.join(self.folder, ".open_00000000")
+        with open(os.path.join(folder, "predictions.csv"), "w",
+                  encoding="utf-8", newline="") as file:
+            csv.writer(file).writerows(
+                [["filename", "xmin", "ymin", "xmax", "ymax", "label"]] +
+                [[f"{frame_id}.jpg", *ROWS[0]] for frame_id in range(3)])
+        os.remove(os.path.join(folder, "0.csv"))
+
+        spool = UploadSpool(self.folder, batch_size=4)
+        batch = spool.claim(timeout=0)
+        self.assertEqual(sorted(os.listdir(batch)),
+                         ["0.jpg", "1.jpg", "2.jpg", "predictions.csv"])
+        with open(spool.predictions(batch), encoding="utf-8") as file:
+            self.assertEqual(len(list(csv.reader(file))), 4)
+
+    def test_retry(self):
+        """Test that failed batches are retried without losing frames"""
+        from core.components.active_learning import UploadSpool, Uploader
+
+        spool = UploadSpool(self.folder, batch_size=2)
+        client = FakeClient(failures=2)
+        uploader = Uploader(spool,
+                            client,
+                            concurrency=2,
+                            base_backoff=0.01,
+                            poll_interval=0.01).start()
+        for frame_id in range(6):
+            spool.add(frame_id, self.image, ROWS)
+
+        deadline = time.monotonic() + 10
+        while len(spool) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        uploader.stop()
+
+        self.assertEqual(len(spool), 0)
+        self.assertEqual(uploader.stats()["failed_uploads"], 2)
+        self.assertEqual(sorted(sum(client.assets, [])),
+                         [f"{frame_id}.jpg" for frame_id in range(6)])
+        self.assertEqual(len(client.predictions), 3)
+        for predictions in client.predictions:
+            self.assertEqual(len(predictions), 3)
@@ -0,0 +1,127 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   test_class_map.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Semantic segmentation class map test case.
+"""
+
+import os
+from unittest import TestCase
+
+import numpy as np
+from pytest import MonkeyPatch
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+monkeypatch = MonkeyPatch()
+
+
+def make_scores(num_classes, height=9, width=7, seed=0):
+    """Generate class scores of shape (num_classes, height, width)."""
+    rng = np.random.default_rng(seed)
+    return rng.normal(0, 1, (num_classes, height, width)).astype(np.float32)
+
+
+class TestClassMap(TestCase):
+
+    """Test Semantic Segmentation Class Map"""
+
+    def setUp(self):
+        """Set configuration"""
+        monkeypatch.setenv("DATATURE_EDGE_PYTHON_CONFIG",
+                           os.path.join(CURRENT_DIR, "../config/config.yaml"))
+
+    def tearDown(self):
+        """Restore environment"""
+        monkeypatch.undo()
+
+    def test_argmax(self):
+        """Test that the class map matches np.argmax"""
+        from common.utils import get_class_map
+
+        for num_classes, dtype in ((1, np.uint8), (3, np.uint8),
+                                   (256, np.uint8), (300, np.uint16)):
+            scores = make_scores(num_classes)
+            class_map = get_class_map(scores)
+            self.assertEqual(class_map.dtype, dtype)
+            np.testing.assert_array_equal(class_map, scores.argmax(axis=0))
+
+    def test_ties(self):
+        """Test that the first class wins ties, like np.argmax"""
+        from common.utils import get_class_map
+
+        # Coarse scores tie often, including with the background
+        scores = np.round(make_scores(5, 20, 20), 0)
+        np.testing.assert_array_equal(get_class_map(scores),
+                                      scores.argmax(axis=0))
+        scores = np.zeros((3, 2, 2), np.float32)
+        scores[1:, 0, 0] = 1.0
+        self.assertEqual(get_class_map(scores).tolist(), [[1, 0], [0, 0]])
+
+    def test_threshold(self):
+        """Test that pixels scoring below the threshold are background"""
+        from common.utils import get_binary_mask, get_class_map
+
+        scores = make_scores(4)
+        expected = np.where(scores.max(axis=0) > 0.8, scores.argmax(axis=0),
+                            0)
+        np.testing.assert_array_equal(get_class_map(scores, threshold=0.8),
+                                      expected)
+        np.testing.assert_array_equal(
+            get_binary_mask(scores),
+            np.where(scores.max(axis=0) > 0.0, scores.argmax(axis=0), 0))
+
+    def test_stride(self):
+        """Test that a strided class map is downsampled"""
+        from common.utils import get_class_map
+
+        scores = make_scores(6)
+        for stride in (2, 3):
+            class_map = get_class_map(scores, stride=stride)
+            self.assertEqual(class_map.shape,
+                             (-(-9 // stride), -(-7 // stride)))
+            np.testing.assert_array_equal(
+                class_map, scores[:, ::stride, ::stride].argmax(axis=0))
+
+    def test_draw_uint16(self):
+        """Test drawing class maps of more than 256 classes"""
+        from common.utils import get_class_map
+        from core.components.data.postprocessors.draw.module import (
+            Postprocessor,
+        )
+
+        # Classes missing from the color map are not drawn
+        rng = np.random.default_rng(0)
+        color_map = {
+            class_id: tuple(rng.integers(0, 256, 3).tolist())
+            for class_id in range(280)
+        }
+        palette = np.zeros((300, 3), np.uint8)
+        palette[1:281] = list(color_map.values())
+        postprocessor = Postprocessor(alpha=1.0)
+        # pylint: disable=protected-access
+        postprocessor._detection_type = "segmentation"
+        postprocessor._segmentation_type = "semantic"
+        frame = np.zeros((9, 7, 3), np.uint8)
+
+        for num_classes in (3, 300):
+            class_map = get_class_map(make_scores(num_classes, seed=1))
+            assets = {
+                "orig_frame": frame,
+                "predictions": {
+                    "mask": class_map
+                },
+                "color_map": color_map,
+            }
+            postprocessor.run(assets)
+            np.testing.assert_array_equal(assets["output_frame"],
+                                          palette[class_map])
+        self.assertGreater(class_map.max(), 255)
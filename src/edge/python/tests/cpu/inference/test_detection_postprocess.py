@@ -0,0 +1,148 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   test_detection_postprocess.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Shared object detection postprocess test case.
+"""
+
+import os
+from types import SimpleNamespace
+from unittest import TestCase
+
+import numpy as np
+from pytest import MonkeyPatch
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+monkeypatch = MonkeyPatch()
+CATEGORY_INDEX = {
+    1: {
+        "id": 1,
+        "name": "cat"
+    },
+    2: {
+        "id": 2,
+        "name": "dog"
+    },
+    3: {
+        "id": 3,
+        "name": "bird"
+    },
+}
+# Boxes in (xmin, ymin, xmax, ymax) order, the second box overlaps the first
+XYXY_BOXES = [[0.0, 0.0, 0.4, 0.4], [0.05, 0.0, 0.45, 0.4],
+              [0.5, 0.5, 1.0, 1.0], [0.6, 0.0, 1.0, 0.3]]
+
+
+def reorder(boxes, box_format):
+    """Reorder (xmin, ymin, xmax, ymax) boxes into another box format."""
+    from common.utils import BOX_COLUMNS
+
+    return np.asarray(boxes)[..., [BOX_COLUMNS.index(name)
+                                   for name in box_format]]
+
+
+class TestDetectionPostprocess(TestCase):
+
+    """Test Shared Object Detection Postprocess"""
+
+    def setUp(self):
+        """Set configuration"""
+        monkeypatch.setenv("DATATURE_EDGE_PYTHON_CONFIG",
+                           os.path.join(CURRENT_DIR, "../config/config.yaml"))
+
+    def tearDown(self):
+        """Restore environment"""
+        monkeypatch.undo()
+
+    def test_box_format(self):
+        """Test that raw boxes are read and returned in the box format"""
+        from detection_postprocess import DetectionPostprocess
+
+        classes = [[1, 1, 2, 3]]
+        scores = [[0.9, 0.8, 0.7, 0.6]]
+        for box_format in (("ymin", "xmin", "ymax", "xmax"),
+                           ("xmin", "ymin", "xmax", "ymax"),
+                           ("ymin", "ymax", "xmin", "xmax")):
+            postprocess = DetectionPostprocess(iou_threshold=0.5,
+                                               box_format=box_format)
+            boxes = reorder([XYXY_BOXES], box_format)
+            (detections, ) = postprocess(boxes, classes, scores)
+
+            self.assertEqual(detections.box_format, box_format)
+            self.assertEqual(detections.classes.tolist(), [1, 2, 3])
+            np.testing.assert_allclose(detections.boxes,
+                                       boxes[0][[0, 2, 3]])
+            np.testing.assert_array_equal(
+                detections.to_pixels(200, 100),
+                [[0, 0, 80, 40], [100, 50, 200, 100], [120, 0, 200, 30]])
+
+    def test_class_allowlist(self):
+        """Test that only allowed classes are kept, by ID or name"""
+        from detection_postprocess import DetectionPostprocess
+
+        boxes = reorder([XYXY_BOXES], ("ymin", "xmin", "ymax", "xmax"))
+        for allowlist in ([1, 3], ["cat", "bird"], ["1", "bird"]):
+            postprocess = DetectionPostprocess(
+                class_allowlist=allowlist, category_index=CATEGORY_INDEX)
+            (detections, ) = postprocess(boxes, [[0, 1, 2, 3]],
+                                         [[0.9, 0.8, 0.7, 0.6]])
+            self.assertEqual(detections.classes.tolist(), [1, 3], allowlist)
+
+    def test_class_thresholds(self):
+        """Test that class thresholds override the score threshold"""
+        from detection_postprocess import DetectionPostprocess
+
+        postprocess = DetectionPostprocess(threshold=0.5,
+                                           class_thresholds={
+                                               "dog": 0.8,
+                                               3: 0.2
+                                           },
+                                           category_index=CATEGORY_INDEX)
+        boxes = reorder([XYXY_BOXES, XYXY_BOXES],
+                        ("ymin", "xmin", "ymax", "xmax"))
+        batch = postprocess(boxes, [[1, 2, 2, 3], [1, 3, 2, 7]],
+                            [[0.4, 0.7, 0.9, 0.3], [0.6, 0.1, 0.5, 0.6]],
+                            valid=np.array([[True] * 4,
+                                            [True, True, True, False]]))
+
+        self.assertEqual([len(detections) for detections in batch], [2, 1])
+        self.assertEqual(batch[0].classes.tolist(), [2, 3])
+        np.testing.assert_allclose(batch[0].scores, [0.9, 0.3])
+        self.assertEqual(batch[1].classes.tolist(), [1])
+
+    def test_from_predictor(self):
+        """Test that the predictor box format is used"""
+        from detection_postprocess import DetectionPostprocess
+
+        predictor = SimpleNamespace(threshold=0.5,
+                                    iou_threshold=0.5,
+                                    nms_method="hard",
+                                    nms_top_k=100,
+                                    class_allowlist=None,
+                                    class_thresholds=None,
+                                    _category_index=CATEGORY_INDEX,
+                                    bbox_format=["xmin", "ymin", "xmax",
+                                                 "ymax"])
+        postprocess = DetectionPostprocess.from_predictor(predictor)
+        (detections, ) = postprocess([XYXY_BOXES], [[1, 1, 2, 3]],
+                                     [[0.9, 0.8, 0.7, 0.6]])
+        self.assertEqual(detections.box_format,
+                         ("xmin", "ymin", "xmax", "ymax"))
+        np.testing.assert_allclose(detections.boxes,
+                                   np.float32(XYXY_BOXES)[[0, 2, 3]])
+
+    def test_invalid_box_format(self):
+        """Test that invalid box formats are rejected"""
+        from detection_postprocess import DetectionPostprocess
+
+        with self.assertRaises(ValueError):
+            DetectionPostprocess(box_format=("xmin", "ymin", "xmax"))
@@ -0,0 +1,111 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   test_detections.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Object detection predictions container test case.
+"""
+
+import os
+from unittest import TestCase
+
+import numpy as np
+from pytest import MonkeyPatch
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+monkeypatch = MonkeyPatch()
+# Boxes in (ymin, xmin, ymax, xmax) order
+BOXES = [[0.1, 0.2, 0.5, 0.6], [0.0, 0.5, 1.0, 1.0], [0.25, 0.0, 0.75, 0.5]]
+# The same boxes in (xmin, ymin, xmax, ymax) order
+XYXY_BOXES = [[0.2, 0.1, 0.6, 0.5], [0.5, 0.0, 1.0, 1.0],
+              [0.0, 0.25, 0.5, 0.75]]
+
+
+class TestDetections(TestCase):
+
+    """Test Object Detection Predictions"""
+
+    def setUp(self):
+        """Set configuration"""
+        monkeypatch.setenv("DATATURE_EDGE_PYTHON_CONFIG",
+                           os.path.join(CURRENT_DIR, "../config/config.yaml"))
+
+    def tearDown(self):
+        """Restore environment"""
+        monkeypatch.undo()
+
+    def test_columns(self):
+        """Test that box columns are looked up in the box format"""
+        from common.utils import BOX_COLUMNS, Detections
+
+        detections = Detections(BOXES, [1, 2, 3], [0.9, 0.8, 0.7])
+        self.assertEqual(detections.columns("xmin", "ymax"), [1, 2])
+        detections = Detections(XYXY_BOXES, [1, 2, 3], [0.9, 0.8, 0.7],
+                                box_format=BOX_COLUMNS)
+        self.assertEqual(detections.columns("xmin", "ymax"), [0, 3])
+
+    def test_to_format(self):
+        """Test that box columns are reordered without copying the rest"""
+        from common.utils import BOX_COLUMNS, DEFAULT_BOX_FORMAT, Detections
+
+        detections = Detections(BOXES, [1, 2, 3], [0.9, 0.8, 0.7])
+        self.assertIs(detections.to_format(DEFAULT_BOX_FORMAT), detections)
+
+        xyxy = detections.to_format(BOX_COLUMNS)
+        self.assertEqual(xyxy.box_format, BOX_COLUMNS)
+        np.testing.assert_array_equal(xyxy.boxes,
+                                      np.float32(XYXY_BOXES))
+        self.assertTrue(xyxy.boxes.flags["C_CONTIGUOUS"])
+        self.assertIs(xyxy.classes, detections.classes)
+        self.assertIs(xyxy.scores, detections.scores)
+        np.testing.assert_array_equal(
+            xyxy.to_format(DEFAULT_BOX_FORMAT).boxes, detections.boxes)
+
+    def test_to_pixels(self):
+        """Test that boxes of any format convert to pixel corners"""
+        from common.utils import BOX_COLUMNS, Detections
+
+        expected = [[40, 10, 120, 50], [100, 0, 200, 100], [0, 25, 100, 75]]
+        for boxes, box_format in ((BOXES, ("ymin", "xmin", "ymax", "xmax")),
+                                  (XYXY_BOXES, BOX_COLUMNS)):
+            detections = Detections(boxes, [1, 2, 3], [0.9, 0.8, 0.7],
+                                    box_format=box_format)
+            pixels = detections.to_pixels(200, 100)
+            self.assertEqual(pixels.dtype, np.int32)
+            np.testing.assert_array_equal(pixels, expected)
+        np.testing.assert_allclose(
+            detections.to_pixels(200, 100, dtype=np.float32), expected)
+
+    def test_indexing(self):
+        """Test selecting a subset of the detections"""
+        from common.utils import BOX_COLUMNS, Detections
+
+        detections = Detections(XYXY_BOXES, [1, 2, 3], [0.9, 0.8, 0.7],
+                                box_format=BOX_COLUMNS)
+        confident = detections[detections.scores > 0.75]
+        self.assertEqual(confident.classes.tolist(), [1, 2])
+        self.assertEqual(confident.box_format, BOX_COLUMNS)
+        self.assertEqual(detections[-1].classes.tolist(), [3])
+        self.assertEqual(len(detections[1:]), 2)
+        self.assertIs(detections["boxes"], detections.boxes)
+        self.assertIsNone(detections.get("masks"))
+        with self.assertRaises(KeyError):
+            detections["labels"]  # pylint: disable=pointless-statement
+
+    def test_invalid(self):
+        """Test that invalid box formats and lengths are rejected"""
+        from common.utils import Detections
+
+        with self.assertRaises(ValueError):
+            Detections(BOXES, [1, 2, 3], [0.9, 0.8, 0.7],
+                       box_format=("xmin", "xmin", "xmax", "ymax"))
+        with self.assertRaises(ValueError):
+            Detections(BOXES, [1, 2], [0.9, 0.8, 0.7])
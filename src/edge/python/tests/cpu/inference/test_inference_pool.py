@@ -0,0 +1,149 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   test_inference_pool.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Inference worker pool test case.
+"""
+
+import os
+import queue
+import random
+import time
+from threading import Thread
+from unittest import TestCase
+
+import numpy as np
+from pytest import MonkeyPatch
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+monkeypatch = MonkeyPatch()
+
+
+class FakeEngine:
+
+    """Inference engine stand-in predicting the sum of each frame."""
+
+    def run(self, assets):
+        """Predict on a frame after a random delay."""
+        time.sleep(random.uniform(0, 0.01))
+        if assets["frame_id"] == "bad":
+            raise ValueError("Bad frame")
+        assets["predictions"] = (assets["frame_id"],
+                                 int(assets["input_frame"].sum()),
+                                 assets.get("letterbox"))
+
+
+class BrokenEngine:
+
+    """Inference engine stand-in failing to load its model."""
+
+    def __init__(self):
+        """Fail to load the model."""
+        raise OSError("Model not found")
+
+
+def frame(value):
+    """Create a small frame filled with a value."""
+    return np.full((4, 6, 3), value, dtype=np.uint8)
+
+
+class TestInferencePool(TestCase):
+
+    """Test Inference Worker Pool"""
+
+    def setUp(self):
+        """Set configuration and replace the inference engine"""
+        monkeypatch.setenv("DATATURE_EDGE_PYTHON_CONFIG",
+                           os.path.join(CURRENT_DIR, "../config/config.yaml"))
+        # Workers are forked, so they inherit the patched engine
+        monkeypatch.setattr(
+            "core.components.inference.engine.InferenceEngine", FakeEngine)
+
+    def tearDown(self):
+        """Restore inference engine and environment"""
+        monkeypatch.undo()
+
+    def test_order(self):
+        """Test that predictions are collected in submission order"""
+        from core.components.inference import InferencePool
+
+        pool = InferencePool(workers=2, slots=3,
+                             start_method="fork").start(frame(0))
+        sequences = queue.Queue()
+
+        def submit():
+            for index in range(30):
+                sequences.put(
+                    pool.submit({
+                        "frame_id": index,
+                        "input_frame": frame(index),
+                        "letterbox": (index, 0, 1.0),
+                    }))
+
+        submitter = Thread(target=submit, daemon=True)
+        submitter.start()
+        try:
+            predictions = [
+                pool.collect(sequences.get(timeout=5)) for _ in range(30)
+            ]
+        finally:
+            submitter.join(5)
+            pool.stop()
+
+        self.assertEqual(predictions, [(index, index * frame(1).size,
+                                        (index, 0, 1.0))
+                                       for index in range(30)])
+
+    def test_error(self):
+        """Test that a failed prediction only fails its own frame"""
+        from common.exceptions import PredictionException
+        from core.components.inference import InferencePool
+
+        pool = InferencePool(workers=1, start_method="fork").start(frame(0))
+        try:
+            bad = pool.submit({"frame_id": "bad", "input_frame": frame(1)})
+            good = pool.submit({"frame_id": "good", "input_frame": frame(1)})
+            with self.assertRaisesRegex(PredictionException, "Bad frame"):
+                pool.collect(bad)
+            self.assertEqual(pool.collect(good)[0], "good")
+        finally:
+            pool.stop()
+
+    def test_start_failure(self):
+        """Test that a worker failing to load the model fails the start"""
+        from common.exceptions import InferenceModuleException
+        from core.components.inference import InferencePool
+
+        monkeypatch.setattr(
+            "core.components.inference.engine.InferenceEngine",
+            BrokenEngine)
+        pool = InferencePool(workers=2, start_method="fork")
+        with self.assertRaisesRegex(InferenceModuleException,
+                                    "Model not found"):
+            pool.start(frame(0))
+        self.assertFalse(pool.started)
+
+    def test_slot_size(self):
+        """Test that slots are sized from the first frame"""
+        from core.components.inference import InferencePool
+
+        pool = InferencePool(workers=1, slot_bytes=8, start_method="fork")
+        with self.assertRaises(ValueError):
+            InferencePool(workers=1, start_method="fork").start()
+        large = np.ones((64, 64, 3), dtype=np.uint8)
+        pool.start(large)
+        assets = {"frame_id": 0, "input_frame": large}
+        try:
+            pool.run(assets)
+        finally:
+            pool.stop()
+        self.assertEqual(assets["predictions"], (0, large.size, None))
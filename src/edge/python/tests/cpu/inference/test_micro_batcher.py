@@ -0,0 +1,128 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   test_micro_batcher.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Inference micro-batching test case.
+"""
+
+import os
+import queue
+import time
+from unittest import TestCase
+
+from pytest import MonkeyPatch
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+monkeypatch = MonkeyPatch()
+
+
+def queued(*items):
+    """Create a queue holding items."""
+    items_queue = queue.Queue()
+    for item in items:
+        items_queue.put(item)
+    return items_queue
+
+
+def get_next(items_queue):
+    """Create the `get_next` callable of a queue."""
+    return lambda timeout: items_queue.get(timeout=timeout)
+
+
+class TestMicroBatcher(TestCase):
+
+    """Test Inference Micro-Batching"""
+
+    def setUp(self):
+        """Set configuration"""
+        monkeypatch.setenv("DATATURE_EDGE_PYTHON_CONFIG",
+                           os.path.join(CURRENT_DIR, "../config/config.yaml"))
+
+    def tearDown(self):
+        """Restore environment"""
+        monkeypatch.undo()
+
+    def test_max_batch(self):
+        """Test that a batch is dispatched once full"""
+        from core.components.inference import MicroBatcher
+
+        items = queued(*range(1, 10))
+        batch, ended = MicroBatcher(4, 1000).gather(0, get_next(items))
+        self.assertEqual(batch, [0, 1, 2, 3])
+        self.assertFalse(ended)
+        self.assertEqual(items.qsize(), 6)
+
+    def test_deadline(self):
+        """Test that a partial batch is dispatched at the deadline"""
+        from core.components.inference import MicroBatcher
+
+        start = time.monotonic()
+        batch, ended = MicroBatcher(4, 20).gather(0, get_next(queued(1)))
+        elapsed = time.monotonic() - start
+        self.assertEqual(batch, [0, 1])
+        self.assertFalse(ended)
+        self.assertGreaterEqual(elapsed, 0.015)
+        self.assertLess(elapsed, 1)
+
+    def test_no_wait(self):
+        """Test that only queued frames are batched without waiting"""
+        from core.components.inference import MicroBatcher
+
+        batch, _ = MicroBatcher(8).gather(0, get_next(queued(1, 2)))
+        self.assertEqual(batch, [0, 1, 2])
+
+    def test_end_of_stream(self):
+        """Test that the end of the stream ends the batch"""
+        from core.components.inference import MicroBatcher
+
+        items = queued(1, None, 2)
+        batch, ended = MicroBatcher(4, 1000).gather(0, get_next(items))
+        self.assertEqual(batch, [0, 1])
+        self.assertTrue(ended)
+
+    def test_pipeline(self):
+        """Test that batched pipeline stages keep the order of frames"""
+        from core.components.inference import MicroBatcher
+        from core.devices.pipeline import Pipeline
+
+        frame_ids = iter(range(50))
+        batches = []
+        output = []
+
+        def source():
+            frame_id = next(frame_ids, None)
+            return None if frame_id is None else {"frame_id": frame_id}
+
+        stages = [
+            ("inference", batches.append, MicroBatcher(4, 5)),
+            ("output", output.append),
+        ]
+        Pipeline(source, stages, default_queue_size=8).run()
+
+        self.assertTrue(all(1 <= len(batch) <= 4 for batch in batches))
+        self.assertEqual(
+            [assets["frame_id"] for batch in batches for assets in batch],
+            list(range(50)))
+        self.assertEqual([assets["frame_id"] for assets in output],
+                         list(range(50)))
+
+    def test_pipeline_error(self):
+        """Test that a failed batch stops the pipeline and is re-raised"""
+        from core.components.inference import MicroBatcher
+        from core.devices.pipeline import Pipeline
+
+        def infer(batch):
+            raise ValueError(f"Bad batch of {len(batch)}")
+
+        stages = [("inference", infer, MicroBatcher(4, 5))]
+        with self.assertRaisesRegex(ValueError, "Bad batch"):
+            Pipeline(lambda: {"frame_id": 0}, stages).run()
@@ -0,0 +1,236 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   test_nms.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Vectorised non-max suppression test case.
+"""
+
+import math
+import os
+from unittest import TestCase
+
+import numpy as np
+from pytest import MonkeyPatch
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+monkeypatch = MonkeyPatch()
+
+
+def make_boxes(count, num_classes=3, seed=0):
+    """Generate overlapping (xmin, ymin, xmax, ymax) boxes.
+
+    Args:
+        count: Number of boxes.
+        num_classes: Number of classes.
+        seed: Random seed.
+
+    Returns:
+        Tuple of (boxes, classes, scores) arrays.
+    """
+    rng = np.random.default_rng(seed)
+    corners = rng.uniform(0, 100, (count, 2))
+    sizes = rng.uniform(10, 40, (count, 2))
+    boxes = np.concatenate([corners, corners + sizes], axis=1)
+    return (boxes.astype(np.float32), rng.integers(0, num_classes, count),
+            rng.uniform(0.05, 1.0, count).astype(np.float32))
+
+
+def reference_iou(box, other, diou=False):
+    """Compute the IoU (or DIoU) of two boxes one coordinate at a time."""
+    inter_w = max(0.0, min(box[2], other[2]) - max(box[0], other[0]))
+    inter_h = max(0.0, min(box[3], other[3]) - max(box[1], other[1]))
+    inter = inter_w * inter_h
+    union = ((box[2] - box[0]) * (box[3] - box[1]) +
+             (other[2] - other[0]) * (other[3] - other[1]) - inter)
+    iou = inter / union if union > 0 else 0.0
+    if diou:
+        center_distance = (
+            (other[0] + other[2] - box[0] - box[2])**2 +
+            (other[1] + other[3] - box[1] - box[3])**2) / 4
+        enclose_diagonal = (
+            (max(box[2], other[2]) - min(box[0], other[0]))**2 +
+            (max(box[3], other[3]) - min(box[1], other[1]))**2)
+        iou -= center_distance / enclose_diagonal
+    return iou
+
+
+def reference_nms(boxes,
+                  classes,
+                  scores,
+                  iou_threshold,
+                  method="hard",
+                  top_k=None,
+                  confidence=0.0,
+                  sigma=0.5):
+    """Carry out non-max suppression of each class with a plain loop.
+
+    Returns:
+        Tuple of (indices, scores) of the kept boxes, sorted by
+            descending score.
+    """
+    boxes = boxes.astype(np.float64).tolist()
+    order = sorted(range(len(scores)), key=lambda index: -scores[index])
+    order = order[:top_k]
+    kept = []
+    for class_id in set(classes[order].tolist()):
+        remaining = {
+            index: float(scores[index])
+            for index in order if classes[index] == class_id
+        }
+        while remaining:
+            best = max(remaining, key=remaining.get)
+            kept.append((best, remaining.pop(best)))
+            for index in list(remaining):
+                iou = reference_iou(boxes[best], boxes[index],
+                                    method == "diou")
+                if method in ("hard", "diou"):
+                    if iou > iou_threshold:
+                        del remaining[index]
+                    continue
+                if method == "soft_gaussian":
+                    remaining[index] *= math.exp(-iou**2 / sigma)
+                elif iou > iou_threshold:
+                    remaining[index] *= 1 - iou
+                if remaining[index] < confidence:
+                    del remaining[index]
+    kept.sort(key=lambda item: -item[1])
+    return [index for index, _ in kept], [score for _, score in kept]
+
+
+class TestNMS(TestCase):
+
+    """Test Vectorised Non-Max Suppression"""
+
+    def setUp(self):
+        """Set configuration"""
+        monkeypatch.setenv("DATATURE_EDGE_PYTHON_CONFIG",
+                           os.path.join(CURRENT_DIR, "../config/config.yaml"))
+
+    def tearDown(self):
+        """Restore environment"""
+        monkeypatch.undo()
+
+    def assert_matches_reference(self, boxes, classes, scores, **options):
+        """Check NMS against the reference loop on both IoU paths."""
+        import common.utils.nms
+        from common.utils import nms_indices
+
+        expected_indices, expected_scores = reference_nms(
+            boxes, classes, scores, **options)
+        for dense_limit in (0, len(scores)):
+            monkeypatch.setattr(common.utils.nms, "DENSE_LIMIT", dense_limit)
+            indices, kept_scores = nms_indices(boxes, classes, scores,
+                                               **options)
+            self.assertEqual(indices.tolist(), expected_indices,
+                             (options, dense_limit))
+            np.testing.assert_allclose(kept_scores,
+                                       expected_scores,
+                                       rtol=1e-5)
+
+    def test_hard(self):
+        """Test class-aware hard NMS"""
+        boxes, classes, scores = make_boxes(120)
+        self.assert_matches_reference(boxes,
+                                      classes,
+                                      scores,
+                                      iou_threshold=0.3)
+
+    def test_class_offset(self):
+        """Test that boxes of different classes never suppress each other"""
+        from common.utils import nms_indices
+
+        boxes = np.array([[0, 0, 10, 10]] * 3, np.float32)
+        indices, _ = nms_indices(boxes, [0, 1, 0], [0.9, 0.8, 0.7], 0.5)
+        self.assertEqual(indices.tolist(), [0, 1])
+
+    def test_top_k(self):
+        """Test that only the top k boxes take part in NMS"""
+        boxes, classes, scores = make_boxes(120)
+        self.assert_matches_reference(boxes,
+                                      classes,
+                                      scores,
+                                      iou_threshold=0.3,
+                                      top_k=40)
+
+    def test_soft(self):
+        """Test linear and gaussian Soft-NMS"""
+        boxes, classes, scores = make_boxes(120)
+        self.assert_matches_reference(boxes,
+                                      classes,
+                                      scores,
+                                      iou_threshold=0.3,
+                                      method="soft_linear",
+                                      confidence=0.1)
+        self.assert_matches_reference(boxes,
+                                      classes,
+                                      scores,
+                                      iou_threshold=0.3,
+                                      method="soft_gaussian",
+                                      confidence=0.1,
+                                      sigma=0.3)
+
+    def test_diou(self):
+        """Test DIoU NMS"""
+        boxes, classes, scores = make_boxes(120)
+        self.assert_matches_reference(boxes,
+                                      classes,
+                                      scores,
+                                      iou_threshold=0.2,
+                                      method="diou")
+
+    def test_dense_limit(self):
+        """Test both sides of the dense IoU cutoff"""
+        from common.utils import nms_indices
+        from common.utils.nms import DENSE_LIMIT
+
+        for count in (DENSE_LIMIT, DENSE_LIMIT + 1):
+            boxes, classes, scores = make_boxes(count, seed=count)
+            for method in ("hard", "soft_linear"):
+                expected_indices, expected_scores = reference_nms(
+                    boxes,
+                    classes,
+                    scores,
+                    0.3,
+                    method=method,
+                    confidence=0.1)
+                indices, kept_scores = nms_indices(boxes,
+                                                   classes,
+                                                   scores,
+                                                   0.3,
+                                                   method=method,
+                                                   confidence=0.1)
+                self.assertEqual(indices.tolist(), expected_indices,
+                                 (count, method))
+                np.testing.assert_allclose(kept_scores,
+                                           expected_scores,
+                                           rtol=1e-5)
+
+    def test_xywh(self):
+        """Test boxes with top left coordinates, width and height"""
+        from common.utils import nms_indices
+
+        boxes, classes, scores = make_boxes(60)
+        xywh = boxes.copy()
+        xywh[:, 2:] -= xywh[:, :2]
+        expected, _ = nms_indices(boxes, classes, scores, 0.3)
+        indices, _ = nms_indices(xywh, classes, scores, 0.3,
+                                 box_format="xywh")
+        self.assertEqual(indices.tolist(), expected.tolist())
+
+    def test_invalid(self):
+        """Test that unsupported methods and box formats are rejected"""
+        from common.utils import nms_indices
+
+        with self.assertRaises(ValueError):
+            nms_indices(np.zeros((1, 4)), [0], [1.0], method="matrix")
+        with self.assertRaises(ValueError):
+            nms_indices(np.zeros((1, 4)), [0], [1.0], box_format="cxcywh")
@@ -0,0 +1,132 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   test_yolo_decoder.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   YOLO head decoder test case.
+"""
+
+import os
+from unittest import TestCase
+
+import numpy as np
+from pytest import MonkeyPatch
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+monkeypatch = MonkeyPatch()
+INPUT_SHAPE = (128, 128)
+
+
+def make_outputs(num_classes, confidence, batch_size=2, seed=0):
+    """Generate YOLO head outputs with objectness around a threshold.
+
+    The objectness logits of the cells are spread at, one float32 step
+    around, and slightly further around the logit of the confidence
+    threshold. Most cells hold one class with a saturated score, so that
+    their final score is exactly their objectness.
+
+    Args:
+        num_classes: Number of classes.
+        confidence: Score threshold.
+        batch_size: Number of images.
+        seed: Random seed.
+
+    Returns:
+        List of arrays of shape (N, grid, grid, 3 * (5 + num_classes)).
+    """
+    rng = np.random.default_rng(seed)
+    logit = np.float32(np.log(confidence / (1 - confidence)))
+    near = [
+        logit,
+        np.nextafter(logit, np.float32(-np.inf)),
+        np.nextafter(logit, np.float32(np.inf)),
+    ]
+    near += [logit + delta for delta in (-1e-3, 1e-3, -1e-1, 1e-1, -3, 3)]
+    near = np.array(near, dtype=np.float32)
+
+    outputs = []
+    for stride in (32, 16, 8):
+        grid = INPUT_SHAPE[0] // stride
+        output = rng.normal(0, 1, (batch_size, grid, grid, 3,
+                                   5 + num_classes)).astype(np.float32)
+        output[..., 4] = rng.choice(near, output.shape[:-1])
+        best = rng.integers(0, num_classes, output.shape[:-1])
+        saturated = rng.random(output.shape[:-1]) < 0.8
+        np.put_along_axis(output[..., 5:], best[..., np.newaxis],
+                          np.where(saturated, 30.0, 2.0)[..., np.newaxis],
+                          axis=-1)
+        outputs.append(output.reshape(batch_size, grid, grid, -1))
+    return outputs
+
+
+def passing_rows(rows, num_classes, confidence):
+    """Get the decoded rows whose final score passes the threshold."""
+    rows = rows.reshape(-1, rows.shape[-1])
+    scores = rows[:, 4]
+    if num_classes > 1:
+        scores = scores * rows[:, 5:].max(axis=1)
+    return rows[scores >= confidence]
+
+
+class TestYoloDecoder(TestCase):
+
+    """Test YOLO Head Decoder"""
+
+    def setUp(self):
+        """Set configuration"""
+        monkeypatch.setenv("DATATURE_EDGE_PYTHON_CONFIG",
+                           os.path.join(CURRENT_DIR, "../config/config.yaml"))
+
+    def tearDown(self):
+        """Restore environment"""
+        monkeypatch.undo()
+
+    def test_sparse(self):
+        """Test that sparse decoding keeps every passing cell"""
+        from common.constants import YOLO_ANCHORS
+        from common.utils import YoloDecoder
+
+        for num_classes in (1, 4):
+            dense = YoloDecoder(YOLO_ANCHORS, num_classes, INPUT_SHAPE)
+            sparse = YoloDecoder(YOLO_ANCHORS,
+                                 num_classes,
+                                 INPUT_SHAPE,
+                                 sparse=True)
+            for confidence in (0.05, 0.1, 0.3, 0.5, 0.9):
+                outputs = make_outputs(num_classes, confidence)
+                expected = passing_rows(dense.decode(outputs), num_classes,
+                                        confidence)
+                kept = sparse.decode(outputs, confidence)
+                # Cells well below the threshold are skipped
+                self.assertLess(kept.shape[1],
+                                np.prod(dense.decode(outputs).shape[:2]))
+                result = passing_rows(kept, num_classes, confidence)
+
+                self.assertGreater(len(expected), 0)
+                self.assertEqual(len(result), len(expected),
+                                 (num_classes, confidence))
+                np.testing.assert_allclose(result, expected, rtol=1e-6)
+
+    def test_confidence_bounds(self):
+        """Test sparse decoding at confidence thresholds of 0 and 1"""
+        from common.constants import YOLO_ANCHORS
+        from common.utils import YoloDecoder
+
+        outputs = make_outputs(4, 0.5)
+        dense = YoloDecoder(YOLO_ANCHORS, 4, INPUT_SHAPE).decode(outputs)
+        sparse = YoloDecoder(YOLO_ANCHORS, 4, INPUT_SHAPE, sparse=True)
+        np.testing.assert_allclose(sparse.decode(outputs, 0.0)[0],
+                                   dense.reshape(-1, dense.shape[-1]),
+                                   rtol=1e-6)
+        self.assertEqual(sparse.decode(outputs, 1.0).shape, (1, 0, 9))
+        # Dense decoding ignores the confidence threshold
+        np.testing.assert_array_equal(
+            sparse.decode(outputs).shape, dense.shape)
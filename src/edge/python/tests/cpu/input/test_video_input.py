@@ -0,0 +1,114 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   test_video_input.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Video input frame range test case.
+"""
+
+import os
+import tempfile
+from unittest import TestCase
+
+import cv2
+import numpy as np
+from pytest import MonkeyPatch
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+monkeypatch = MonkeyPatch()
+FPS = 10
+FRAMES = 20
+
+
+class OvercountingCapture:
+
+    """Video capture whose container reports more frames than it holds."""
+
+    def __init__(self, video_path, capture=cv2.VideoCapture):
+        """Open the video.
+
+        Args:
+            video_path: Path of the video file.
+            capture: Video capture class to wrap.
+        """
+        self._capture = capture(video_path)
+
+    def __getattr__(self, name):
+        """Forward everything else to the wrapped capture."""
+        return getattr(self._capture, name)
+
+    def get(self, prop_id):
+        """Get a capture property, overstating the frame count."""
+        if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+            return FRAMES * 5
+        return self._capture.get(prop_id)
+
+
+class TestVideoInput(TestCase):
+
+    """Test Video Input Frame Range"""
+
+    def setUp(self):
+        """Set configuration and write a 2 second video"""
+        monkeypatch.setenv("DATATURE_EDGE_PYTHON_CONFIG",
+                           os.path.join(CURRENT_DIR, "../config/config.yaml"))
+        self._folder = tempfile.TemporaryDirectory()
+        self.video_path = os.path.join(self._folder.name, "video.avi")
+        writer = cv2.VideoWriter(self.video_path,
+                                 cv2.VideoWriter_fourcc(*"MJPG"), FPS,
+                                 (32, 32))
+        for index in range(FRAMES):
+            writer.write(np.full((32, 32, 3), index * 10, np.uint8))
+        writer.release()
+
+    def tearDown(self):
+        """Restore environment"""
+        self._folder.cleanup()
+        monkeypatch.undo()
+
+    def test_range(self):
+        """Test that only the frames of the time range are loaded"""
+        from core.devices.cpu.modules.input.video.module import Input
+
+        video_input = Input(video_path=self.video_path,
+                            start_time=1.0,
+                            end_time=1.5,
+                            stride=2).run()
+        frame_ids = []
+        while not video_input.stopped:
+            frame_ids.append(video_input.load_data({})["frame_id"])
+
+        self.assertEqual(
+            frame_ids,
+            [f"{self.video_path}_{index}" for index in (10, 12, 14)])
+
+    def test_empty_range(self):
+        """Test that time ranges without frames are rejected"""
+        from common.exceptions import InvalidConfigException
+        from core.devices.cpu.modules.input.video.module import Input
+
+        for start_time, end_time in ((5.0, None), (1.0, 1.0), (1.5, 0.5)):
+            with self.assertRaises(InvalidConfigException):
+                Input(video_path=self.video_path,
+                      start_time=start_time,
+                      end_time=end_time)
+
+    def test_no_frames_decoded(self):
+        """Test that a reader finishing without frames ends the stream"""
+        from common.exceptions import EmptyFrameBufferException
+        from core.devices.cpu.modules.input.video.module import Input
+
+        monkeypatch.setattr(cv2, "VideoCapture", OvercountingCapture)
+        video_input = Input(video_path=self.video_path, start_time=5.0).run()
+
+        with self.assertRaises(EmptyFrameBufferException):
+            video_input.load_data({})
+        self.assertTrue(video_input.stopped)
@@ -0,0 +1,171 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   test_async_output.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Asynchronous output module test case.
+"""
+
+import os
+import threading
+from unittest import TestCase
+
+from pytest import MonkeyPatch
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+monkeypatch = MonkeyPatch()
+
+
+def make_output(fail_on=None):
+    """Create an output module recording the frames it writes.
+
+    Args:
+        fail_on: Optional frame ID the output module fails on.
+
+    Returns:
+        Output module, which holds each frame until its `release` event
+            is set.
+    """
+    from abstract_output import AbstractOutput
+
+    class FakeOutput(AbstractOutput):
+
+        """Output module stand-in recording written frame IDs."""
+
+        def __init__(self):
+            """Initialize fake output."""
+            super().__init__(name="fake")
+            self.written = []
+            self.busy = threading.Event()
+            self.release = threading.Event()
+
+        def run(self, assets):
+            """Record a frame once released."""
+            self.busy.set()
+            self.release.wait(timeout=5)
+            if assets["frame_id"] == fail_on:
+                raise RuntimeError("sink failed")
+            self.written.append(assets["frame_id"])
+
+    return FakeOutput()
+
+
+class TestAsyncOutput(TestCase):
+
+    """Test Asynchronous Output Module"""
+
+    def setUp(self):
+        """Set configuration"""
+        monkeypatch.setenv("DATATURE_EDGE_PYTHON_CONFIG",
+                           os.path.join(CURRENT_DIR, "../config/config.yaml"))
+
+    def tearDown(self):
+        """Restore environment"""
+        monkeypatch.undo()
+
+    def test_block(self):
+        """Test that the block policy writes every frame in order"""
+        from core.devices.async_output import AsyncOutput
+
+        output = make_output()
+        async_output = AsyncOutput(output, size=2, policy="block")
+        producer = threading.Thread(target=lambda: [
+            async_output.run({"frame_id": frame_id})
+            for frame_id in range(6)
+        ])
+        producer.start()
+        output.busy.wait(timeout=5)
+        producer.join(timeout=0.2)
+        self.assertTrue(producer.is_alive())
+        output.release.set()
+        producer.join(timeout=5)
+        async_output.stop()
+
+        self.assertEqual(output.written, list(range(6)))
+        self.assertEqual(async_output.stats()["written"], 6)
+        self.assertEqual(async_output.stats()["dropped"], 0)
+
+    def test_drop_oldest(self):
+        """Test that the drop_oldest policy keeps the newest frames"""
+        from core.devices.async_output import AsyncOutput
+
+        output = make_output()
+        async_output = AsyncOutput(output, size=2, policy="drop_oldest")
+        async_output.run({"frame_id": 0})
+        output.busy.wait(timeout=5)
+        for frame_id in range(1, 5):
+            async_output.run({"frame_id": frame_id})
+        output.release.set()
+        async_output.stop()
+
+        self.assertEqual(output.written, [0, 3, 4])
+        self.assertEqual(async_output.stats()["submitted"], 5)
+        self.assertEqual(async_output.stats()["dropped"], 2)
+
+    def test_drop_newest(self):
+        """Test that the drop_newest policy keeps the queued frames"""
+        from core.devices.async_output import AsyncOutput
+
+        output = make_output()
+        async_output = AsyncOutput(output, size=2, policy="drop_newest")
+        async_output.run({"frame_id": 0})
+        output.busy.wait(timeout=5)
+        for frame_id in range(1, 5):
+            async_output.run({"frame_id": frame_id})
+        output.release.set()
+        async_output.stop()
+
+        self.assertEqual(output.written, [0, 1, 2])
+        self.assertEqual(async_output.stats()["dropped"], 2)
+
+    def test_error(self):
+        """Test that a failure of the output is raised on the next frame"""
+        from common.exceptions import OutputModuleException
+        from core.devices.async_output import AsyncOutput
+
+        output = make_output(fail_on=1)
+        async_output = AsyncOutput(output, size=2)
+        for frame_id in range(3):
+            async_output.run({"frame_id": frame_id})
+        output.release.set()
+        # pylint: disable=protected-access
+        async_output._worker.join(timeout=5)
+
+        with self.assertRaises(OutputModuleException):
+            async_output.run({"frame_id": 3})
+        async_output.stop()
+        self.assertEqual(output.written, [0])
+        self.assertTrue(output.stopped)
+
+    def test_stop(self):
+        """Test that stopping flushes queued frames and stops the output"""
+        from core.devices.async_output import AsyncOutput
+
+        output = make_output()
+        async_output = AsyncOutput(output, size=3)
+        for frame_id in range(3):
+            async_output.run({"frame_id": frame_id})
+        self.assertFalse(async_output.stopped)
+        output.release.set()
+        async_output.stop()
+
+        self.assertEqual(output.written, [0, 1, 2])
+        self.assertTrue(output.stopped)
+        self.assertTrue(async_output.stopped)
+        async_output.run({"frame_id": 3})
+        self.assertEqual(async_output.stats()["submitted"], 3)
+
+    def test_invalid_policy(self):
+        """Test that unsupported policies are rejected"""
+        from core.devices.async_output import AsyncOutput
+
+        with self.assertRaises(ValueError):
+            AsyncOutput(make_output(), policy="drop_all")
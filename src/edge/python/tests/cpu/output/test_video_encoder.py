@@ -0,0 +1,124 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   test_video_encoder.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Background video encoder test case.
+"""
+
+import os
+import tempfile
+from unittest import TestCase
+
+import cv2
+import numpy as np
+from pytest import MonkeyPatch
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+monkeypatch = MonkeyPatch()
+FRAME_SIZE = (64, 48)
+
+
+def make_frame(index):
+    """Create a uniform BGR frame whose brightness encodes its index."""
+    width, height = FRAME_SIZE
+    return np.full((height, width, 3), index * 20, dtype=np.uint8)
+
+
+def read_brightness(path):
+    """Read the mean brightness of each frame of a video."""
+    capture = cv2.VideoCapture(path)
+    brightness = []
+    while True:
+        success, frame = capture.read()
+        if not success:
+            break
+        brightness.append(int(round(frame.mean() / 20)))
+    capture.release()
+    return brightness
+
+
+class TestVideoEncoder(TestCase):
+
+    """Test Background Video Encoder"""
+
+    def setUp(self):
+        """Set configuration"""
+        monkeypatch.setenv("DATATURE_EDGE_PYTHON_CONFIG",
+                           os.path.join(CURRENT_DIR, "../config/config.yaml"))
+        self._folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Restore environment"""
+        self._folder.cleanup()
+        monkeypatch.undo()
+
+    def test_order(self):
+        """Test that every frame is encoded in order"""
+        from common.utils import VideoEncoder
+
+        path = os.path.join(self._folder.name, "video.avi")
+        encoder = VideoEncoder(path,
+                               10,
+                               FRAME_SIZE,
+                               codec="MJPG",
+                               slots=2,
+                               start_method="fork").start()
+        for index in range(10):
+            encoder.write(make_frame(index))
+
+        self.assertEqual(encoder.stop(), [path])
+        self.assertEqual(read_brightness(path), list(range(10)))
+
+    def test_segments(self):
+        """Test that the video is split into segments of a duration"""
+        from common.utils import VideoEncoder
+        from common.utils.video_encoder import segment_path
+
+        path = os.path.join(self._folder.name, "video.avi")
+        encoder = VideoEncoder(path,
+                               10,
+                               FRAME_SIZE,
+                               codec="MJPG",
+                               segment_duration=0.4,
+                               start_method="fork").start()
+        for index in range(10):
+            encoder.write(make_frame(index))
+
+        segments = [segment_path(path, index) for index in range(3)]
+        self.assertEqual(encoder.stop(), segments)
+        self.assertEqual([read_brightness(each) for each in segments],
+                         [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+
+    def test_frame_size(self):
+        """Test that frames larger than the video frame size are rejected"""
+        from common.utils import VideoEncoder
+
+        path = os.path.join(self._folder.name, "video.avi")
+        encoder = VideoEncoder(path,
+                               10,
+                               FRAME_SIZE,
+                               codec="MJPG",
+                               start_method="fork").start()
+        with self.assertRaises(ValueError):
+            encoder.write(np.zeros((96, 128, 3), np.uint8))
+        encoder.write(make_frame(1))
+        self.assertEqual(encoder.stop(), [path])
+        self.assertEqual(read_brightness(path), [1])
+
+    def test_stop_before_start(self):
+        """Test that stopping an encoder that never started is a no-op"""
+        from common.utils import VideoEncoder
+
+        path = os.path.join(self._folder.name, "video.avi")
+        encoder = VideoEncoder(path, 10, FRAME_SIZE, start_method="fork")
+        self.assertEqual(encoder.stop(), [])
+        self.assertFalse(os.path.exists(path))
@@ -0,0 +1,122 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   test_pipeline.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Pipelined engine execution test case.
+"""
+
+import os
+import random
+import time
+from threading import Thread
+from unittest import TestCase
+
+from pytest import MonkeyPatch
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+monkeypatch = MonkeyPatch()
+
+
+def counting_source(frames):
+    """Create a source producing the assets of a number of frames."""
+    frame_ids = iter(range(frames))
+
+    def source():
+        frame_id = next(frame_ids, None)
+        return None if frame_id is None else {"frame_id": frame_id}
+
+    return source
+
+
+def jitter(assets):
+    """Process a frame for a random short time."""
+    time.sleep(random.uniform(0, 0.002))
+    assets.setdefault("stages", 0)
+    assets["stages"] += 1
+
+
+class TestPipeline(TestCase):
+
+    """Test Pipelined Engine Execution"""
+
+    def setUp(self):
+        """Set configuration"""
+        monkeypatch.setenv("DATATURE_EDGE_PYTHON_CONFIG",
+                           os.path.join(CURRENT_DIR, "../config/config.yaml"))
+
+    def tearDown(self):
+        """Restore environment"""
+        monkeypatch.undo()
+
+    def test_order(self):
+        """Test that frames leave the pipeline in order"""
+        from core.devices.pipeline import Pipeline
+
+        output = []
+        stages = [
+            ("preprocessors", jitter),
+            ("inference", jitter),
+            ("output", output.append),
+        ]
+        Pipeline(counting_source(200), stages,
+                 queue_sizes={"inference": 4}).run()
+
+        self.assertEqual([assets["frame_id"] for assets in output],
+                         list(range(200)))
+        self.assertTrue(all(assets["stages"] == 2 for assets in output))
+
+    def test_error(self):
+        """Test that a stage failure stops the pipeline and is re-raised"""
+        from core.devices.pipeline import Pipeline
+
+        def fail(assets):
+            if assets["frame_id"] == 5:
+                raise ValueError("Bad frame")
+
+        output = []
+        pipeline = Pipeline(counting_source(1000), [
+            ("inference", fail),
+            ("output", output.append),
+        ])
+        with self.assertRaisesRegex(ValueError, "Bad frame"):
+            pipeline.run()
+        self.assertTrue(pipeline.stopped)
+        # Frames queued behind the failure are dropped, and no frame
+        # reaches the output out of order
+        frame_ids = [assets["frame_id"] for assets in output]
+        self.assertEqual(frame_ids, list(range(len(frame_ids))))
+        self.assertLessEqual(len(frame_ids), 5)
+
+    def test_source_error(self):
+        """Test that a source failure is re-raised"""
+        from core.devices.pipeline import Pipeline
+
+        def source():
+            raise OSError("Input lost")
+
+        with self.assertRaisesRegex(OSError, "Input lost"):
+            Pipeline(source, [("output", lambda assets: None)]).run()
+
+    def test_stop(self):
+        """Test that stopping an endless pipeline returns promptly"""
+        from core.devices.pipeline import Pipeline
+
+        def source():
+            return {"frame_id": 0}
+
+        pipeline = Pipeline(source, [("output", jitter)])
+        worker = Thread(target=pipeline.run, daemon=True)
+        worker.start()
+        time.sleep(0.05)
+        pipeline.stop()
+        worker.join(5)
+        self.assertFalse(worker.is_alive())
@@ -0,0 +1,208 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   test_transforms.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Fused image transforms test case.
+"""
+
+import os
+from unittest import TestCase
+
+import numpy as np
+from pytest import MonkeyPatch
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+monkeypatch = MonkeyPatch()
+SWAP = {"color_convert": {"code": "BGR2RGB"}}
+NORMALIZE = {
+    "normalize": {
+        "mean": [0.485, 0.456, 0.406],
+        "std": [0.229, 0.224, 0.225],
+        "scale": 1 / 255
+    }
+}
+NCHW = {"to_layout": {"layout": "NCHW"}}
+NHWC = {"to_layout": {"layout": "NHWC"}}
+
+
+def make_frame():
+    """Create an HWC uint8 frame with distinct channels."""
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (6, 5, 3), dtype=np.uint8)
+
+
+def sequential(frame, tools):
+    """Apply the arithmetic tools one at a time in float64.
+
+    Args:
+        frame: HWC frame.
+        tools: List of single-key dictionaries mapping a tool name to
+            its parameters.
+
+    Returns:
+        Transformed frame, with integer outputs rounded and saturated.
+    """
+    values = frame.astype(np.float64)
+    dtype = frame.dtype
+    for transform in tools:
+        ((name, params), ) = transform.items()
+        if name == "color_convert":
+            values = values[..., ::-1]
+        elif name == "normalize":
+            values = (values * params.get("scale", 1.0) - np.asarray(
+                params.get("mean", 0.0))) / np.asarray(params.get("std", 1.0))
+            dtype = np.dtype(np.float32)
+        elif name == "to_dtype":
+            dtype = np.dtype(params["dtype"])
+        elif name == "to_layout":
+            if params["layout"] == "NCHW":
+                values = np.transpose(values, (2, 0, 1))
+            values = values[np.newaxis]
+    if dtype.kind in "iu":
+        info = np.iinfo(dtype)
+        values = np.clip(np.rint(values), info.min, info.max)
+    return values.astype(dtype)
+
+
+class TestTransforms(TestCase):
+
+    """Test Fused Image Transforms"""
+
+    def setUp(self):
+        """Set configuration"""
+        monkeypatch.setenv("DATATURE_EDGE_PYTHON_CONFIG",
+                           os.path.join(CURRENT_DIR, "../config/config.yaml"))
+
+    def tearDown(self):
+        """Restore environment"""
+        monkeypatch.undo()
+
+    def assert_fused(self, tools):
+        """Check the compiled kernel against the sequential tools."""
+        from core.components.data.preprocessors.transforms.module import (
+            _Kernel,
+        )
+
+        kernel = _Kernel()
+        for transform in tools:
+            ((name, params), ) = transform.items()
+            getattr(kernel, name)(**params)
+        frame = make_frame()
+        output = kernel.compile()(frame, {})
+        expected = sequential(frame, tools)
+
+        self.assertEqual(output.dtype, expected.dtype, tools)
+        self.assertEqual(output.shape, expected.shape, tools)
+        if expected.dtype.kind == "f":
+            np.testing.assert_allclose(output, expected, rtol=1e-5,
+                                       atol=1e-5)
+        else:
+            np.testing.assert_array_equal(output, expected)
+
+    def test_swap(self):
+        """Test channel swapping, alone and around normalisation"""
+        self.assert_fused([SWAP])
+        self.assert_fused([SWAP, SWAP])
+        self.assert_fused([SWAP, NORMALIZE])
+        self.assert_fused([NORMALIZE, SWAP])
+
+    def test_normalize(self):
+        """Test scalar and per-channel normalisation"""
+        self.assert_fused([NORMALIZE])
+        self.assert_fused([{"normalize": {"scale": 1 / 127.5, "mean": 1.0}}])
+        self.assert_fused([
+            {
+                "normalize": {
+                    "scale": 1 / 255
+                }
+            },
+            {
+                "normalize": {
+                    "mean": [0.5, 0.4, 0.3],
+                    "std": 0.5
+                }
+            },
+        ])
+
+    def test_dtype(self):
+        """Test uint8 and float32 outputs"""
+        self.assert_fused([{"to_dtype": {"dtype": "float32"}}])
+        self.assert_fused([NORMALIZE, {"to_dtype": {"dtype": "float32"}}])
+        self.assert_fused([
+            {
+                "normalize": {
+                    "scale": 0.5,
+                    "mean": -0.3
+                }
+            },
+            {
+                "to_dtype": {
+                    "dtype": "uint8"
+                }
+            },
+        ])
+
+    def test_layout(self):
+        """Test CHW and HWC batched outputs"""
+        for layout in (NCHW, NHWC):
+            self.assert_fused([layout])
+            self.assert_fused([SWAP, NORMALIZE, layout])
+            self.assert_fused(
+                [NORMALIZE, {
+                    "to_dtype": {
+                        "dtype": "float32"
+                    }
+                }, SWAP, layout])
+
+    def test_saturation(self):
+        """Test that out of range integer outputs saturate"""
+        for dtype in ("uint8", "int8", "int16"):
+            self.assert_fused([
+                {
+                    "normalize": {
+                        "scale": 2.0,
+                        "mean": [100.3, -60.3, 0.0]
+                    }
+                },
+                {
+                    "to_dtype": {
+                        "dtype": dtype
+                    }
+                },
+                SWAP,
+                NCHW,
+            ])
+
+        from core.components.data.preprocessors.transforms.module import (
+            _Kernel,
+        )
+
+        kernel = _Kernel()
+        kernel.normalize(mean=-100.0)
+        kernel.to_dtype("uint8")
+        output = kernel.compile()(np.full((1, 1, 3), 200, np.uint8), {})
+        self.assertEqual(output.ravel().tolist(), [255, 255, 255])
+
+    def test_preprocessor(self):
+        """Test that the preprocessor runs the fused tools"""
+        from core.components.data.preprocessors.transforms.module import (
+            Preprocessor,
+        )
+
+        tools = [SWAP, NORMALIZE, NCHW]
+        frame = make_frame()
+        assets = {"input_frame": frame}
+        Preprocessor(tools=tools).run(assets)
+        np.testing.assert_allclose(assets["input_frame"],
+                                   sequential(frame, tools),
+                                   rtol=1e-5,
+                                   atol=1e-5)
@@ -0,0 +1,144 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   test_frame_buffer.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Capture frame buffer test case.
+"""
+
+import os
+import threading
+import time
+from unittest import TestCase
+
+from pytest import MonkeyPatch
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+monkeypatch = MonkeyPatch()
+
+
+class TestFrameBuffer(TestCase):
+
+    """Test Capture Frame Buffer"""
+
+    def setUp(self):
+        """Set configuration"""
+        monkeypatch.setenv("DATATURE_EDGE_PYTHON_CONFIG",
+                           os.path.join(CURRENT_DIR, "../config/config.yaml"))
+
+    def tearDown(self):
+        """Restore environment"""
+        monkeypatch.undo()
+
+    def test_latest(self):
+        """Test that the latest policy only keeps the freshest frame"""
+        from common.utils import FrameBuffer
+
+        buffer = FrameBuffer("latest", capacity=4)
+        for frame in range(3):
+            self.assertTrue(buffer.put(frame))
+        self.assertEqual(len(buffer), 1)
+        self.assertEqual(buffer.dropped, 2)
+        self.assertEqual(buffer.get(timeout=0), 2)
+
+    def test_fifo(self):
+        """Test that the fifo policy drops the oldest frame when full"""
+        from common.utils import FrameBuffer
+
+        buffer = FrameBuffer("fifo", capacity=3)
+        for frame in range(5):
+            buffer.put(frame)
+        self.assertEqual(buffer.dropped, 2)
+        self.assertEqual([buffer.get(timeout=0) for _ in range(3)],
+                         [2, 3, 4])
+        self.assertIsNone(buffer.get(timeout=0))
+
+    def test_every_nth(self):
+        """Test that the every_nth policy keeps one of every nth frame"""
+        from common.utils import FrameBuffer
+
+        buffer = FrameBuffer("every_nth", capacity=10, nth=3)
+        kept = [buffer.put(frame) for frame in range(7)]
+        self.assertEqual(kept, [True, False, False, True, False, False, True])
+        self.assertEqual([buffer.get(timeout=0) for _ in range(3)],
+                         [0, 3, 6])
+        self.assertEqual(buffer.dropped, 0)
+
+    def test_block(self):
+        """Test that a blocking put waits for a free slot"""
+        from common.utils import FrameBuffer
+
+        buffer = FrameBuffer("fifo", capacity=1)
+        buffer.put(0)
+        producer = threading.Thread(target=buffer.put,
+                                    args=(1, ),
+                                    kwargs={"block": True})
+        producer.start()
+        time.sleep(0.1)
+        self.assertTrue(producer.is_alive())
+        self.assertEqual(buffer.get(timeout=1), 0)
+        producer.join(timeout=1)
+        self.assertFalse(producer.is_alive())
+        self.assertEqual(buffer.get(timeout=0), 1)
+        self.assertEqual(buffer.dropped, 0)
+
+    def test_timeout(self):
+        """Test that get returns None when no frame arrives in time"""
+        from common.utils import FrameBuffer
+
+        buffer = FrameBuffer()
+        start = time.monotonic()
+        self.assertIsNone(buffer.get(timeout=0.1))
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_close(self):
+        """Test that closing wakes up consumers after draining"""
+        from common.utils import FrameBuffer
+
+        buffer = FrameBuffer("fifo", capacity=2)
+        buffer.put(0)
+        buffer.close()
+        self.assertTrue(buffer.closed)
+        self.assertFalse(buffer.put(1))
+        self.assertEqual(buffer.get(), 0)
+        self.assertIsNone(buffer.get())
+
+        buffer = FrameBuffer()
+        frames = []
+        consumer = threading.Thread(target=lambda: frames.append(buffer.get()))
+        consumer.start()
+        time.sleep(0.1)
+        buffer.close()
+        consumer.join(timeout=1)
+        self.assertFalse(consumer.is_alive())
+        self.assertEqual(frames, [None])
+
+    def test_close_blocked_put(self):
+        """Test that closing wakes up blocked producers"""
+        from common.utils import FrameBuffer
+
+        buffer = FrameBuffer("fifo", capacity=1)
+        buffer.put(0)
+        results = []
+        producer = threading.Thread(
+            target=lambda: results.append(buffer.put(1, block=True)))
+        producer.start()
+        time.sleep(0.1)
+        buffer.close()
+        producer.join(timeout=1)
+        self.assertEqual(results, [False])
+
+    def test_invalid_policy(self):
+        """Test that unsupported policies are rejected"""
+        from common.utils import FrameBuffer
+
+        with self.assertRaises(ValueError):
+            FrameBuffer("newest")
@@ -0,0 +1,104 @@
+#!/usr/bin/python3.7
+# -*-coding:utf-8 -*-
+"""
+  ████
+██    ██   Datature
+  ██  ██   Powering Breakthrough AI
+    ██
+
+@File    :   test_stream_scheduler.py
+@Author  :   Wei Loon Cheng
+@Version :   1.0
+@Contact :   hello@datature.io
+@License :   Apache License 2.0
+@Desc    :   Input stream scheduling test case.
+"""
+
+import os
+from unittest import TestCase
+
+from pytest import MonkeyPatch
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+monkeypatch = MonkeyPatch()
+
+
+class FakeInput:
+
+    """Input module stand-in loading a fixed number of frames."""
+
+    def __init__(self, frames):
+        """Initialize fake input.
+
+        Args:
+            frames: Number of frames to load before stopping.
+        """
+        self.frames = frames
+        self.loaded = 0
+        self.stopped = False
+
+    def load_data(self, assets):
+        """Load the next frame, stopping after the last one."""
+        assets["frame_id"] = self.loaded
+        self.loaded += 1
+        self.stopped = self.loaded >= self.frames
+
+
+class TestStreamScheduler(TestCase):
+
+    """Test Input Stream Scheduling"""
+
+    def setUp(self):
+        """Set configuration"""
+        monkeypatch.setenv("DATATURE_EDGE_PYTHON_CONFIG",
+                           os.path.join(CURRENT_DIR, "../config/config.yaml"))
+
+    def tearDown(self):
+        """Restore environment"""
+        monkeypatch.undo()
+
+    def test_weights(self):
+        """Test that streams are interleaved in proportion to weights"""
+        from core.devices.stream import Stream, StreamScheduler
+
+        streams = [
+            Stream("a", FakeInput(100), [], [], weight=3),
+            Stream("b", FakeInput(100), [], [], weight=1),
+        ]
+        scheduler = StreamScheduler(streams)
+        order = "".join(scheduler.next().stream_id for _ in range(12))
+        self.assertEqual(order, "aaba" * 3)
+
+    def test_exhausted(self):
+        """Test that exhausted streams are skipped until none is left"""
+        from core.devices.stream import Stream, StreamScheduler
+
+        streams = [
+            Stream("a", FakeInput(1), [], []),
+            Stream("b", FakeInput(3), [], []),
+        ]
+        scheduler = StreamScheduler(streams)
+        frame_ids = []
+        while True:
+            stream = scheduler.next()
+            if stream is None:
+                break
+            assets = {}
+            stream.load_data(assets, namespaced=True)
+            frame_ids.append(assets["frame_id"])
+
+        self.assertEqual(frame_ids, ["a/0", "b/0", "b/1", "b/2"])
+        self.assertTrue(all(stream.exhausted for stream in streams))
+        self.assertIsNone(scheduler.next())
+
+    def test_load_data(self):
+        """Test that frames are tagged with their stream"""
+        from core.devices.stream import Stream
+
+        stream = Stream(0, FakeInput(2), [], [])
+        assets = {}
+        stream.load_data(assets)
+        self.assertEqual(assets, {"frame_id": 0, "stream_id": "0"})
+        self.assertFalse(stream.exhausted)
+        stream.load_data(assets)
+        self.assertTrue(stream.exhausted)